@@ -0,0 +1,192 @@
+# app/assets.py
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+STATIC_DIR = "static"
+MANIFEST_FILE = "manifest.json"
+SKIP_DIRS = {"uploads"}                 # runtime uploads are named by content hash already
+COMPRESSIBLE = {".css", ".js", ".mjs", ".map", ".svg", ".json", ".txt", ".html", ".xml"}
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"                 # cache, but check the ETag every time
+
+# Uploaded candidate photos and thumbnails: <32 hex>[-<width>].<ext>
+CONTENT_HASHED = re.compile(r"^[0-9a-f]{32}(-\d+)?\.(jpg|png|gif|webp)$")
+
+
+def fingerprint(path: str, digest: str) -> str:
+    """
+    css/app.css -> css/app.<digest>.css
+    """
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{digest}{ext}"
+
+
+def accepted_encodings(header: str) -> dict:
+    """
+    Accept-Encoding as {coding: q}. A coding with q=0 is refused, and "*" covers
+    every coding the header does not name.
+    """
+    codings = {}
+    for item in header.split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+# -------------------- BUILD --------------------
+def precompress(file: Path):
+    """
+    Write .gz (and .br when Brotli is installed) next to a compressible file.
+    Returns the encodings available for it.
+    """
+    data = file.read_bytes()
+    variants = {"gzip": (".gz", lambda: gzip.compress(data, compresslevel=9, mtime=0))}
+    try:
+        import brotli
+        variants["br"] = (".br", lambda: brotli.compress(data, quality=11))
+    except ImportError:
+        pass
+
+    encodings = []
+    for encoding, (suffix, compress) in variants.items():
+        target = file.with_name(file.name + suffix)
+        if not target.exists() or target.stat().st_mtime < file.stat().st_mtime:
+            tmp = target.with_name(f".{target.name}.{os.getpid()}")
+            tmp.write_bytes(compress())
+            os.replace(tmp, target)
+        encodings.append(encoding)
+    return encodings
+
+
+def build_manifest(directory: str = STATIC_DIR):
+    """
+    Hash every static asset, precompress the text ones and return the manifest:
+    {"assets": {path: fingerprinted path}, "encodings": {path: [encodings]}}.
+    """
+    root = Path(directory)
+    manifest = {"assets": {}, "encodings": {}}
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        if Path(dirpath) == root:
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for filename in filenames:
+            if filename.startswith(".") or filename.endswith((".gz", ".br")) or filename == MANIFEST_FILE:
+                continue
+
+            file = Path(dirpath) / filename
+            path = file.relative_to(root).as_posix()
+            digest = hashlib.sha256(file.read_bytes()).hexdigest()[:10]
+            manifest["assets"][path] = fingerprint(path, digest)
+
+            if file.suffix.lower() in COMPRESSIBLE:
+                manifest["encodings"][path] = precompress(file)
+
+    return manifest
+
+
+# -------------------- MANIFEST --------------------
+class AssetManifest:
+    """
+    In-memory lookups built once at startup, from static/manifest.json when the
+    build step wrote one, otherwise by scanning the static folder.
+    """
+
+    def __init__(self, directory: str = STATIC_DIR):
+        self.directory = directory
+        self.assets = {}        # logical path -> fingerprinted path
+        self.originals = {}     # fingerprinted path -> logical path
+        self.encodings = {}     # logical path -> ["br", "gzip"]
+
+    def load(self):
+        manifest_path = Path(self.directory) / MANIFEST_FILE
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text())
+        else:
+            manifest = build_manifest(self.directory)
+
+        self.assets = manifest["assets"]
+        self.encodings = manifest["encodings"]
+        self.originals = {v: k for k, v in self.assets.items()}
+
+    def url(self, path: str) -> str:
+        """
+        Jinja helper: public URL of a static asset, fingerprinted when known.
+        """
+        path = path.lstrip("/")
+        return f"/static/{self.assets.get(path, path)}"
+
+
+assets = AssetManifest()
+
+
+# -------------------- SERVING --------------------
+class AssetStaticFiles(StaticFiles):
+    """
+    StaticFiles that resolves fingerprinted names, serves precompressed variants and
+    sets Cache-Control: immutable for anything whose name changes with its content.
+    ETag / If-None-Match (304) handling comes from StaticFiles.
+    """
+
+    def __init__(self, *args, manifest: AssetManifest = assets, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope):
+        path = path.replace(os.sep, "/")
+        original = self.manifest.originals.get(path)
+        response = await super().get_response(original or path, scope)
+
+        immutable = original is not None or CONTENT_HASHED.match(os.path.basename(path))
+        response.headers["Cache-Control"] = IMMUTABLE if immutable else REVALIDATE
+        return response
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        relative = os.path.relpath(full_path, os.path.realpath(self.directory)).replace(os.sep, "/")
+        available = self.manifest.encodings.get(relative)
+        if not available:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        media_type = mimetypes.guess_type(str(full_path))[0] or "application/octet-stream"
+
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding in available and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+                variant = f"{full_path}{suffix}"
+                response = FileResponse(
+                    variant,
+                    status_code=status_code,
+                    stat_result=os.stat(variant),
+                    media_type=media_type,
+                    headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+                )
+                break
+        else:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+            response.headers["Vary"] = "Accept-Encoding"
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
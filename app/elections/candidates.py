@@ -0,0 +1,82 @@
+# app/elections/candidates.py
+
+import os
+from types import MappingProxyType
+
+from db.async_db import ec_col, candidates_col, routed
+from app.cache import TTLCache
+from app.uploads import thumbnail_srcsets
+
+# Candidate changes invalidate explicitly; the TTL covers other worker processes
+election_views = TTLCache(
+    "election_views",
+    maxsize=int(os.getenv("ELECTION_VIEW_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("ELECTION_VIEW_CACHE_TTL", "30"))
+)
+
+VOTE_PAGE_DEFAULT_IMAGE = "uploads/candidates/default.gif"
+THANKYOU_DEFAULT_IMAGE = "uploads/candidates/default.png"
+VOTE_PAGE_IMAGE_WIDTH = 96     # vote.html shows candidates at w-24
+
+
+# -------------------- VIEW --------------------
+def build_election_view(ec: dict, candidates: list):
+    """
+    Freeze an EC document and its candidates into what the voting flow renders: the
+    election header and candidates with their image URLs already resolved.
+    """
+    election = dict(ec.get("election") or {})
+    election.setdefault("election_id", ec.get("election_id"))
+
+    frozen_candidates = []
+    for c in candidates:
+        thumb_webp, thumb_jpg = thumbnail_srcsets(c.get("thumbnail"), VOTE_PAGE_IMAGE_WIDTH)
+        frozen_candidates.append(MappingProxyType({
+            **c,
+            "_id": str(c.get("_id")),
+            "image_url": f"/static/{c.get('profile_pic') or VOTE_PAGE_DEFAULT_IMAGE}",
+            "photo_url": f"/static/{c.get('profile_pic') or THANKYOU_DEFAULT_IMAGE}",
+            "thumb_webp": thumb_webp,
+            "thumb_jpg": thumb_jpg,
+        }))
+
+    return MappingProxyType({
+        "election_id": ec.get("election_id"),
+        "election": MappingProxyType(election),
+        "candidates": tuple(frozen_candidates),
+    })
+
+
+# -------------------- LOOKUPS --------------------
+async def _find_candidates(collection, election_id: str):
+    return await collection.find({"election_id": election_id}).sort("created_at", 1).to_list(None)
+
+
+async def list_candidates(election_id: str):
+    """
+    An election's candidates in the order they were added, read under the route's policy.
+    """
+    return await _find_candidates(routed(candidates_col), election_id)
+
+
+async def get_election_view(election_id: str):
+    """
+    Cached election view by election id, or None if the election does not exist.
+    Always loaded from the primary, whichever route asks first: login and voting
+    check candidates against this same cached view.
+    """
+    view = election_views.get(election_id)
+    if view is not None:
+        return view
+
+    ec = await ec_col.find_one({"election_id": election_id}, {"election": 1, "election_id": 1})
+    if not ec:
+        return None
+
+    view = build_election_view(ec, await _find_candidates(candidates_col, election_id))
+    election_views.set(election_id, view)
+    return view
+
+
+def invalidate_election_view(election_id: str):
+    election_views.invalidate(election_id)
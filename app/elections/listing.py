@@ -0,0 +1,129 @@
+# app/elections/listing.py
+
+import os
+import time
+from datetime import datetime
+
+from db.async_db import ec_col, routed
+
+# Invalidation is per process; the TTL bounds how stale other workers can be
+ELECTION_LIST_TTL = float(os.getenv("ELECTION_LIST_TTL", "30"))
+
+SUMMARY_PROJECTION = {
+    "_id": 0,
+    "name": 1,
+    "election.election_id": 1,
+    "election.name": 1,
+    "election.start_date": 1,
+    "election.end_date": 1,
+}
+STATUS_ORDER = {"Active": 0, "Upcoming": 1, "Completed": 2}
+
+_cache = {
+    "summaries": None,      # elections as loaded from MongoDB, without status
+    "loaded_at": 0.0,
+    "view": None,           # summaries with status, sorted, plus headline counts
+    "valid_until": None,    # next start/end boundary at which a status flips
+    "version": 0,           # bumped whenever the view is rebuilt
+}
+
+
+# -------------------- INVALIDATION --------------------
+def invalidate_election_listing():
+    """
+    Drop the cached listing; called by the routes that change an election.
+    """
+    _cache["summaries"] = None
+    _cache["view"] = None
+
+
+# -------------------- LOADING --------------------
+def _as_datetime(value):
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+async def load_election_summaries():
+    """
+    Fetch name, dates and ids of every fully configured election.
+    """
+    ecs = await routed(ec_col).find(
+        {
+            "election.name": {"$nin": [None, ""]},
+            "election.start_date": {"$ne": None},
+            "election.end_date": {"$ne": None},
+        },
+        SUMMARY_PROJECTION
+    ).to_list(None)
+
+    return [
+        {
+            "ec_name": ec.get("name", "Unknown EC"),
+            "election_id": ec["election"].get("election_id", "N/A"),
+            "name": ec["election"].get("name", "Unnamed Election"),
+            "start_date": _as_datetime(ec["election"]["start_date"]),
+            "end_date": _as_datetime(ec["election"]["end_date"]),
+        }
+        for ec in ecs
+    ]
+
+
+# -------------------- STATUS --------------------
+def build_listing(summaries: list, now: datetime):
+    """
+    Derive each election's status at `now`, sort Active / Upcoming / Completed and
+    return (view, next_boundary): the view stays correct until next_boundary.
+    """
+    elections = []
+    boundaries = []
+    for summary in summaries:
+        start_time, end_time = summary["start_date"], summary["end_date"]
+
+        if start_time <= now <= end_time:
+            status = "Active"
+            boundaries.append(end_time)
+        elif now < start_time:
+            status = "Upcoming"
+            boundaries.append(start_time)
+        else:
+            status = "Completed"
+
+        elections.append({**summary, "status": status})
+
+    elections.sort(key=lambda x: STATUS_ORDER.get(x["status"], 3))
+
+    view = {
+        "elections": elections,
+        "total_elections": len(elections),
+        "active_count": sum(1 for e in elections if e["status"] == "Active"),
+        "upcoming_count": sum(1 for e in elections if e["status"] == "Upcoming")
+    }
+    return view, min(boundaries, default=None)
+
+
+async def get_election_listing(now: datetime | None = None):
+    """
+    Cached listing for the universal dashboard. MongoDB is only queried after an
+    invalidation or TTL expiry; a status change at a start/end boundary only
+    re-derives statuses from the cached summaries.
+    """
+    now = now or datetime.now()
+
+    if _cache["summaries"] is None or time.monotonic() - _cache["loaded_at"] > ELECTION_LIST_TTL:
+        _cache["summaries"] = await load_election_summaries()
+        _cache["loaded_at"] = time.monotonic()
+        _cache["view"] = None
+
+    if _cache["view"] is None or (_cache["valid_until"] and now >= _cache["valid_until"]):
+        _cache["view"], _cache["valid_until"] = build_listing(_cache["summaries"], now)
+        _cache["version"] += 1
+
+    return _cache["view"]
+
+
+def election_listing_version():
+    """
+    Version of the view last returned by get_election_listing, for keying rendered pages.
+    """
+    return _cache["version"]
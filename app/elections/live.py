@@ -0,0 +1,195 @@
+# app/elections/live.py
+
+import asyncio
+import os
+
+from pymongo.errors import PyMongoError
+
+from db.async_db import counters_col
+from app.elections.tally import get_versioned_vote_counts
+
+# Votes landing within one interval are pushed as a single update
+LIVE_RESULTS_INTERVAL = float(os.getenv("LIVE_RESULTS_INTERVAL", "1"))
+# Without a change stream, votes cast on other workers are picked up this often
+LIVE_RESULTS_POLL = float(os.getenv("LIVE_RESULTS_POLL", "5"))
+# Comment line sent to idle streams so proxies keep them open
+LIVE_RESULTS_KEEPALIVE = float(os.getenv("LIVE_RESULTS_KEEPALIVE", "15"))
+
+
+# -------------------- SUBSCRIBER --------------------
+class Subscriber:
+    """
+    One open stream. Updates that arrive faster than the client reads them are merged,
+    so a slow client gets one combined delta instead of a growing queue.
+    """
+
+    def __init__(self, election_id: str):
+        self.election_id = election_id
+        self.pending = None
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    def push(self, update: dict):
+        if self.pending is None:
+            self.pending = {"votes": {}}
+        self.pending["votes"].update(update["votes"])
+        self.pending["total_votes"] = update["total_votes"]
+        self.pending["version"] = update["version"]
+        self._ready.set()
+
+    async def next(self, timeout: float = LIVE_RESULTS_KEEPALIVE):
+        """
+        Wait for the next update; None when `timeout` passes without one.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        update, self.pending = self.pending, None
+        self._ready.clear()
+        return update
+
+    def close(self):
+        """
+        Wake the stream so it can end; `closed` tells it to stop.
+        """
+        self.closed = True
+        self._ready.set()
+
+
+# -------------------- PUBLISHER --------------------
+class ResultPublisher:
+    """
+    Single in-process source of an election's live tally. However many subscribers
+    are connected, it reads the counter document at most once per interval.
+    """
+
+    def __init__(self, election_id: str):
+        self.election_id = election_id
+        self.subscribers = set()
+        self.votes = None
+        self.total_votes = 0
+        self.version = None
+
+        self._dirty = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        self._watcher = asyncio.create_task(self._watch())
+
+    def snapshot(self):
+        return {"votes": dict(self.votes), "total_votes": self.total_votes, "version": self.version}
+
+    def add(self, subscriber: Subscriber):
+        self.subscribers.add(subscriber)
+        if self.votes is not None:
+            subscriber.push(self.snapshot())
+
+    def mark_dirty(self):
+        self._dirty.set()
+
+    async def refresh(self):
+        """
+        Read the counter once and push what changed since the last read.
+        """
+        votes, total_votes, version = await get_versioned_vote_counts(self.election_id)
+        if self.votes is not None and version is not None and version == self.version:
+            return
+
+        previous = self.votes or {}
+        delta = {cid: count for cid, count in votes.items() if previous.get(cid) != count}
+        delta.update({cid: 0 for cid in previous if cid not in votes})
+        changed = self.votes is None or delta or total_votes != self.total_votes
+
+        self.votes, self.total_votes, self.version = votes, total_votes, version
+        if changed:
+            update = {"votes": delta, "total_votes": total_votes, "version": version}
+            for subscriber in self.subscribers:
+                subscriber.push(update)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._dirty.wait(), LIVE_RESULTS_POLL)
+            except asyncio.TimeoutError:
+                pass
+            self._dirty.clear()
+
+            try:
+                await self.refresh()
+            except PyMongoError as e:
+                print(f"Live results refresh failed for {self.election_id}: {e}")
+
+            # Coalesce: everything that lands during the interval goes out together
+            await asyncio.sleep(LIVE_RESULTS_INTERVAL)
+
+    async def _watch(self):
+        """
+        Follow the counter document through a change stream where the deployment
+        supports one (replica sets); otherwise polling alone keeps workers in sync.
+        """
+        try:
+            async with await counters_col.watch([{"$match": {"documentKey._id": self.election_id}}]) as stream:
+                async for _ in stream:
+                    self.mark_dirty()
+        except (PyMongoError, NotImplementedError):
+            return
+
+    def close(self):
+        self._task.cancel()
+        self._watcher.cancel()
+
+
+# -------------------- REGISTRY --------------------
+publishers = {}
+
+
+def subscribe(election_id: str):
+    """
+    Attach a new subscriber to the election's publisher, starting it if needed.
+    """
+    publisher = publishers.get(election_id)
+    if publisher is None:
+        publisher = publishers[election_id] = ResultPublisher(election_id)
+        publisher.mark_dirty()
+
+    subscriber = Subscriber(election_id)
+    publisher.add(subscriber)
+    return subscriber
+
+
+def unsubscribe(subscriber: Subscriber):
+    """
+    Detach a subscriber; the publisher stops once its last subscriber has gone.
+    """
+    publisher = publishers.get(subscriber.election_id)
+    if publisher is None:
+        return
+
+    publisher.subscribers.discard(subscriber)
+    if not publisher.subscribers:
+        publisher.close()
+        del publishers[subscriber.election_id]
+
+
+def notify_vote(election_id: str):
+    """
+    Called after a vote is cast in this process; the next interval picks it up.
+    """
+    publisher = publishers.get(election_id)
+    if publisher is not None:
+        publisher.mark_dirty()
+
+
+def drain():
+    """
+    End every open stream; called when the worker starts shutting down.
+    """
+    for publisher in publishers.values():
+        for subscriber in publisher.subscribers:
+            subscriber.close()
+
+
+def close_all():
+    for publisher in publishers.values():
+        publisher.close()
+    publishers.clear()
@@ -0,0 +1,163 @@
+# app/elections/services.py
+
+from datetime import datetime
+
+from db.db import voters_col, votes_col, counters_col
+from app.uploads import thumbnail_srcsets
+
+DEFAULT_CANDIDATE_IMAGE = "uploads/candidates/default.png"
+RESULT_IMAGE_WIDTH = 128       # Result.html shows the winner at w-32
+
+
+# -------------------- BALLOTS --------------------
+def make_ballot(vote_token: str, election_id: str, candidate_id: str, cast_at: datetime | None = None):
+    """
+    Ballot document for votes_col. It never references the voter: its _id is the
+    vote token handed to the voter as a receipt, which also makes writes idempotent.
+    """
+    return {
+        "_id": vote_token,
+        "election_id": election_id,
+        "candidate_id": candidate_id,
+        "cast_at": cast_at or datetime.now(),
+    }
+
+
+# -------------------- VOTE COUNTS --------------------
+def vote_count_pipeline(election_id: str):
+    """
+    Aggregation that groups an election's ballots by candidate.
+    Covered by the (election_id, candidate_id) index; only the counts travel over the wire.
+    """
+    return [
+        {"$match": {"election_id": election_id}},
+        {"$group": {"_id": "$candidate_id", "votes": {"$sum": 1}}},
+    ]
+
+
+def collect_vote_counts(rows):
+    """
+    Fold $group rows into ({candidate_id: votes}, total_votes).
+    """
+    votes = {}
+    total_votes = 0
+    for row in rows:
+        votes[str(row["_id"])] = row["votes"]
+        total_votes += row["votes"]
+
+    return votes, total_votes
+
+
+def count_votes(election_id: str):
+    """
+    Ask MongoDB for per-candidate vote counts of an election.
+    """
+    return collect_vote_counts(votes_col.aggregate(vote_count_pipeline(election_id)))
+
+
+# -------------------- VOTE COUNTERS --------------------
+def init_vote_counter(election_id: str):
+    """
+    Create an empty counter document for a brand new election.
+    """
+    counters_col.update_one(
+        {"_id": election_id},
+        {"$setOnInsert": {"votes": {}, "total_votes": 0, "total_voters": 0, "version": 0}},
+        upsert=True
+    )
+
+
+def adjust_voter_counter(election_id: str, voters: int = 0):
+    """
+    Track voters being added (+1) or removed (-1), after the change is written.
+    Ballots are anonymous, so a removed voter's ballot (if any) stays counted.
+    """
+    updated = counters_col.update_one(
+        {"_id": election_id, "total_voters": {"$exists": True}},
+        {"$inc": {"total_voters": voters, "version": 1}}
+    )
+    if not updated.matched_count:
+        # Election from before the counters: counting from 0 would be wrong, so
+        # seed the counter from the collections, which already include this change
+        reconcile_counters(election_id)
+
+
+def bump_data_version(election_id: str):
+    """
+    Mark an election's data as changed (election details, candidates) so every
+    worker re-renders its cached public pages. Votes bump the version themselves.
+    """
+    counters_col.update_one({"_id": election_id}, {"$inc": {"version": 1}}, upsert=True)
+
+
+# -------------------- RECONCILIATION --------------------
+def reconcile_counters(election_id: str, apply: bool = True):
+    """
+    Rebuild an election's counter document from votes_col / voters_col and report any drift.
+    Returns {field: (counter_value, actual_value)} for every field that disagreed.
+    """
+    votes, total_votes = count_votes(election_id)
+    actual = {
+        "total_voters": voters_col.count_documents({"election_id": election_id}),
+        "total_votes": total_votes,
+        "votes": votes
+    }
+
+    counter = counters_col.find_one({"_id": election_id}) or {}
+    drift = {}
+    for field in ("total_voters", "total_votes"):
+        if counter.get(field, 0) != actual[field]:
+            drift[field] = (counter.get(field, 0), actual[field])
+
+    stored_votes = counter.get("votes", {})
+    for candidate_id in set(stored_votes) | set(votes):
+        if stored_votes.get(candidate_id, 0) != votes.get(candidate_id, 0):
+            drift[f"votes.{candidate_id}"] = (stored_votes.get(candidate_id, 0), votes.get(candidate_id, 0))
+
+    if apply and (drift or any(field not in counter for field in actual)):
+        counters_col.update_one({"_id": election_id}, {"$set": actual, "$inc": {"version": 1}}, upsert=True)
+
+    return drift
+
+
+# -------------------- RESULT BUILDER --------------------
+def build_result(candidates: list, votes: dict, total_votes: int):
+    """
+    Turn raw vote counts into the candidates / winner / draw structure used by Result.html.
+    """
+    results = []
+    for c in candidates:
+        candidate = c.copy()
+        count = votes.get(str(c.get("_id")), 0)
+        candidate["votes"] = count
+        candidate["percentage"] = round((count / total_votes * 100) if total_votes else 0, 1)
+
+        # Ensure optional fields exist for template
+        candidate["name"] = c.get("name", "Candidate")
+        candidate["party_name"] = c.get("party", "Independent")
+        candidate["image_url"] = f"/static/{c.get('profile_pic') or DEFAULT_CANDIDATE_IMAGE}"
+        candidate["thumb_webp"], candidate["thumb_jpg"] = thumbnail_srcsets(c.get("thumbnail"), RESULT_IMAGE_WIDTH)
+        results.append(candidate)
+
+    # Sort candidates by votes (for display only)
+    results.sort(key=lambda x: x["votes"], reverse=True)
+
+    # ---------------- WINNER / DRAW LOGIC ----------------
+    winner = None
+    is_draw = False
+
+    if total_votes and results:
+        top_votes = results[0]["votes"]
+        top_candidates = [c for c in results if c["votes"] == top_votes]
+
+        if len(top_candidates) > 1:
+            is_draw = True
+        else:
+            winner = top_candidates[0]
+
+    return {
+        "candidates": results,
+        "total_votes": total_votes,
+        "winner": winner,
+        "is_draw": is_draw
+    }
@@ -0,0 +1,68 @@
+# app/elections/tally.py
+
+from db.async_db import voters_col, votes_col, counters_col, routed
+from app.elections.services import vote_count_pipeline, collect_vote_counts, build_result
+
+
+# -------------------- VOTE COUNTS --------------------
+async def aggregate_votes(election_id: str):
+    """
+    Per-candidate vote counts straight from the ballots with one $group round trip.
+    """
+    cursor = await routed(votes_col).aggregate(vote_count_pipeline(election_id))
+    return collect_vote_counts(await cursor.to_list(None))
+
+
+async def increment_vote_counter(election_id: str, candidate_id: str, session=None):
+    """
+    Add one vote for a candidate to the election's running tally.
+    """
+    await counters_col.update_one(
+        {"_id": election_id},
+        {"$inc": {f"votes.{candidate_id}": 1, "total_votes": 1, "version": 1}},
+        upsert=True,
+        session=session
+    )
+
+
+async def get_vote_counts(election_id: str):
+    """
+    Read (votes, total_votes) from the counter document in O(1).
+    Falls back to an aggregation for elections that have no counter yet.
+    """
+    votes, total_votes, _ = await get_versioned_vote_counts(election_id)
+    return votes, total_votes
+
+
+async def get_versioned_vote_counts(election_id: str):
+    """
+    Like get_vote_counts, plus the counter's data version: (votes, total_votes, version).
+    The version is None when the counts had to be aggregated.
+    """
+    counter = await routed(counters_col).find_one({"_id": election_id}, {"votes": 1, "total_votes": 1, "version": 1})
+    if not counter or "total_votes" not in counter:
+        return (*await aggregate_votes(election_id), None)
+    return counter.get("votes", {}), counter["total_votes"], counter.get("version")
+
+
+async def get_election_totals(election_id: str):
+    """
+    Return (total_voters, votes_cast) for the EC dashboard headline. Only a seeded
+    counter has total_voters; vote increments alone do not make one trustworthy.
+    """
+    counter = await routed(counters_col).find_one({"_id": election_id}, {"total_voters": 1, "total_votes": 1})
+    if counter and "total_voters" in counter:
+        return counter["total_voters"], counter.get("total_votes", 0)
+
+    total_voters = await routed(voters_col).count_documents({"election_id": election_id})
+    votes_cast = await routed(voters_col).count_documents({"election_id": election_id, "has_voted": True})
+    return total_voters, votes_cast
+
+
+# -------------------- TALLY --------------------
+async def tally_election(election_id: str, candidates: list):
+    """
+    Compute the full result of an election from its running vote counter.
+    """
+    votes, total_votes = await get_vote_counts(election_id)
+    return build_result(candidates, votes, total_votes)
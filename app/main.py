@@ -1,33 +1,165 @@
-from fastapi import FastAPI, Request, Form, UploadFile, File
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from bcrypt import checkpw, hashpw, gensalt
+from fastapi import FastAPI, Request, Form, UploadFile, File, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse, PlainTextResponse
+from pymongo.errors import DuplicateKeyError, ConnectionFailure, PyMongoError
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
+import os
 import uuid
+import json
 import re
 
-from db.db import ec_col, voters_col
-from app.users.services import register_ec, add_candidate  # removed create_election import
+from db.db import connect, ec_col, voters_col, candidates_col, pool_monitor, routed, use_read_route, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_WAIT_QUEUE_TIMEOUT_MS, MONGO_STARTUP_TIMEOUT_MS, warn_no_transactions
+from db import async_db
+from db.indexes import ensure_indexes
+from app.users.services import register_ec, add_candidate, remove_candidate as delete_candidate  # removed create_election import
+from app.elections.services import adjust_voter_counter, bump_data_version, build_result
+from app.elections.tally import get_versioned_vote_counts, get_election_totals
+from app.elections.listing import get_election_listing, election_listing_version, invalidate_election_listing
+from app.elections import live
+from app.elections.candidates import get_election_view, invalidate_election_view, list_candidates
+from app.cache import caches
+from app.uploads import save_candidate_image, UploadSizeLimit, UploadTooLarge
+from app.assets import assets, AssetStaticFiles
+from app.rendering import templates, precompile_templates, cached_page, render_page
+from app.voters.services import cast_vote, list_voters_page, VOTER_NOT_FOUND, INVALID_CANDIDATE
+from app.voters import importer
+from app.voters.ingest import vote_ingest, receipt_status, VOTE_INGEST_MODE, RECEIPT_RECORDED, RECEIPT_PENDING, RECEIPT_REJECTED
+from app.passwords import password_pool, PasswordPoolBusy
+from app.sessions import EC, VOTER, SessionRequired, read_session, set_session_cookie, clear_session_cookie
+from app.metrics import METRICS_ENABLED, MetricsMiddleware, ops_authorized, render_metrics
+from app.ratelimit import login_limiter
+
+# ---------------- Lifespan ----------------
+async def warm_connections():
+    """
+    One ping bounded by MONGO_STARTUP_TIMEOUT_MS, then the index bootstrap and the
+    election listing, before this worker accepts traffic. If MongoDB does not
+    answer in time the worker starts anyway; the clients keep reconnecting.
+    """
+    if connect() is None or async_db.connect() is None:
+        print("⚠️ MongoDB environment variables missing. App will run, but DB operations will be disabled")
+        return
+    try:
+        await async_db.ping(timeout=MONGO_STARTUP_TIMEOUT_MS / 1000)
+    except PyMongoError as e:
+        print(f"❌ MongoDB not reachable yet, skipping index bootstrap and warmup: {e}")
+        return
+
+    ensure_indexes()
+    try:
+        if not await async_db.has_transactions():
+            warn_no_transactions()
+        await get_election_listing()
+    except PyMongoError as e:
+        print(f"⚠️ Warmup incomplete: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Everything that does I/O happens here rather than at import, so importing the
+    # app (tests, tools, every spawned worker) never blocks on disk or the network
+    assets.load()
+    Path("static/uploads").mkdir(parents=True, exist_ok=True)
+    precompile_templates()
+    await warm_connections()
+    if VOTE_INGEST_MODE == "wal":
+        await vote_ingest.start()
+
+    yield
+
+    if vote_ingest.enabled:
+        await vote_ingest.stop()
+    password_pool.shutdown()
+    live.close_all()
 
 # ---------------- FastAPI app ----------------
-app = FastAPI(title="E-Voting 2.0")
+app = FastAPI(title="E-Voting 2.0", lifespan=lifespan)
+
+# Refuse oversized photo uploads while they arrive instead of after they are spooled
+app.add_middleware(UploadSizeLimit, paths=("/add-candidate",))
+
+# Per-route latency, with db / template / bcrypt time for sampled requests
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Fingerprinted, precompressed static assets with long-lived cache headers
+app.mount("/static", AssetStaticFiles(directory="static"), name="static")
+
+# ---------------- Password pool backpressure ----------------
+@app.exception_handler(PasswordPoolBusy)
+def password_pool_busy(request: Request, exc: PasswordPoolBusy):
+    # Fail fast while the bcrypt pool is saturated instead of letting requests time out
+    return HTMLResponse(
+        "Server is busy, please try again in a few seconds.",
+        status_code=503,
+        headers={"Retry-After": "2"}
+    )
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
+# ---------------- Oversized uploads ----------------
+@app.exception_handler(UploadTooLarge)
+def upload_too_large(request: Request, exc: UploadTooLarge):
+    return HTMLResponse(exc.detail, status_code=413)
+
+# ---------------- Database outages ----------------
+@app.exception_handler(ConnectionFailure)
+def database_unavailable(request: Request, exc: ConnectionFailure):
+    # Covers server selection timeouts and a saturated pool; the client reconnects on its own
+    print(f"❌ MongoDB unavailable: {exc}")
+    return HTMLResponse(
+        "Database is temporarily unavailable, please try again shortly.",
+        status_code=503,
+        headers={"Retry-After": "2"}
+    )
 
-Path("static/uploads").mkdir(parents=True, exist_ok=True)
+# ---------------- Sessions ----------------
+@app.exception_handler(SessionRequired)
+def session_required(request: Request, exc: SessionRequired):
+    # Missing, expired or foreign session: back to the matching login page
+    return RedirectResponse("/ec/login" if exc.role == EC else "/voter/login", status_code=303)
 
-# ---------------- Jinja2 filter ----------------
-def datetimeformat(value, format="%d/%m/%Y %H:%M"):
-    if not value:
-        return "Not set"
-    if isinstance(value, str):
-        value = datetime.fromisoformat(value)
-    return value.strftime(format)
+# ---------------- Login throttling ----------------
+def client_ip(request: Request):
+    # uvicorn resolves X-Forwarded-For from trusted proxies (FORWARDED_ALLOW_IPS)
+    return request.client.host if request.client else None
 
-templates.env.filters['datetimeformat'] = datetimeformat
+def too_many_attempts(request: Request, template: str, retry_after: int):
+    # Refused before any lookup or bcrypt work
+    return templates.TemplateResponse(
+        template,
+        {"request": request, "error": f"Too many login attempts. Try again in {retry_after} seconds."},
+        status_code=429,
+        headers={"Retry-After": str(retry_after)}
+    )
+
+async def ec_session(request: Request):
+    """
+    The signed EC session, which must belong to the election the request names
+    (election_id in the query string or form). No database lookup.
+    """
+    session = read_session(request, EC)
+    election_id = request.query_params.get("election_id")
+    if election_id is None and request.method == "POST":
+        # Starlette caches the parsed form, so the route reads it without a second parse
+        election_id = (await request.form()).get("election_id")
+    if session is None or (election_id is not None and election_id != session["election_id"]):
+        raise SessionRequired(EC)
+    return session
+
+def voter_session(request: Request):
+    """
+    The signed voter session set at login. No database lookup.
+    """
+    session = read_session(request, VOTER)
+    if session is None:
+        raise SessionRequired(VOTER)
+    return session
+
+# ---------------- Read routing ----------------
+def read_route(route: str):
+    # Async so the policy is set in the request's own context, not a threadpool copy
+    async def apply_read_route():
+        use_read_route(route)
+    return Depends(apply_read_route)
 
 # ---------------- ObjectId Validation ----------------
 OBJECTID_REGEX = re.compile(r"^[0-9a-fA-F]{24}$")
@@ -36,54 +168,14 @@ def is_valid_objectid(oid_str: str) -> bool:
     return bool(OBJECTID_REGEX.fullmatch(oid_str))
 
 # ================= UNIVERSAL DASHBOARD =================
-@app.get("/", response_class=HTMLResponse)
-def dashboard(request: Request):
-    ecs = list(ec_col.find({}))
-    elections = []
-    now = datetime.now()
-
-    for ec in ecs:
-        election = ec.get("election")
-        if not election or not election.get("name") or not election.get("start_date") or not election.get("end_date"):
-            continue
-
-        start_time = election.get("start_date")
-        end_time = election.get("end_date")
-
-        if isinstance(start_time, str):
-            start_time = datetime.fromisoformat(start_time)
-        if isinstance(end_time, str):
-            end_time = datetime.fromisoformat(end_time)
-
-        if start_time <= now <= end_time:
-            status = "Active"
-        elif now < start_time:
-            status = "Upcoming"
-        else:
-            status = "Completed"
-
-        elections.append({
-            "ec_name": ec.get("name", "Unknown EC"),
-            "election_id": election.get("election_id", "N/A"),
-            "name": election.get("name", "Unnamed Election"),
-            "start_date": start_time,
-            "end_date": end_time,
-            "status": status
-        })
+@app.get("/", response_class=HTMLResponse, dependencies=[read_route("dashboard")])
+async def dashboard(request: Request):
+    # Cached election summaries; statuses are re-derived at start/end boundaries
+    listing = await get_election_listing()
 
-    status_order = {"Active": 0, "Upcoming": 1, "Completed": 2}
-    elections.sort(key=lambda x: status_order.get(x["status"], 3))
-
-    return templates.TemplateResponse(
-        "Dashboard.html",
-        {
-            "request": request,
-            "elections": elections,
-            "total_elections": len(elections),
-            "active_count": sum(1 for e in elections if e["status"] == "Active"),
-            "upcoming_count": sum(1 for e in elections if e["status"] == "Upcoming")
-        }
-    )
+    # Identical for every visitor until the listing view is rebuilt
+    key = ("dashboard", election_listing_version())
+    return cached_page(key) or render_page(request, key, "Dashboard.html", listing)
 
 # ================= EC SIGNUP =================
 @app.get("/ec/signup", response_class=HTMLResponse)
@@ -123,28 +215,51 @@ def ec_login_get(request: Request):
     return templates.TemplateResponse("EC-login.html", {"request": request})
 
 @app.post("/ec/login")
-def ec_login_post(
+async def ec_login_post(
     request: Request,
     email: str = Form(...),
     password: str = Form(...)
 ):
-    ec = ec_col.find_one({"email": email})
+    retry_after = await login_limiter.check(EC, client_ip(request), email)
+    if retry_after:
+        return too_many_attempts(request, "EC-login.html", retry_after)
+
+    ec = await async_db.ec_col.find_one({"email": email})
 
-    if not ec or not checkpw(password.encode(), ec["password_hash"].encode()):
+    if not ec or not await password_pool.verify(password, ec["password_hash"]):
+        await login_limiter.failed(EC, email)
         return templates.TemplateResponse(
             "EC-login.html",
             {"request": request, "error": "Invalid credentials"}
         )
 
-    return RedirectResponse(
+    await login_limiter.succeeded(EC, email)
+
+    response = RedirectResponse(
         f"/ec/dashboard?election_id={ec['election_id']}",
         status_code=303
     )
+    # Later EC requests are authorised from this cookie alone
+    return set_session_cookie(response, EC, str(ec["_id"]), ec["election_id"])
+
+# ================= LOGOUT =================
+@app.get("/logout")
+def logout():
+    response = RedirectResponse("/", status_code=303)
+    clear_session_cookie(response, EC)
+    return clear_session_cookie(response, VOTER)
 
 # ================= EC DASHBOARD =================
-@app.get("/ec/dashboard", response_class=HTMLResponse)
-def ec_dashboard(request: Request, election_id: str):
-    ec = ec_col.find_one({"election_id": election_id})
+@app.get("/ec/dashboard", response_class=HTMLResponse, dependencies=[read_route("ec_dashboard")])
+async def ec_dashboard(
+    request: Request,
+    election_id: str,
+    after: str | None = None,
+    before: str | None = None,
+    q: str | None = None,
+    session: dict = Depends(ec_session)
+):
+    ec = await routed(async_db.ec_col).find_one({"election_id": election_id}, {"password_hash": 0})
     if not ec:
         return HTMLResponse("EC not found", status_code=404)
 
@@ -152,11 +267,11 @@ def ec_dashboard(request: Request, election_id: str):
     if not election or not election.get("name") or not election.get("start_date") or not election.get("end_date"):
         election = None
 
-    voters = list(voters_col.find({"election_id": election_id}))
-    candidates = election.get("candidates", []) if election else []
+    # One keyset page of voters, projected without password hashes
+    page = await list_voters_page(election_id, after=after, before=before, search=q)
+    candidates = await list_candidates(election_id) if election else []
 
-    total_voters = len(voters)
-    votes_cast = sum(1 for v in voters if v.get("has_voted"))
+    total_voters, votes_cast = await get_election_totals(election_id)
 
     return templates.TemplateResponse(
         "EC-dashboard.html",
@@ -164,7 +279,10 @@ def ec_dashboard(request: Request, election_id: str):
             "request": request,
             "ec": ec,
             "election": election,
-            "voters": voters,
+            "voters": page["voters"],
+            "next_cursor": page["next_cursor"],
+            "prev_cursor": page["prev_cursor"],
+            "search": q or "",
             "candidates": candidates,
             "total_voters": total_voters,
             "votes_cast": votes_cast
@@ -172,7 +290,7 @@ def ec_dashboard(request: Request, election_id: str):
     )
 
 # ================= CREATE ELECTION =================
-@app.post("/create-election")
+@app.post("/create-election", dependencies=[Depends(ec_session)])
 def create_election_post(
     election_id: str = Form(...),
     name: str = Form(...),
@@ -184,14 +302,18 @@ def create_election_post(
         "name": name,
         "start_date": datetime.fromisoformat(start_date).isoformat(),
         "end_date": datetime.fromisoformat(end_date).isoformat(),
-        "status": "Upcoming",
-        "candidates": []
+        "status": "Upcoming"
     }
 
     ec_col.update_one(
         {"election_id": election_id},
         {"$set": {"election": election_data}}
     )
+    # A (re)created election starts without candidates
+    candidates_col.delete_many({"election_id": election_id})
+    invalidate_election_listing()
+    invalidate_election_view(election_id)
+    bump_data_version(election_id)
 
     return RedirectResponse(
         f"/ec/dashboard?election_id={election_id}",
@@ -199,7 +321,7 @@ def create_election_post(
     )
 
 # ================= ADD VOTER =================
-@app.post("/add-voter")
+@app.post("/add-voter", dependencies=[Depends(ec_session)])
 def add_voter_post(
     election_id: str = Form(...),
     name: str = Form(...),
@@ -214,7 +336,7 @@ def add_voter_post(
         )
 
     # Hash the password
-    password_hash = hashpw(password.encode(), gensalt()).decode()
+    password_hash = password_pool.hash_sync(password)
 
     # Create voter document
     voter = {
@@ -223,20 +345,55 @@ def add_voter_post(
         "email": email,
         "password_hash": password_hash,
         "election_id": election_id,
-        "has_voted": False,
-        "voted_for": None  # track candidate ID after voting
+        "has_voted": False
     }
 
-    # Insert into DB
-    voters_col.insert_one(voter)
+    # Insert into DB (the unique email index also catches concurrent duplicates)
+    try:
+        voters_col.insert_one(voter)
+    except DuplicateKeyError:
+        return HTMLResponse(
+            f"Voter with email {email} already exists",
+            status_code=400
+        )
+    adjust_voter_counter(election_id, voters=1)
 
     return RedirectResponse(
         f"/ec/dashboard?election_id={election_id}",
         status_code=303
     )
 
+# ================= BULK VOTER IMPORT =================
+@app.post("/voters/import", dependencies=[Depends(ec_session)])
+def import_voters_post(
+    background_tasks: BackgroundTasks,
+    election_id: str = Form(...),
+    file: UploadFile = File(...)
+):
+    """
+    Accept a CSV/XLSX roll (name, email, password columns) and import it in the background.
+    """
+    if Path(file.filename or "").suffix.lower() not in importer.SUPPORTED_EXTENSIONS:
+        return JSONResponse({"error": "Upload a .csv or .xlsx file"}, status_code=400)
+
+    path = importer.save_upload(file)
+    import_id = importer.start_import(election_id, file.filename)
+    background_tasks.add_task(importer.run_import, import_id, election_id, path)
+
+    return JSONResponse(
+        {"import_id": import_id, "progress_url": f"/voters/import/{import_id}"},
+        status_code=202
+    )
+
+@app.get("/voters/import/{import_id}")
+def import_voters_progress(import_id: str, session: dict = Depends(ec_session)):
+    job = importer.get_import(import_id)
+    if not job or job["election_id"] != session["election_id"]:
+        return JSONResponse({"error": "Import not found"}, status_code=404)
+    return JSONResponse(job)
+
 # ================= REMOVE VOTER =================
-@app.post("/remove-voter/{voter_id}")
+@app.post("/remove-voter/{voter_id}", dependencies=[Depends(ec_session)])
 def remove_voter(
     voter_id: str,
     election_id: str = Form(...)
@@ -244,17 +401,20 @@ def remove_voter(
     if not is_valid_objectid(voter_id):
         return HTMLResponse("Invalid voter ID", status_code=400)
 
-    result = voters_col.delete_one({"_id": voter_id})
-    if result.deleted_count == 0:
+    voter = voters_col.find_one_and_delete({"_id": voter_id, "election_id": election_id})
+    if not voter:
         return HTMLResponse("Voter not found", status_code=404)
 
+    # Their ballot, if any, is anonymous and stays in the tally
+    adjust_voter_counter(voter["election_id"], voters=-1)
+
     return RedirectResponse(
         f"/ec/dashboard?election_id={election_id}",
         status_code=303
     )
 
 # ================= ADD CANDIDATE =================
-@app.post("/add-candidate")
+@app.post("/add-candidate", dependencies=[Depends(ec_session)])
 def add_candidate_post(
     election_id: str = Form(...),
     name: str = Form(...),
@@ -266,29 +426,16 @@ def add_candidate_post(
     Add a candidate to an election.
     If no profile image is uploaded, a default image is used.
     """
-    # Ensure the candidates folder exists
-    candidates_folder = Path("static/uploads/candidates")
-    candidates_folder.mkdir(parents=True, exist_ok=True)
-
     # Default image relative path (inside static folder)
-    default_image = "uploads/candidates/default.png"
-    image_path = default_image
+    image_path = "uploads/candidates/default.png"
+    thumbnail = None
 
-    # Save uploaded image if exists
+    # Stream the uploaded image to disk (size limit, type check, thumbnails)
     if profile_pic and profile_pic.filename:
-        ext = Path(profile_pic.filename).suffix
-        # Ensure valid extension
-        if ext.lower() not in [".jpg", ".jpeg", ".png", ".gif"]:
-            ext = ".gif"  # fallback to gif if invalid
-
-        filename = f"{uuid.uuid4()}{ext}"
-        full_path = candidates_folder / filename
-
-        with open(full_path, "wb") as f:
-            f.write(profile_pic.file.read())
-
-        # Store relative path in MongoDB
-        image_path = f"uploads/candidates/{filename}"
+        saved, result = save_candidate_image(profile_pic)
+        if not saved:
+            return HTMLResponse(f"Failed to add candidate: {result}", status_code=400)
+        image_path, thumbnail = result
 
     # Add candidate to the election
     success, candidate_id_or_msg = add_candidate(
@@ -296,11 +443,15 @@ def add_candidate_post(
         name=name,
         party=party,
         moto=moto,
-        profile_pic=image_path
+        profile_pic=image_path,
+        thumbnail=thumbnail
     )
 
     if not success:
         return HTMLResponse(f"Failed to add candidate: {candidate_id_or_msg}", status_code=500)
+    invalidate_election_listing()
+    invalidate_election_view(election_id)
+    bump_data_version(election_id)
 
     # Redirect back to EC dashboard
     return RedirectResponse(
@@ -309,24 +460,17 @@ def add_candidate_post(
     )
 
 # ================= REMOVE CANDIDATE =================
-@app.post("/remove-candidate/{candidate_id}")
+@app.post("/remove-candidate/{candidate_id}", dependencies=[Depends(ec_session)])
 def remove_candidate(
     candidate_id: str,
     election_id: str = Form(...)
 ):
-    ec = ec_col.find_one({"election_id": election_id})
-    if not ec or "election" not in ec:
-        return HTMLResponse("Election not found", status_code=404)
-
-    ec["election"]["candidates"] = [
-        c for c in ec["election"]["candidates"]
-        if str(c["_id"]) != candidate_id
-    ]
-
-    ec_col.update_one(
-        {"election_id": election_id},
-        {"$set": {"election": ec["election"]}}
-    )
+    # One atomic delete; a concurrent add is never overwritten
+    if not delete_candidate(election_id, candidate_id):
+        return HTMLResponse("Candidate not found", status_code=404)
+    invalidate_election_listing()
+    invalidate_election_view(election_id)
+    bump_data_version(election_id)
 
     return RedirectResponse(
         f"/ec/dashboard?election_id={election_id}",
@@ -335,26 +479,33 @@ def remove_candidate(
 
 # ================= VOTER LOGIN =================
 @app.get("/voter/login", response_class=HTMLResponse)
-def voter_login_get(request: Request):
+async def voter_login_get(request: Request):
     return templates.TemplateResponse("Login.html", {"request": request})
 
 @app.post("/voter/login", response_class=HTMLResponse)
-def voter_login_post(request: Request, email: str = Form(...), password: str = Form(...)):
+async def voter_login_post(request: Request, email: str = Form(...), password: str = Form(...)):
+    retry_after = await login_limiter.check(VOTER, client_ip(request), email)
+    if retry_after:
+        return too_many_attempts(request, "Login.html", retry_after)
+
     # Find voter by email
-    voter = voters_col.find_one({"email": email})
+    voter = await async_db.voters_col.find_one({"email": email})
 
     if not voter:
+        await login_limiter.failed(VOTER, email)
         return templates.TemplateResponse(
             "Login.html",
             {"request": request, "error": "Voter not found"}
         )
 
-    # Check password
-    if not checkpw(password.encode(), voter["password_hash"].encode()):
+    # Check password (bcrypt runs in the bounded password pool, off the event loop)
+    if not await password_pool.verify(password, voter["password_hash"]):
+        await login_limiter.failed(VOTER, email)
         return templates.TemplateResponse(
             "Login.html",
             {"request": request, "error": "Incorrect password"}
         )
+    await login_limiter.succeeded(VOTER, email)
 
     # Check if voter has already voted
     if voter.get("has_voted"):
@@ -363,23 +514,13 @@ def voter_login_post(request: Request, email: str = Form(...), password: str = F
             {"request": request, "error": "You have already voted."}
         )
 
-    # Fetch the EC and election info
-    ec = ec_col.find_one({"election_id": voter["election_id"]})
-    election = ec.get("election", {}) if ec else {}
-
-    # ===================== PREPARE CANDIDATE IMAGES =====================
-    candidates = []
-    for candidate in election.get("candidates", []):
-        candidate_copy = candidate.copy()
-
-        # Ensure the candidate profile image is correct
-        # Always use relative path stored in DB, prepend '/static/' for FastAPI
-        candidate_copy["image_url"] = f"/static/{candidate.get('profile_pic') or 'uploads/candidates/default.gif'}"
+    # Cached election header and pre-rendered candidates (image URLs included)
+    view = await get_election_view(voter["election_id"])
+    election = view["election"] if view else {}
+    candidates = view["candidates"] if view else []
 
-        candidates.append(candidate_copy)
-
-    # Render voting page
-    return templates.TemplateResponse(
+    # Render voting page; the vote itself is authorised by the signed session cookie
+    response = templates.TemplateResponse(
         "vote.html",
         {
             "request": request,
@@ -388,57 +529,40 @@ def voter_login_post(request: Request, email: str = Form(...), password: str = F
             "candidates": candidates
         }
     )
+    return set_session_cookie(response, VOTER, voter["_id"], voter["election_id"])
 
 
 # ================= VOTE =================
 @app.post("/vote", response_class=HTMLResponse)
-def submit_vote(
+async def submit_vote(
     request: Request,
-    voter_id: str = Form(...),       # required
-    candidate_id: str = Form(...)    # required
+    candidate_id: str = Form(...),   # required
+    session: dict = Depends(voter_session)
 ):
-    # Fetch voter by UUID string
-    voter = voters_col.find_one({"_id": voter_id})
-    if not voter:
-        return HTMLResponse("Voter not found", status_code=404)
-
-    # Prevent multiple voting
-    if voter.get("has_voted"):
-        return HTMLResponse("You have already voted.", status_code=400)
-
-    # Generate unique vote token
-    vote_token = str(uuid.uuid4())
+    # Voter and election come from the signed session, never from the form
+    voter_id = session["subject_id"]
+    view = await get_election_view(session["election_id"])
+    if not view:
+        return HTMLResponse(INVALID_CANDIDATE, status_code=400)
+
+    if vote_ingest.enabled:
+        # Write-behind: acknowledged once logged to disk, committed in batches
+        success, result = await vote_ingest.submit(voter_id, candidate_id, view["election_id"], view["candidates"])
+    else:
+        # Conditionally flip has_voted and fetch the voter in one round trip
+        success, result = await cast_vote(voter_id, candidate_id, view["election_id"], view["candidates"])
+        if success:
+            live.notify_vote(view["election_id"])
+    if not success:
+        return HTMLResponse(result, status_code=404 if result == VOTER_NOT_FOUND else 400)
 
-    # Update voter with vote info AND store token in DB
-    voters_col.update_one(
-        {"_id": voter_id},
-        {"$set": {
-            "has_voted": True,
-            "voted_for": candidate_id,
-            "vote_token": vote_token
-        }}
-    )
+    voter = result
+    vote_token = voter["vote_token"]
+    election = view["election"]
+    candidates = view["candidates"]
 
-    # Fetch election info
-    ec = ec_col.find_one({"election_id": voter["election_id"]})
-    election = ec.get("election", {}) if ec else {}
-
-    # Include updated voter info (with token) for template
-    voter["has_voted"] = True
-    voter["voted_for"] = candidate_id
-    voter["vote_token"] = vote_token
-
-    # ===================== PREPARE CANDIDATE IMAGES =====================
-    # Add 'photo_url' for template rendering
-    candidates = []
-    for candidate in election.get("candidates", []):
-        # Ensure default image if none exists
-        candidate_copy = candidate.copy()
-        candidate_copy["photo_url"] = f"/static/{candidate.get('profile_pic') or 'uploads/candidates/default.png'}"
-        candidates.append(candidate_copy)
-
-    # Render thankyou page with voter info and token
-    return templates.TemplateResponse(
+    # Render thankyou page with voter info and token; the session has served its purpose
+    response = templates.TemplateResponse(
         "thankyou.html",
         {
             "request": request,
@@ -449,64 +573,66 @@ def submit_vote(
             "candidates": candidates     # include candidates with image URLs
         }
     )
+    return clear_session_cookie(response, VOTER)
+
+# ================= RECEIPT =================
+RECEIPT_RESPONSES = {
+    RECEIPT_RECORDED: (200, "Your vote has been recorded and is counted."),
+    RECEIPT_PENDING: (202, "Your vote has been received and is being recorded."),
+    RECEIPT_REJECTED: (409, "This vote was not counted: another vote by the same voter was recorded first."),
+}
+
+@app.get("/receipt/{vote_token}")
+async def vote_receipt(vote_token: str):
+    # Says whether the ballot counts, never which candidate it is for
+    status = await receipt_status(vote_token)
+    code, message = RECEIPT_RESPONSES.get(status, (404, "No vote with this receipt has been recorded."))
+    return JSONResponse({"vote_token": vote_token, "status": status, "message": message}, status_code=code)
 
 # ================= RESULT =================
-@app.get("/result", response_class=HTMLResponse)
-def result_page(request: Request, election_id: str):
-    # Fetch the election by ID
-    ec = ec_col.find_one({"election_id": election_id})
-    if not ec:
+@app.get("/result", response_class=HTMLResponse, dependencies=[read_route("result")])
+async def result_page(request: Request, election_id: str):
+    # Cached election header and candidates
+    view = await get_election_view(election_id)
+    if not view:
         return HTMLResponse("Election not found", status_code=404)
 
-    # Extract election details
-    election = ec.get("election", {})
-    voters = list(voters_col.find({"election_id": election_id}))
-    candidates = election.get("candidates", [])
-
-    # Calculate total votes cast
-    total_votes = sum(1 for v in voters if v.get("has_voted"))
-
-    # Compute votes and percentage for each candidate
-    for c in candidates:
-        votes = sum(1 for v in voters if v.get("voted_for") == str(c.get("_id")))
-        c["votes"] = votes
-        c["percentage"] = round((votes / total_votes * 100) if total_votes else 0, 1)
-
-        # Ensure optional fields exist for template
-        c["name"] = c.get("name", "Candidate")
-        c["party_name"] = c.get("party", "Independent")
-        c["image_url"] = f"/static/{c.get('profile_pic') or 'uploads/candidates/default.png'}"
-
-    # Sort candidates by votes (for display only)
-    candidates.sort(key=lambda x: x["votes"], reverse=True)
-
-    # ---------------- WINNER / DRAW LOGIC ----------------
-    winner = None
-    is_draw = False
-
-    if total_votes == 0:
-        winner = None
-        is_draw = False
-    else:
-        top_votes = candidates[0]["votes"]
-        top_candidates = [c for c in candidates if c["votes"] == top_votes]
-
-        if len(top_candidates) > 1:
-            is_draw = True
-        else:
-            winner = top_candidates[0]
+    # One O(1) counter read; the page is only re-rendered when its version moves
+    votes, total_votes, version = await get_versioned_vote_counts(election_id)
+    key = ("result", election_id, version) if version is not None else None
+    page = key and cached_page(key)
+    if page:
+        return page
+
+    result = build_result(view["candidates"], votes, total_votes)
+    return render_page(request, key, "Result.html", {"election": view["election"], **result})
+
+@app.get("/result/stream", dependencies=[read_route("result")])
+async def result_stream(request: Request, election_id: str):
+    # Server-sent events: one shared publisher per election pushes coalesced tally deltas
+    view = await get_election_view(election_id)
+    if not view:
+        return HTMLResponse("Election not found", status_code=404)
 
-    # Render the results page
-    return templates.TemplateResponse(
-        "Result.html",
-        {
-            "request": request,
-            "election": election,
-            "candidates": candidates,
-            "total_votes": total_votes,
-            "winner": winner,
-            "is_draw": is_draw
-        }
+    subscriber = live.subscribe(election_id)
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                update = await subscriber.next()
+                if subscriber.closed:
+                    break
+                if update is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"data: {json.dumps(update)}\n\n"
+        finally:
+            live.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 # ================= DUMMY OAUTH =================
@@ -547,12 +673,71 @@ def test_thankyou(request: Request):
 
 
 # ================= INSTRUCTION PAGE =================
-@app.get("/instructions", response_class=HTMLResponse)
-def instructions_page(request: Request, election_id: str | None = None):
-    return templates.TemplateResponse(
-        "instruction.html",
-        {
-            "request": request,
-            "election_id": election_id
-        }
-    )
\ No newline at end of file
+@app.get("/instructions", response_class=HTMLResponse, dependencies=[read_route("instructions")])
+def instructions_page(request: Request):
+    # Static content: one cache entry, whatever query string the link carries
+    key = ("instructions",)
+    return cached_page(key) or render_page(request, key, "instruction.html", {})
+
+
+# ================= HEALTH =================
+@app.get("/healthz")
+async def healthz(request: Request):
+    # Status only for load balancers; the pool report and errors name MongoDB
+    # internals, so they need the operations token
+    report = {"status": "ok"}
+    detailed = ops_authorized(request)
+    if detailed:
+        # Pool counters per client; connections needed = workers x 2 clients x max pool size
+        workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+        report.update({
+            "pool": {
+                "max_pool_size": MONGO_MAX_POOL_SIZE,
+                "min_pool_size": MONGO_MIN_POOL_SIZE,
+                "wait_queue_timeout_ms": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                "workers": workers,
+                "max_connections": workers * 2 * MONGO_MAX_POOL_SIZE,
+            },
+            "sync": pool_monitor.stats(),
+            "async": async_db.pool_monitor.stats(),
+        })
+
+    if async_db.connect() is None:
+        report["status"] = "unconfigured"
+        return JSONResponse(report, status_code=503)
+
+    try:
+        ping_ms = round(await async_db.ping(), 2)
+    except PyMongoError as e:
+        report["status"] = "unavailable"
+        if detailed:
+            report["error"] = str(e)
+        return JSONResponse(report, status_code=503)
+
+    if detailed:
+        report["ping_ms"] = ping_ms
+    return JSONResponse(report)
+
+# ================= METRICS =================
+def ops_token(request: Request):
+    # Internals (routes, pools, queues): scraped with "Authorization: Bearer <OPS_TOKEN>"
+    if not ops_authorized(request):
+        raise HTTPException(status_code=401, detail="Operations token required", headers={"WWW-Authenticate": "Bearer"})
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(ops_token)])
+def prometheus_metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# ================= PASSWORD POOL METRICS =================
+@app.get("/metrics/password-pool", dependencies=[Depends(ops_token)])
+def password_pool_metrics():
+    return JSONResponse(password_pool.stats())
+
+@app.get("/metrics/vote-ingest", dependencies=[Depends(ops_token)])
+def vote_ingest_metrics():
+    return JSONResponse(vote_ingest.stats())
+
+@app.get("/metrics/cache", dependencies=[Depends(ops_token)])
+def cache_metrics():
+    return JSONResponse({name: cache.stats() for name, cache in caches.items()})
@@ -0,0 +1,286 @@
+# app/metrics.py
+
+import hmac
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from starlette.datastructures import MutableHeaders
+
+from db.commands import command_timer, trace
+
+# ----------------------------
+# Configuration (per deployment)
+# ----------------------------
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# Share of requests whose time is broken down into db / template / bcrypt phases
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", "1.0"))
+# Server-Timing headers expose internals; meant for staging and ad-hoc debugging
+METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "0") == "1"
+# Bearer token for the operations endpoints (metrics, detailed health); unset keeps them closed
+OPS_TOKEN = os.getenv("OPS_TOKEN", "")
+
+# Seconds; bcrypt at 12 rounds lands around 0.25
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# MongoDB round trips per request
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50)
+
+
+def ops_authorized(request) -> bool:
+    """
+    Whether the request carries "Authorization: Bearer <OPS_TOKEN>". Always False
+    while no token is configured.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    return bool(OPS_TOKEN) and scheme.lower() == "bearer" and hmac.compare_digest(token.strip(), OPS_TOKEN)
+
+
+# -------------------- METRIC TYPES --------------------
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonic counter per label set, in the Prometheus text format.
+    """
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram per label set. Observing is a bisect and three
+    additions under a lock, cheap enough for every request.
+    """
+
+    def __init__(self, name: str, help: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}       # labels -> [per-bucket counts (+Inf last), sum, count]
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket in zip((*self.buckets, float("inf")), counts):
+                    cumulative += bucket
+                    le = _labels(self.labels, labels, [("le", _number(bound))])
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labels, labels)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.labels, labels)} {count}")
+        return lines
+
+
+# -------------------- METRICS --------------------
+request_duration = Histogram(
+    "evoting_http_request_duration_seconds", "Time to serve a request, by route template.", ("method", "route")
+)
+requests_total = Counter(
+    "evoting_http_requests_total", "Requests served, by route template and status.", ("method", "route", "status")
+)
+request_db_seconds = Histogram(
+    "evoting_request_db_seconds", "MongoDB time per sampled request.", ("route",)
+)
+request_db_calls = Histogram(
+    "evoting_request_db_calls", "MongoDB round trips per sampled request.", ("route",), buckets=COUNT_BUCKETS
+)
+template_render = Histogram(
+    "evoting_template_render_seconds", "Jinja render time per sampled request.", ("template",)
+)
+request_bcrypt_seconds = Histogram(
+    "evoting_request_bcrypt_seconds", "bcrypt time (queueing included) per sampled request.", ("route",)
+)
+login_rejected = Counter(
+    "evoting_login_rejected_total", "Login attempts refused before any lookup, by reason.", ("scope", "reason")
+)
+login_failures = Counter(
+    "evoting_login_failures_total", "Logins with an unknown account or a wrong password.", ("scope",)
+)
+login_lockouts = Counter(
+    "evoting_login_lockouts_total", "Account lockouts started.", ("scope",)
+)
+
+REQUEST_METRICS = (
+    request_duration, requests_total, request_db_seconds, request_db_calls, template_render, request_bcrypt_seconds,
+    login_rejected, login_failures, login_lockouts,
+)
+
+
+@contextmanager
+def timed(phase: str):
+    """
+    Add the block's wall time to `phase` in the current request's trace. A no-op
+    for requests that were not sampled.
+    """
+    current = trace.get()
+    if current is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        current[phase] = current.get(phase, 0.0) + time.perf_counter() - start
+
+
+# -------------------- MIDDLEWARE --------------------
+def _route_label(scope) -> str:
+    # The route template, never the raw path, so ids do not explode the label set
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    return "/static" if scope["path"].startswith("/static/") else "unmatched"
+
+
+def _server_timing(current: dict, total: float) -> str:
+    entries = []
+    if "db_calls" in current:
+        entries.append(f'db;dur={current["db"] * 1000:.1f};desc="{current["db_calls"]} calls"')
+    for phase in ("tpl", "bcrypt"):
+        if phase in current:
+            entries.append(f"{phase};dur={current[phase] * 1000:.1f}")
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: times every HTTP request and, for the sampled share,
+    attributes its time to MongoDB, templates and bcrypt through the `trace`
+    context variable. Streaming bodies (import progress, live results) are
+    timed up to their headers.
+    """
+
+    def __init__(self, app, sample_rate: float = METRICS_SAMPLE_RATE, server_timing: bool = METRICS_SERVER_TIMING):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        current = {} if random.random() < self.sample_rate else None
+        token = trace.set(current)
+        start = time.perf_counter()
+        status = 500
+        elapsed = None
+
+        async def send_timed(message):
+            nonlocal status, elapsed
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = time.perf_counter() - start
+                if current is not None and self.server_timing:
+                    MutableHeaders(scope=message).append("server-timing", _server_timing(current, elapsed))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            trace.reset(token)
+            if elapsed is None:
+                elapsed = time.perf_counter() - start
+            route = _route_label(scope)
+            request_duration.observe(elapsed, scope["method"], route)
+            requests_total.inc(scope["method"], route, str(status))
+            if current is not None:
+                request_db_seconds.observe(current.get("db", 0.0), route)
+                request_db_calls.observe(current.get("db_calls", 0), route)
+                if "bcrypt" in current:
+                    request_bcrypt_seconds.observe(current["bcrypt"], route)
+
+
+# -------------------- EXPOSITION --------------------
+def _gauge(name: str, help: str, samples):
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+    lines.extend(f"{name}{labels} {_number(value)}" for labels, value in samples)
+    return lines
+
+
+def render_metrics() -> str:
+    """
+    Everything in the Prometheus text format. Counters are per worker process;
+    Prometheus sums them across workers at query time.
+    """
+    from db import async_db
+    from db.db import pool_monitor
+    from app.passwords import password_pool
+
+    lines = []
+    for metric in REQUEST_METRICS:
+        lines.extend(metric.render())
+
+    commands = sorted(command_timer.stats().items())
+    for suffix, key, help in (
+        ("total", "count", "MongoDB commands run, by command name."),
+        ("failures_total", "failures", "MongoDB commands that failed, by command name."),
+        ("seconds_total", "seconds", "Time spent in MongoDB commands, by command name."),
+    ):
+        name = f"evoting_mongo_commands_{suffix}"
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} counter"]
+        lines += [f'{name}{{command="{_escape(command)}"}} {_number(stats[key])}' for command, stats in commands]
+
+    # Servers are labelled server-1, server-2 ... by the monitors, never by host name
+    pools = [
+        (client, server, stats)
+        for client, monitor in (("sync", pool_monitor), ("async", async_db.pool_monitor))
+        for server, stats in monitor.stats().items()
+    ]
+    for key, help in (("open", "Open pooled connections."), ("in_use", "Connections checked out.")):
+        lines += _gauge(
+            f"evoting_mongo_pool_{key}", help,
+            [(_labels(("client", "server"), (client, server)), stats[key]) for client, server, stats in pools]
+        )
+
+    pool = password_pool.stats()
+    lines += _gauge("evoting_password_pool_in_flight", "bcrypt jobs running or queued.", [("", pool["in_flight"])])
+    lines += ["# HELP evoting_password_pool_rejected_total bcrypt jobs rejected while saturated.",
+              "# TYPE evoting_password_pool_rejected_total counter",
+              f"evoting_password_pool_rejected_total {pool['rejected']}"]
+
+    return "\n".join(lines) + "\n"
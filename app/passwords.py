@@ -0,0 +1,146 @@
+# app/passwords.py
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+
+from app.metrics import timed
+
+# ----------------------------
+# Configuration (per deployment)
+# ----------------------------
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_POOL_QUEUE = int(os.getenv("PASSWORD_POOL_QUEUE", str(PASSWORD_POOL_WORKERS * 4)))
+PASSWORD_POOL_MODE = os.getenv("PASSWORD_POOL_MODE", "thread")  # thread / process
+
+
+# -------------------- BCRYPT WORK --------------------
+# Top-level functions so they can be shipped to a process pool.
+def check_password(password: str, password_hash: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+# -------------------- POOL --------------------
+class PasswordPoolBusy(Exception):
+    """
+    Raised instead of queueing when the pool is saturated; routes answer 503.
+    """
+
+
+class PasswordPool:
+    """
+    Bounded worker pool for bcrypt. bcrypt releases the GIL, so threads already
+    use every core; the process mode is there for interpreters where it does not.
+    At most `workers + max_queue` jobs are accepted at once, the rest are rejected.
+    """
+
+    def __init__(self, workers: int, max_queue: int, mode: str = "thread", rounds: int = BCRYPT_ROUNDS):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.mode = mode
+        self.rounds = rounds
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    executor_cls = ProcessPoolExecutor if self.mode == "process" else ThreadPoolExecutor
+                    self._executor = executor_cls(max_workers=self.workers)
+        return self._executor
+
+    def _submit(self, fn, *args):
+        executor = self._get_executor()
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordPoolBusy()
+            self.in_flight += 1
+
+        future = executor.submit(fn, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    # ---------------- async (event loop) ----------------
+    # Timed as the request's `bcrypt` phase, time spent queueing included
+    async def verify(self, password: str, password_hash: str) -> bool:
+        with timed("bcrypt"):
+            return await asyncio.wrap_future(self._submit(check_password, password, password_hash))
+
+    async def hash(self, password: str) -> str:
+        with timed("bcrypt"):
+            return await asyncio.wrap_future(self._submit(hash_password, password, self.rounds))
+
+    # ---------------- sync (threadpool routes) ----------------
+    def verify_sync(self, password: str, password_hash: str) -> bool:
+        with timed("bcrypt"):
+            return self._submit(check_password, password, password_hash).result()
+
+    def hash_sync(self, password: str) -> str:
+        with timed("bcrypt"):
+            return self._submit(hash_password, password, self.rounds).result()
+
+    def hash_many_sync(self, passwords: list) -> list:
+        """
+        Hash a batch in windows of `workers` jobs so bulk work never floods the
+        queue ahead of interactive logins; waits briefly while the pool is busy.
+        """
+        hashes = []
+        for start in range(0, len(passwords), max(1, self.workers)):
+            window = passwords[start:start + max(1, self.workers)]
+            futures = []
+            for password in window:
+                while True:
+                    try:
+                        futures.append(self._submit(hash_password, password, self.rounds))
+                        break
+                    except PasswordPoolBusy:
+                        time.sleep(0.05)
+            hashes.extend(f.result() for f in futures)
+        return hashes
+
+    # ---------------- metrics ----------------
+    def stats(self):
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "bcrypt_rounds": self.rounds,
+                "in_flight": self.in_flight,
+                "queue_depth": max(0, self.in_flight - self.workers),
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_pool = PasswordPool(
+    workers=PASSWORD_POOL_WORKERS,
+    max_queue=PASSWORD_POOL_QUEUE,
+    mode=PASSWORD_POOL_MODE,
+    rounds=BCRYPT_ROUNDS
+)
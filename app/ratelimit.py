@@ -0,0 +1,228 @@
+# app/ratelimit.py
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from pymongo import ReturnDocument
+
+from app.metrics import login_failures, login_lockouts, login_rejected
+
+# ----------------------------
+# Configuration (per deployment)
+# ----------------------------
+LOGIN_RATE_LIMIT = os.getenv("LOGIN_RATE_LIMIT", "1") == "1"
+# Token buckets: a burst allowance, refilled at a sustained rate. Polling stations
+# put many voters behind one address, so the per-address bucket is the generous one
+LOGIN_IP_BURST = int(os.getenv("LOGIN_IP_BURST", "30"))
+LOGIN_IP_PER_MINUTE = float(os.getenv("LOGIN_IP_PER_MINUTE", "60"))
+LOGIN_ACCOUNT_BURST = int(os.getenv("LOGIN_ACCOUNT_BURST", "5"))
+LOGIN_ACCOUNT_PER_MINUTE = float(os.getenv("LOGIN_ACCOUNT_PER_MINUTE", "5"))
+# Consecutive failures before an account locks; each further failure doubles the lock
+LOGIN_LOCKOUT_AFTER = int(os.getenv("LOGIN_LOCKOUT_AFTER", "5"))
+LOGIN_LOCKOUT_SECONDS = float(os.getenv("LOGIN_LOCKOUT_SECONDS", "30"))
+LOGIN_LOCKOUT_MAX_SECONDS = float(os.getenv("LOGIN_LOCKOUT_MAX_SECONDS", "900"))
+# memory (per worker, no I/O) or mongo (shared by every worker, a round trip per step)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+
+def lockout_seconds(failures: int, after: int, base: float, cap: float) -> float:
+    """
+    Lock length once `failures` consecutive failures are recorded: 0 below
+    `after`, then base, 2 x base, 4 x base ... up to `cap`.
+    """
+    if failures < after:
+        return 0.0
+    return min(cap, base * 2 ** min(failures - after, 32))
+
+
+# -------------------- BACKENDS --------------------
+# A backend keeps token buckets and failure counts by key. All of them answer:
+#   take(key, burst, per_second, now)  -> 0.0 if a token was taken, else seconds until one is
+#   locked_for(key, now)               -> seconds left on the key's lockout, 0.0 if none
+#   fail(key, now, after, base, cap)   -> length of the lockout this failure started, 0.0 if none
+#   clear(key)                         -> forget the key's failures
+class MemoryBackend:
+    """
+    Per-process state, bounded to `max_keys` entries (least recently used go
+    first). Each worker limits on its own, so the effective limits scale with
+    the worker count.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()   # key -> [tokens, updated_at]
+        self._failures = OrderedDict()  # key -> [failures, locked_until]
+
+    def _remember(self, table, key, entry):
+        table[key] = entry
+        table.move_to_end(key)
+        while len(table) > self.max_keys:
+            table.popitem(last=False)
+
+    async def take(self, key, burst, per_second, now):
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + max(0.0, now - updated_at) * per_second)
+            if tokens >= 1:
+                self._remember(self._buckets, key, [tokens - 1, now])
+                return 0.0
+            self._remember(self._buckets, key, [tokens, now])
+            return (1 - tokens) / per_second
+
+    async def locked_for(self, key, now):
+        entry = self._failures.get(key)
+        return max(0.0, entry[1] - now) if entry else 0.0
+
+    async def fail(self, key, now, after, base, cap):
+        with self._lock:
+            failures = self._failures.get(key, (0, 0.0))[0] + 1
+            lock = lockout_seconds(failures, after, base, cap)
+            self._remember(self._failures, key, [failures, now + lock])
+            return lock
+
+    async def clear(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+class MongoBackend:
+    """
+    State shared by every worker and instance in one collection, updated atomically
+    server side. Documents expire through the TTL index on expires_at. A key's
+    bucket and its failures live in separate documents, so the short-lived
+    bucket never cuts a lockout's expiry short.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    @staticmethod
+    def _expires(now, seconds):
+        return datetime.fromtimestamp(now + seconds, tz=timezone.utc)
+
+    @staticmethod
+    def _failures(key):
+        # Limiter keys start with their scope, never with "failures:"
+        return f"failures:{key}"
+
+    async def take(self, key, burst, per_second, now):
+        elapsed = {"$max": [0, {"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}]}
+        refilled = {"$add": [{"$ifNull": ["$tokens", burst]}, {"$multiply": [elapsed, per_second]}]}
+        doc = await self.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": {"$min": [burst, refilled]}, "updated_at": now,
+                          "expires_at": self._expires(now, burst / per_second)}},
+                # Stages see the previous stage's output, so this reads the refilled count
+                {"$set": {"allowed": {"$gte": ["$tokens", 1]},
+                          "tokens": {"$cond": [{"$gte": ["$tokens", 1]}, {"$subtract": ["$tokens", 1]}, "$tokens"]}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return 0.0 if doc["allowed"] else (1 - doc["tokens"]) / per_second
+
+    async def locked_for(self, key, now):
+        doc = await self.collection.find_one({"_id": self._failures(key)}, {"locked_until": 1})
+        return max(0.0, doc.get("locked_until", 0.0) - now) if doc else 0.0
+
+    async def fail(self, key, now, after, base, cap):
+        doc = await self.collection.find_one_and_update(
+            {"_id": self._failures(key)},
+            {"$inc": {"failures": 1}, "$set": {"expires_at": self._expires(now, cap)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        lock = lockout_seconds(doc["failures"], after, base, cap)
+        if lock:
+            await self.collection.update_one({"_id": self._failures(key)}, {"$set": {"locked_until": now + lock}})
+        return lock
+
+    async def clear(self, key):
+        await self.collection.delete_one({"_id": self._failures(key)})
+
+
+# -------------------- LIMITER --------------------
+class LoginLimiter:
+    """
+    Gate in front of the login routes, checked before any lookup or bcrypt work.
+    An attempt needs the account to be unlocked and a token from both its
+    address's bucket and its account's bucket. `scope` keeps the EC and voter
+    logins apart.
+    """
+
+    def __init__(self, backend, enabled: bool = LOGIN_RATE_LIMIT,
+                 ip_burst: int = LOGIN_IP_BURST, ip_per_minute: float = LOGIN_IP_PER_MINUTE,
+                 account_burst: int = LOGIN_ACCOUNT_BURST, account_per_minute: float = LOGIN_ACCOUNT_PER_MINUTE,
+                 lockout_after: int = LOGIN_LOCKOUT_AFTER, lockout_seconds: float = LOGIN_LOCKOUT_SECONDS,
+                 lockout_max_seconds: float = LOGIN_LOCKOUT_MAX_SECONDS):
+        self.backend = backend
+        self.enabled = enabled
+        self.ip_burst = ip_burst
+        self.ip_rate = ip_per_minute / 60
+        self.account_burst = account_burst
+        self.account_rate = account_per_minute / 60
+        self.lockout_after = lockout_after
+        self.lockout_seconds = lockout_seconds
+        self.lockout_max_seconds = lockout_max_seconds
+
+    @staticmethod
+    def _account(scope: str, email: str) -> str:
+        # Case and stray spaces do not buy an attacker a fresh bucket
+        return f"{scope}:account:{email.strip().lower()}"
+
+    async def check(self, scope: str, ip: str | None, email: str, now: float | None = None) -> int:
+        """
+        0 when the attempt may proceed, else the whole seconds to put in Retry-After.
+        """
+        if not self.enabled:
+            return 0
+        now = time.time() if now is None else now
+        account = self._account(scope, email)
+
+        wait, reason = await self.backend.locked_for(account, now), "lockout"
+        if not wait:
+            wait, reason = await self.backend.take(f"{scope}:ip:{ip}", self.ip_burst, self.ip_rate, now), "ip"
+        if not wait:
+            wait, reason = await self.backend.take(account, self.account_burst, self.account_rate, now), "account"
+        if not wait:
+            return 0
+
+        login_rejected.inc(scope, reason)
+        return max(1, math.ceil(wait))
+
+    async def failed(self, scope: str, email: str, now: float | None = None):
+        """
+        Record a wrong password or unknown account; may lock the account.
+        """
+        login_failures.inc(scope)
+        if not self.enabled:
+            return
+        now = time.time() if now is None else now
+        lock = await self.backend.fail(
+            self._account(scope, email), now, self.lockout_after, self.lockout_seconds, self.lockout_max_seconds
+        )
+        if lock:
+            login_lockouts.inc(scope)
+
+    async def succeeded(self, scope: str, email: str):
+        if self.enabled:
+            await self.backend.clear(self._account(scope, email))
+
+
+def create_backend(kind: str = RATE_LIMIT_BACKEND):
+    if kind == "mongo":
+        from db.async_db import limits_col
+        return MongoBackend(limits_col)
+    if kind == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND {kind!r}")
+
+
+login_limiter = LoginLimiter(create_backend())
@@ -0,0 +1,126 @@
+# app/rendering.py
+
+import os
+import time
+from datetime import datetime
+from functools import cached_property
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from fastapi.responses import HTMLResponse
+from fastapi.templating import Jinja2Templates
+
+from app.assets import assets
+from app.cache import TTLCache
+from app.metrics import template_render
+from db.commands import trace
+
+TEMPLATE_DIR = "templates"
+
+# Compiled template bytecode survives restarts; None picks a per-user temp directory
+JINJA_CACHE_DIR = os.getenv("JINJA_CACHE_DIR") or None
+# Production can skip the per-render mtime check on every template
+TEMPLATES_AUTO_RELOAD = os.getenv("TEMPLATES_AUTO_RELOAD", "1") == "1"
+
+# Rendered public pages, keyed on the data version they were rendered from
+PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", "512"))
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "300"))
+
+page_cache = TTLCache("pages", maxsize=PAGE_CACHE_SIZE, ttl=PAGE_CACHE_TTL)
+
+
+# -------------------- ENVIRONMENT --------------------
+def datetimeformat(value, format="%d/%m/%Y %H:%M"):
+    if not value:
+        return "Not set"
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.strftime(format)
+
+
+class TimedTemplate(Template):
+    """
+    Template whose renders are timed for sampled requests (the `tpl` phase).
+    """
+
+    def render(self, *args, **kwargs):
+        current = trace.get()
+        if current is None:
+            return super().render(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            current["tpl"] = current.get("tpl", 0.0) + elapsed
+            template_render.observe(elapsed, self.name)
+
+
+def create_environment(cache_dir: str | None = JINJA_CACHE_DIR, auto_reload: bool = TEMPLATES_AUTO_RELOAD):
+    """
+    Jinja environment with a persistent bytecode cache, so a fresh worker loads
+    compiled templates from disk instead of parsing every template again.
+    """
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=True,
+        auto_reload=auto_reload,
+        bytecode_cache=FileSystemBytecodeCache(cache_dir),
+        cache_size=-1,      # never evict a compiled template
+    )
+    env.template_class = TimedTemplate
+    env.filters["datetimeformat"] = datetimeformat
+    env.globals["asset_url"] = assets.url
+    return env
+
+
+class LazyTemplates:
+    """
+    Jinja2Templates built on first use (precompile_templates at startup), so
+    importing the app creates no cache directory.
+    """
+
+    @cached_property
+    def _templates(self):
+        return Jinja2Templates(env=create_environment())
+
+    @property
+    def env(self):
+        return self._templates.env
+
+    def TemplateResponse(self, *args, **kwargs):
+        return self._templates.TemplateResponse(*args, **kwargs)
+
+
+templates = LazyTemplates()
+
+
+def precompile_templates():
+    """
+    Load every template once at startup so the first visitor does not pay for compiling.
+    """
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.env.get_template(name)
+    return names
+
+
+# -------------------- PAGE CACHE --------------------
+def cached_page(key):
+    """
+    Return a cached HTMLResponse for `key`, or None when it has to be rendered.
+    """
+    body = page_cache.get(key)
+    if body is None:
+        return None
+    return HTMLResponse(body)
+
+
+def render_page(request, key, template: str, context: dict):
+    """
+    Render a public page and keep its body under `key`. Pass key=None for pages
+    whose data version is unknown; they are rendered but never cached.
+    """
+    response = templates.TemplateResponse(template, {"request": request, **context})
+    if key is not None:
+        page_cache.set(key, response.body)
+    return response
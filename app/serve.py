@@ -0,0 +1,137 @@
+# app/serve.py
+"""
+Production entry point: one uvicorn worker per available core on uvloop and
+httptools, no file watcher.
+
+    python -m app.serve
+    WEB_CONCURRENCY=4 PORT=8080 python -m app.serve
+
+Workers are spawned, not forked, so every worker opens its own MongoDB clients
+(pymongo clients must not cross a fork). Each worker runs the startup warmup
+before it takes its first connection. On SIGTERM a worker stops accepting,
+ends its live-result streams, lets in-flight requests (votes included) finish
+for up to GRACEFUL_TIMEOUT seconds, then commits the vote log and exits.
+
+Settings every worker has to agree on are checked here, before any worker is
+spawned: several workers need one shared SESSION_SECRET, and with
+VOTE_INGEST_MODE=wal each worker writes <VOTE_WAL_PATH>.<pid> in a folder they
+can all reach.
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+# ----------------------------
+# Configuration (per deployment)
+# ----------------------------
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# Must stay below the orchestrator's kill timeout (docker: stop_grace_period)
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "20"))
+KEEPALIVE_TIMEOUT = int(os.getenv("KEEPALIVE_TIMEOUT", "5"))
+# The reverse proxy usually logs requests already
+ACCESS_LOG = os.getenv("ACCESS_LOG", "0") == "1"
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+# Read by the workers (app.sessions, app.voters.ingest); the parent only checks them
+SESSION_SECRET = os.getenv("SESSION_SECRET", "")
+VOTE_INGEST_MODE = os.getenv("VOTE_INGEST_MODE", "direct")
+VOTE_WAL_PATH = os.getenv("VOTE_WAL_PATH", "data/votes.wal")
+
+
+def available_cpus() -> int:
+    """
+    Cores this process may run on: CPU affinity, capped by a cgroup v2 CPU quota
+    so a container limited to 2 CPUs on a 32 core host gets 2 workers.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def check_shared_settings(workers: int) -> str | None:
+    """
+    Why the workers could not run together, or None. Failing here beats every
+    spawned worker crashing on import and the supervisor restarting it forever.
+    """
+    if workers > 1 and not SESSION_SECRET.strip(","):
+        return "SESSION_SECRET must be set: workers verify each other's sessions with it"
+
+    if VOTE_INGEST_MODE == "wal":
+        folder = Path(VOTE_WAL_PATH).parent
+        try:
+            folder.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            return f"Cannot create the vote log folder {folder}: {e}"
+        if not os.access(folder, os.W_OK):
+            return f"The vote log folder {folder} is not writable"
+    return None
+
+
+class DrainingServer(uvicorn.Server):
+    """
+    uvicorn waits for open connections before shutting down; server-sent event
+    streams never finish on their own, so they are ended first. Browsers
+    reconnect to another worker.
+    """
+
+    async def shutdown(self, sockets=None):
+        from app.elections import live
+        live.drain()
+        await super().shutdown(sockets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "0")) or available_cpus())
+    args = parser.parse_args()
+
+    problem = check_shared_settings(args.workers)
+    if problem:
+        parser.error(problem)
+
+    # Inherited by the spawned workers: /healthz sizes the pool report from it, and
+    # bcrypt threads are split across workers instead of each one taking every core
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+    os.environ.setdefault("PASSWORD_POOL_WORKERS", str(max(1, available_cpus() // args.workers)))
+
+    config = uvicorn.Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        access_log=ACCESS_LOG,
+        proxy_headers=True,
+        forwarded_allow_ips=FORWARDED_ALLOW_IPS,
+        timeout_keep_alive=KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+    )
+    server = DrainingServer(config)
+
+    if args.workers > 1:
+        sock = config.bind_socket()
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# app/sessions.py
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+
+# ----------------------------
+# Configuration (per deployment)
+# ----------------------------
+# Comma-separated: the first secret signs, every one verifies (rotate by prepending)
+SESSION_SECRETS = [s.strip() for s in os.getenv("SESSION_SECRET", "").split(",") if s.strip()]
+VOTER_SESSION_TTL = int(os.getenv("VOTER_SESSION_TTL", "900"))       # long enough to read the ballot
+EC_SESSION_TTL = int(os.getenv("EC_SESSION_TTL", "28800"))           # one working day
+# Browsers drop Secure cookies over plain HTTP: turn it on once the site is served over HTTPS
+SESSION_COOKIE_SECURE = os.getenv("SESSION_COOKIE_SECURE", "0") == "1"
+
+VOTER = "voter"
+EC = "ec"
+COOKIE_NAMES = {VOTER: "voter_session", EC: "ec_session"}
+TTLS = {VOTER: VOTER_SESSION_TTL, EC: EC_SESSION_TTL}
+
+if not SESSION_SECRETS:
+    # A random per-process secret only works for a single dev worker: with more,
+    # a session issued by one worker is rejected by the others
+    if int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+        raise RuntimeError("SESSION_SECRET is not set; every worker must share the same secret")
+    print("⚠️ SESSION_SECRET not set, using a random per-process secret (single dev worker only)")
+    SESSION_SECRETS = [secrets.token_urlsafe(32)]
+
+_keys = [s.encode("utf-8") for s in SESSION_SECRETS]
+
+
+class SessionRequired(Exception):
+    """
+    Raised by the session dependencies when a route needs a login it does not have.
+    """
+
+    def __init__(self, role: str):
+        self.role = role
+
+
+# -------------------- TOKENS --------------------
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str, key: bytes) -> str:
+    return _b64encode(hmac.new(key, payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def issue(role: str, subject_id: str, election_id: str, now: float | None = None) -> str:
+    """
+    Signed token "<payload>.<signature>" carrying the role, subject, election and expiry.
+    """
+    expires_at = int((now or time.time()) + TTLS[role])
+    body = json.dumps({"r": role, "s": subject_id, "e": election_id, "x": expires_at}, separators=(",", ":"))
+    payload = _b64encode(body.encode("utf-8"))
+    return f"{payload}.{_sign(payload, _keys[0])}"
+
+
+def verify(token: str | None, role: str, now: float | None = None) -> dict | None:
+    """
+    The session in `token` as {"role", "subject_id", "election_id", "expires_at"}, or None
+    if it is missing, tampered with, expired or for another role.
+    Pure CPU: one HMAC per key tried, no database round trip and no bcrypt.
+    """
+    if not token or not token.isascii() or token.count(".") != 1:
+        return None
+
+    payload, signature = token.split(".")
+    if not any(hmac.compare_digest(signature, _sign(payload, key)) for key in _keys):
+        return None
+
+    try:
+        data = json.loads(_b64decode(payload))
+        session = {"role": data["r"], "subject_id": data["s"], "election_id": data["e"], "expires_at": int(data["x"])}
+    except (ValueError, KeyError, TypeError):
+        return None
+
+    if session["role"] != role or session["expires_at"] <= (now or time.time()):
+        return None
+    return session
+
+
+# -------------------- COOKIES --------------------
+def set_session_cookie(response, role: str, subject_id: str, election_id: str):
+    response.set_cookie(
+        COOKIE_NAMES[role],
+        issue(role, subject_id, election_id),
+        max_age=TTLS[role],
+        httponly=True,
+        secure=SESSION_COOKIE_SECURE,
+        samesite="lax",
+    )
+    return response
+
+
+def clear_session_cookie(response, role: str):
+    response.delete_cookie(COOKIE_NAMES[role], httponly=True, secure=SESSION_COOKIE_SECURE, samesite="lax")
+    return response
+
+
+def read_session(request, role: str) -> dict | None:
+    return verify(request.cookies.get(COOKIE_NAMES[role]), role)
@@ -0,0 +1,204 @@
+# app/uploads.py
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import HTMLResponse
+
+STATIC_DIR = Path("static")
+CANDIDATE_DIR = "uploads/candidates"
+THUMBNAIL_DIR = "uploads/candidates/thumbs"
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(5 * 1024 * 1024)))
+# The whole request: the image plus the other form fields and multipart framing
+MAX_UPLOAD_REQUEST_BYTES = MAX_UPLOAD_BYTES + 64 * 1024
+# A small file can still decode to a huge bitmap; checked before any pixel is decoded
+MAX_IMAGE_PIXELS = int(os.getenv("MAX_IMAGE_PIXELS", str(50_000_000)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+THUMBNAIL_WIDTHS = (96, 128, 192, 256)
+
+# Magic bytes -> extension; the client's filename and content type are not trusted
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+)
+
+
+def sniff_image_type(head: bytes):
+    """
+    Extension for the image format in the first bytes of a file, or None.
+    """
+    for signature, ext in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+# -------------------- UPLOAD --------------------
+def save_candidate_image(upload):
+    """
+    Stream an uploaded candidate photo to disk in chunks, enforcing MAX_UPLOAD_BYTES
+    and a magic-byte type check. Files are named by content hash, so re-uploading
+    the same picture reuses the stored copy and its thumbnails.
+    Returns (True, (profile_pic, thumbnail)) or (False, error message); paths are
+    relative to the static folder and thumbnail is None when none could be made.
+    """
+    folder = STATIC_DIR / CANDIDATE_DIR
+    folder.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    ext = None
+
+    with tempfile.NamedTemporaryFile(dir=folder, prefix=".upload-", delete=False) as tmp:
+        try:
+            while True:
+                chunk = upload.file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                if ext is None:
+                    ext = sniff_image_type(chunk[:16])
+                    if ext is None:
+                        raise ValueError("Unsupported image type (use JPEG, PNG, GIF or WebP)")
+
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise ValueError(f"Image is larger than {MAX_UPLOAD_BYTES // 1024} KB")
+
+                digest.update(chunk)
+                tmp.write(chunk)
+
+            if ext is None:
+                raise ValueError("Uploaded image is empty")
+        except ValueError as e:
+            tmp.close()
+            os.unlink(tmp.name)
+            return False, str(e)
+
+    content_hash = digest.hexdigest()[:32]
+    profile_pic = f"{CANDIDATE_DIR}/{content_hash}{ext}"
+    target = STATIC_DIR / profile_pic
+
+    stored = target.exists()
+    if stored:
+        os.unlink(tmp.name)         # identical image already stored
+    else:
+        os.replace(tmp.name, target)
+
+    try:
+        thumbnail = make_thumbnails(target, content_hash)
+    except ValueError as e:
+        if not stored:
+            os.unlink(target)
+        return False, str(e)
+    return True, (profile_pic, thumbnail)
+
+
+# -------------------- THUMBNAILS --------------------
+def make_thumbnails(source: Path, content_hash: str):
+    """
+    Write WebP and JPEG variants of `source` at every THUMBNAIL_WIDTHS width.
+    Returns the thumbnail base path (e.g. uploads/candidates/thumbs/<hash>), or
+    None when Pillow is not installed or the image cannot be decoded.
+    Raises ValueError for images over MAX_IMAGE_PIXELS (decompression bombs).
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+
+    base = f"{THUMBNAIL_DIR}/{content_hash}"
+    (STATIC_DIR / THUMBNAIL_DIR).mkdir(parents=True, exist_ok=True)
+
+    if all((STATIC_DIR / f"{base}-{w}.webp").exists() for w in THUMBNAIL_WIDTHS):
+        return base
+
+    try:
+        with Image.open(source) as image:
+            # Only the header has been read so far
+            if image.width * image.height > MAX_IMAGE_PIXELS:
+                raise ValueError("Image dimensions are too large")
+            image.seek(0)                               # first frame of animated GIFs
+            image = ImageOps.exif_transpose(image).convert("RGB")
+            for width in THUMBNAIL_WIDTHS:
+                # Square crop: candidates are always shown in a circle
+                thumb = ImageOps.fit(image, (width, width), Image.LANCZOS)
+                thumb.save(STATIC_DIR / f"{base}-{width}.webp", "WEBP", quality=80, method=4)
+                thumb.save(STATIC_DIR / f"{base}-{width}.jpg", "JPEG", quality=82, optimize=True, progressive=True)
+    except Image.DecompressionBombError:
+        raise ValueError("Image dimensions are too large")
+    except OSError:
+        return None
+
+    return base
+
+
+def thumbnail_srcsets(thumbnail: str | None, width: int):
+    """
+    (webp_srcset, jpeg_srcset) showing `width` px at 1x and double that at 2x when available.
+    """
+    if not thumbnail:
+        return None, None
+
+    widths = [w for w in (width, width * 2) if w in THUMBNAIL_WIDTHS]
+    webp = ", ".join(f"/static/{thumbnail}-{w}.webp {i + 1}x" for i, w in enumerate(widths))
+    jpeg = ", ".join(f"/static/{thumbnail}-{w}.jpg {i + 1}x" for i, w in enumerate(widths))
+    return webp, jpeg
+
+
+# -------------------- REQUEST SIZE --------------------
+class UploadTooLarge(HTTPException):
+    """
+    Raised from inside the body stream once an upload passes its limit, so form
+    parsing stops there; FastAPI re-raises HTTPExceptions from body parsing as is.
+    """
+
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=413, detail=f"Upload is larger than {max_bytes // 1024} KB")
+
+
+class UploadSizeLimit:
+    """
+    Pure ASGI middleware capping request bodies on the upload routes. Starlette
+    spools a whole multipart body to disk before the route runs, so the limit has
+    to hold while it arrives: a declared Content-Length over it is refused before
+    anything is read, a chunked body as soon as it crosses it.
+    """
+
+    def __init__(self, app, paths: tuple, max_bytes: int = MAX_UPLOAD_REQUEST_BYTES):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        declared = Headers(scope=scope).get("content-length", "")
+        if declared.isdigit() and int(declared) > self.max_bytes:
+            response = HTMLResponse(UploadTooLarge(self.max_bytes).detail, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise UploadTooLarge(self.max_bytes)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -1,8 +1,10 @@
 # app/users/services.py
 
-import bcrypt
 import uuid
-from db.db import ec_col
+from pymongo.errors import DuplicateKeyError
+from db.db import ec_col, candidates_col
+from app.passwords import password_pool
+from app.elections.services import init_vote_counter
 from datetime import datetime
 
 # -------------------- REGISTER EC --------------------
@@ -14,8 +16,8 @@ def register_ec(name: str, email: str, password: str):
     if ec_col.find_one({"email": email}):
         return False, "EC with this email already exists"
 
-    # Hash password
-    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    # Hash password in the bounded password pool
+    hashed = password_pool.hash_sync(password)
 
     # Generate unique IDs
     ec_id = str(uuid.uuid4())           # EC document _id
@@ -26,20 +28,23 @@ def register_ec(name: str, email: str, password: str):
         "_id": ec_id,
         "name": name,
         "email": email,
-        "password_hash": hashed.decode("utf-8"),
+        "password_hash": hashed,
         "election_id": election_id,
         "election": {
             "name": "",                 # Will be set later
             "start_date": None,
             "end_date": None,
             "status": "Upcoming",       # Upcoming / Ongoing / Ended
-            "winner": None,
-            "candidates": []            # List of candidates
+            "winner": None              # candidates live in candidates_col
         }
     }
 
-    # Insert EC document into DB
-    ec_col.insert_one(ec_doc)
+    # Insert EC document into DB (unique email index guards concurrent signups)
+    try:
+        ec_col.insert_one(ec_doc)
+    except DuplicateKeyError:
+        return False, "EC with this email already exists"
+    init_vote_counter(election_id)
 
     return True, election_id
 
@@ -62,48 +67,46 @@ def create_election(election_id: str, name: str, start_date: datetime, end_date:
 
 
 # -------------------- ADD CANDIDATE --------------------
-def add_candidate(election_id: str, name: str, party: str, moto: str = None, profile_pic: str = None):
+def add_candidate(election_id: str, name: str, party: str, moto: str = None, profile_pic: str = None, thumbnail: str = None):
     """
-    Add a candidate to the EC's election, including profile picture path.
+    Add a candidate to the EC's election, including profile picture and thumbnail base paths.
+    A single insert into candidates_col, so concurrent adds and removes never clobber each other.
     """
+    if not ec_col.count_documents({"election_id": election_id}, limit=1):
+        return False, "Failed to add candidate"
+
     candidate_id = str(uuid.uuid4())
 
     # Store relative path only, default GIF
     candidate = {
         "_id": candidate_id,
+        "election_id": election_id,
         "name": name,
         "party": party,
         "moto": moto,
         "profile_pic": profile_pic or "uploads/candidates/default.gif",  # default candidate GIF
-        "party_symbol": "uploads/party/party_default.gif"                 # default party GIF
+        "party_symbol": "uploads/party/party_default.gif",                # default party GIF
+        "thumbnail": thumbnail,                                           # resized WebP/JPEG base path
+        "created_at": datetime.now()                                      # keeps the ballot order stable
     }
 
-    result = ec_col.update_one(
-        {"election_id": election_id},
-        {"$push": {"election.candidates": candidate}}
-    )
-
-    if result.modified_count:
-        return True, candidate_id
-    return False, "Failed to add candidate"
+    candidates_col.insert_one(candidate)
+    return True, candidate_id
 
 
 # -------------------- REMOVE CANDIDATE --------------------
 def remove_candidate(election_id: str, candidate_id: str):
     """
-    Remove a candidate from the EC's election.
+    Remove a candidate from the EC's election with one atomic delete.
     """
-    result = ec_col.update_one(
-        {"election_id": election_id},
-        {"$pull": {"election.candidates": {"_id": candidate_id}}}
-    )
-    return result.modified_count > 0
+    result = candidates_col.delete_one({"_id": candidate_id, "election_id": election_id})
+    return result.deleted_count > 0
 
 
 # -------------------- FETCH DASHBOARD --------------------
 def get_ec_dashboard(election_id: str):
     """
-    Fetch EC document with embedded election and candidates for dashboard rendering.
+    Fetch EC document, its election and candidates for dashboard rendering.
     """
     ec = ec_col.find_one({"election_id": election_id})
     if not ec:
@@ -117,7 +120,7 @@ def get_ec_dashboard(election_id: str):
 
     # Ensure all candidates have profile_pic and party_symbol
     candidates = []
-    for c in ec["election"]["candidates"]:
+    for c in candidates_col.find({"election_id": election_id}).sort("created_at", 1):
         candidate_copy = c.copy()
         candidate_copy["profile_pic"] = f"/static/{c.get('profile_pic') or 'uploads/candidates/default.gif'}"
         candidate_copy["party_symbol"] = f"/static/{c.get('party_symbol') or 'uploads/party/party_default.gif'}"
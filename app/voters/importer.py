@@ -0,0 +1,194 @@
+# app/voters/importer.py
+
+import csv
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+from pymongo.errors import BulkWriteError
+
+from db.db import voters_col, imports_col
+from app.passwords import password_pool
+from app.elections.services import adjust_voter_counter
+
+IMPORT_BATCH_SIZE = int(os.getenv("VOTER_IMPORT_BATCH_SIZE", "1000"))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_STORED_ERRORS = 10_000          # keep the progress document well below 16 MB
+REQUIRED_COLUMNS = ("name", "email", "password")
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx")
+
+
+# -------------------- UPLOAD --------------------
+def save_upload(upload) -> str:
+    """
+    Copy an uploaded roll to a temp file chunk by chunk; the import reads it from there.
+    """
+    suffix = Path(upload.filename or "").suffix.lower()
+    with tempfile.NamedTemporaryFile(prefix="voter-import-", suffix=suffix, delete=False) as tmp:
+        shutil.copyfileobj(upload.file, tmp, UPLOAD_CHUNK_SIZE)
+    return tmp.name
+
+
+# -------------------- ROW READERS --------------------
+def _normalise(row: dict):
+    return {str(k).strip().lower(): ("" if v is None else str(v).strip()) for k, v in row.items() if k is not None}
+
+
+def iter_csv_rows(path: str):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in REQUIRED_COLUMNS if c not in {h.strip().lower() for h in reader.fieldnames or []}]
+        if missing:
+            raise ValueError(f"Missing column(s): {', '.join(missing)}")
+        for row in reader:
+            yield _normalise(row)
+
+
+def iter_xlsx_rows(path: str):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("XLSX import needs openpyxl installed; upload a CSV instead")
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(h).strip().lower() if h is not None else None for h in next(rows, [])]
+        missing = [c for c in REQUIRED_COLUMNS if c not in header]
+        if missing:
+            raise ValueError(f"Missing column(s): {', '.join(missing)}")
+        for values in rows:
+            yield _normalise(dict(zip(header, values)))
+    finally:
+        workbook.close()
+
+
+def iter_rows(path: str):
+    if path.endswith(".xlsx"):
+        return iter_xlsx_rows(path)
+    return iter_csv_rows(path)
+
+
+# -------------------- BATCH --------------------
+def import_batch(election_id: str, batch: list, seen_emails: set):
+    """
+    Validate, dedup, hash and insert one batch of (row_number, row) pairs.
+    Returns (inserted_count, errors).
+    """
+    errors = []
+    candidates = []
+    for row_number, row in batch:
+        missing = [c for c in REQUIRED_COLUMNS if not row.get(c)]
+        if missing:
+            errors.append({"row": row_number, "email": row.get("email"), "error": f"Missing {', '.join(missing)}"})
+        elif row["email"] in seen_emails:
+            errors.append({"row": row_number, "email": row["email"], "error": "Duplicate email in file"})
+        else:
+            seen_emails.add(row["email"])
+            candidates.append((row_number, row))
+
+    # One $in query per batch instead of one find_one per voter
+    emails = [row["email"] for _, row in candidates]
+    existing = {v["email"] for v in voters_col.find({"email": {"$in": emails}}, {"email": 1, "_id": 0})}
+
+    rows = []
+    for row_number, row in candidates:
+        if row["email"] in existing:
+            errors.append({"row": row_number, "email": row["email"], "error": "Voter with this email already exists"})
+        else:
+            rows.append((row_number, row))
+
+    if not rows:
+        return 0, errors
+
+    hashes = password_pool.hash_many_sync([row["password"] for _, row in rows])
+    voters = [
+        {
+            "_id": str(uuid.uuid4()),
+            "name": row["name"],
+            "email": row["email"],
+            "password_hash": password_hash,
+            "election_id": election_id,
+            "has_voted": False
+        }
+        for (_, row), password_hash in zip(rows, hashes)
+    ]
+
+    inserted = len(voters)
+    try:
+        voters_col.insert_many(voters, ordered=False)
+    except BulkWriteError as e:
+        # Unordered: everything except the failed documents was written
+        for write_error in e.details.get("writeErrors", []):
+            row_number, row = rows[write_error["index"]]
+            errors.append({"row": row_number, "email": row["email"], "error": write_error.get("errmsg", "Insert failed")})
+        inserted = e.details.get("nInserted", 0)
+
+    errors.sort(key=lambda e: e["row"])
+    return inserted, errors
+
+
+# -------------------- JOB --------------------
+def start_import(election_id: str, filename: str) -> str:
+    """
+    Register a new import job and return its id.
+    """
+    import_id = str(uuid.uuid4())
+    imports_col.insert_one({
+        "_id": import_id,
+        "election_id": election_id,
+        "filename": filename,
+        "status": "queued",
+        "rows_processed": 0,
+        "inserted": 0,
+        "error_count": 0,
+        "errors": [],
+        "started_at": datetime.now().isoformat(),
+        "finished_at": None
+    })
+    return import_id
+
+
+def run_import(import_id: str, election_id: str, path: str):
+    """
+    Background task: stream the saved file through import_batch and record progress per batch.
+    """
+    imports_col.update_one({"_id": import_id}, {"$set": {"status": "running"}})
+    seen_emails = set()
+    status, message = "completed", None
+
+    try:
+        rows = enumerate(iter_rows(path), start=2)  # row 1 is the header
+        while True:
+            batch = list(islice(rows, IMPORT_BATCH_SIZE))
+            if not batch:
+                break
+
+            inserted, errors = import_batch(election_id, batch, seen_emails)
+            if inserted:
+                adjust_voter_counter(election_id, voters=inserted)
+
+            imports_col.update_one(
+                {"_id": import_id},
+                {
+                    "$inc": {"rows_processed": len(batch), "inserted": inserted, "error_count": len(errors)},
+                    "$push": {"errors": {"$each": errors, "$slice": MAX_STORED_ERRORS}}
+                }
+            )
+    except Exception as e:
+        status, message = "failed", str(e)
+    finally:
+        os.unlink(path)
+
+    imports_col.update_one(
+        {"_id": import_id},
+        {"$set": {"status": status, "message": message, "finished_at": datetime.now().isoformat()}}
+    )
+
+
+def get_import(import_id: str):
+    return imports_col.find_one({"_id": import_id})
@@ -0,0 +1,506 @@
+# app/voters/ingest.py
+
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from db.async_db import voters_col, votes_col, counters_col, rejections_col, run_in_transaction
+from app.elections import live
+from app.elections.services import make_ballot
+from app.voters.services import VOTER_NOT_FOUND, ALREADY_VOTED, INVALID_CANDIDATE
+
+# "direct": every vote is its own conditional update (default)
+# "wal":    votes are acknowledged once on local disk and group-committed in batches
+VOTE_INGEST_MODE = os.getenv("VOTE_INGEST_MODE", "direct")
+# Each worker process logs to <VOTE_WAL_PATH>.<pid>; keep the folder on a volume so
+# logs outlive the container, whichever worker starts next replays them
+VOTE_WAL_PATH = os.getenv("VOTE_WAL_PATH", "data/votes.wal")
+VOTE_WAL_FSYNC = os.getenv("VOTE_WAL_FSYNC", "1") == "1"
+VOTE_BATCH_SIZE = int(os.getenv("VOTE_BATCH_SIZE", "500"))
+VOTE_FLUSH_INTERVAL = float(os.getenv("VOTE_FLUSH_INTERVAL", "0.05"))
+VOTE_RETRY_DELAY = 1.0
+
+
+# -------------------- WRITE-AHEAD LOG --------------------
+class VoteLog:
+    """
+    Append-only JSON-lines file of accepted votes plus a checkpoint file holding
+    the byte offset up to which votes are known to be in MongoDB. One process
+    writes a log, and holds an exclusive lock on it for as long as it does.
+    """
+
+    def __init__(self, path: str, fsync: bool = VOTE_WAL_FSYNC):
+        self.path = Path(path)
+        self.checkpoint_path = self.path.with_name(self.path.name + ".ckpt")
+        self.fsync = fsync
+        self.size = 0
+        self._lock_fd = None
+
+    def acquire(self, wait: bool = True) -> bool:
+        """
+        Lock the log for this process. The kernel drops the lock when the process
+        dies, which is what marks a log as orphaned. With wait=False, returns
+        False instead of waiting when another process holds it.
+        """
+        import fcntl
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+                # Another worker may have adopted and removed the file before we got the lock
+                if os.path.samestat(os.stat(self.path), os.fstat(fd)):
+                    self._lock_fd = fd
+                    return True
+            except (BlockingIOError, FileNotFoundError):
+                pass
+            os.close(fd)
+            if not wait:
+                return False
+
+    def release(self):
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def remove(self):
+        """
+        Delete the log and its checkpoint; only while holding the lock.
+        """
+        self.path.unlink(missing_ok=True)
+        self.checkpoint_path.unlink(missing_ok=True)
+
+    def load(self):
+        """
+        Return [(record, end_offset)] for every vote after the checkpoint.
+        A torn last line from a crash mid-write is cut off; it was never acknowledged.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch()
+
+        start = 0
+        if self.checkpoint_path.exists():
+            start = int(self.checkpoint_path.read_text() or 0)
+
+        records = []
+        offset = start
+        with open(self.path, "rb+") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                records.append((json.loads(line), offset))
+            f.truncate(offset)
+
+        self.size = offset
+        return records
+
+    def append_many(self, records: list):
+        """
+        Write records in one go and make them durable with a single fsync.
+        Returns the end offset of each record.
+        """
+        offsets = []
+        with open(self.path, "ab") as f:
+            for record in records:
+                line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+                f.write(line)
+                self.size += len(line)
+                offsets.append(self.size)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        return offsets
+
+    def checkpoint(self, offset: int):
+        tmp = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        tmp.write_text(str(offset))
+        os.replace(tmp, self.checkpoint_path)
+
+    def reset(self):
+        """
+        Start an empty log once everything in it has been committed.
+        """
+        self.checkpoint(0)
+        with open(self.path, "wb"):
+            pass
+        self.size = 0
+
+
+def worker_logs(base: str):
+    """
+    Every log written under `base`: <base>.<worker> plus a single-file <base> from
+    before logs were per worker.
+    """
+    base = Path(base)
+    pattern = re.compile(rf"^{re.escape(base.name)}\.[^.]+$")
+    if not base.parent.is_dir():
+        return []
+    paths = [p for p in base.parent.iterdir() if pattern.match(p.name) and p.suffix not in (".ckpt", ".tmp")]
+    if base.exists():
+        paths.append(base)
+    return sorted(paths)
+
+
+# -------------------- GROUP COMMIT --------------------
+async def commit_votes(records: list):
+    """
+    Apply a batch of logged votes in a fixed number of round trips: claim the voters
+    with one conditional bulk_write, insert the ballots, one $inc per election, then
+    drop the claims. The claim (the vote token, set next to has_voted) is the only
+    link between a voter and a ballot and only lives for the duration of the batch;
+    it lets a replay after a crash finish exactly the votes this log had claimed.
+    Without transactions a crash between the ballots and the counters leaves drift
+    for scripts.reconcile_counters.
+    Returns (applied, rejected): rejected votes lost a race against another worker.
+    Their tokens go to rejections_col, so the voter's receipt shows it was not counted.
+    """
+    # A vote adopted from an orphaned log can also still be in the log it was copied to
+    records = list({r["vote_token"]: r for r in records}.values())
+
+    async def apply(session):
+        tokens = [r["vote_token"] for r in records]
+
+        # Fully applied before a crash: ballot written and claim already dropped
+        existing = await votes_col.find({"_id": {"$in": tokens}}, {"_id": 1}, session=session).to_list(None)
+        done = {b["_id"] for b in existing}
+
+        fresh = [r for r in records if r["vote_token"] not in done]
+        if fresh:
+            await voters_col.bulk_write([
+                UpdateOne(
+                    {"_id": r["voter_id"], "election_id": r["election_id"], "has_voted": False},
+                    {"$set": {"has_voted": True, "ballot_claim": r["vote_token"]}}
+                )
+                for r in fresh
+            ], ordered=False, session=session)
+
+        claims = await voters_col.find(
+            {"_id": {"$in": [r["voter_id"] for r in records]}, "ballot_claim": {"$in": tokens}},
+            {"ballot_claim": 1}, session=session
+        ).to_list(None)
+        claimed = {v["ballot_claim"] for v in claims}
+        applied = [r for r in fresh if r["vote_token"] in claimed]
+        rejected = [r for r in fresh if r["vote_token"] not in claimed]
+
+        if applied:
+            await votes_col.insert_many([
+                make_ballot(r["vote_token"], r["election_id"], r["candidate_id"], datetime.fromtimestamp(r["ts"]))
+                for r in applied
+            ], ordered=False, session=session)
+
+            increments = {}
+            for r in applied:
+                inc = increments.setdefault(r["election_id"], {"total_votes": 0, "version": 1})
+                inc[f"votes.{r['candidate_id']}"] = inc.get(f"votes.{r['candidate_id']}", 0) + 1
+                inc["total_votes"] += 1
+            await counters_col.bulk_write([
+                UpdateOne({"_id": election_id}, {"$inc": inc}, upsert=True)
+                for election_id, inc in increments.items()
+            ], ordered=False, session=session)
+
+        if rejected:
+            # Upserts, so a replay of the same batch records each rejection once
+            await rejections_col.bulk_write([
+                UpdateOne(
+                    {"_id": r["vote_token"]},
+                    {"$setOnInsert": {"election_id": r["election_id"], "reason": ALREADY_VOTED,
+                                      "rejected_at": datetime.now()}},
+                    upsert=True
+                )
+                for r in rejected
+            ], ordered=False, session=session)
+
+        if claims:
+            await voters_col.update_many(
+                {"_id": {"$in": [v["_id"] for v in claims]}}, {"$unset": {"ballot_claim": ""}}, session=session
+            )
+
+        return len(applied), len(rejected)
+
+    return await run_in_transaction(apply)
+
+
+# -------------------- INGESTION --------------------
+class VoteIngest:
+    """
+    Write-behind vote ingestion. submit() validates a vote, appends it to this
+    worker's log (concurrent votes share one fsync) and acknowledges it; a
+    background task group-commits the log to MongoDB and checkpoints it.
+    `worker` names this process's log under `path` (default: the pid).
+    """
+
+    def __init__(
+        self,
+        path: str = VOTE_WAL_PATH,
+        batch_size: int = VOTE_BATCH_SIZE,
+        flush_interval: float = VOTE_FLUSH_INTERVAL,
+        worker: str | None = None,
+        fsync: bool = VOTE_WAL_FSYNC,
+    ):
+        self.path = path
+        self.worker = worker
+        self.fsync = fsync
+        self.log = None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = False
+
+        self.pending = deque()          # (record, end_offset), logged but not committed
+        self.pending_voters = set()     # voter ids with a vote in flight in this process
+        self._appends = []              # (record, future) waiting for the next fsync
+        self._file_lock = asyncio.Lock()
+        self._commit_lock = asyncio.Lock()
+        self._append_ready = asyncio.Event()
+        self._commit_ready = asyncio.Event()
+        self._flushing = None           # the log write the writer task has in flight
+        self._tasks = []
+
+        self.accepted = 0
+        self.committed = 0
+        self.rejected = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+
+    # ---------- lifecycle ----------
+    async def start(self):
+        """
+        Lock this worker's log and replay whatever it holds beyond its checkpoint,
+        plus the logs of workers that died before committing theirs, then start
+        the writers.
+        """
+        self.log = VoteLog(f"{self.path}.{self.worker or os.getpid()}", self.fsync)
+        await asyncio.to_thread(self.log.acquire)
+        replay = await asyncio.to_thread(self.log.load)
+        replay += await asyncio.to_thread(self._adopt_orphans, {record["vote_token"] for record, _ in replay})
+        for record, offset in replay:
+            self.pending.append((record, offset))
+            self.pending_voters.add(record["voter_id"])
+        if replay:
+            print(f"Replaying {len(replay)} logged votes")
+            self._commit_ready.set()
+
+        self.enabled = True
+        self._tasks = [asyncio.create_task(self._write_log()), asyncio.create_task(self._commit())]
+
+    def _adopt_orphans(self, known_tokens: set):
+        """
+        Copy the uncommitted votes of every log no live process holds into this
+        worker's log, then delete those logs. A crash in between only leaves
+        duplicates, which commit_votes drops by vote token.
+        Returns [(record, end_offset)] in this worker's log.
+        """
+        adopted = []
+        for path in worker_logs(self.path):
+            if path == self.log.path:
+                continue
+            orphan = VoteLog(path, fsync=False)
+            if not orphan.acquire(wait=False):
+                continue        # its worker is alive, or another worker is adopting it
+            try:
+                records = [r for r, _ in orphan.load() if r["vote_token"] not in known_tokens]
+                if records:
+                    print(f"Adopting {len(records)} logged votes from {path}")
+                    adopted.extend(zip(records, self.log.append_many(records)))
+                    known_tokens.update(r["vote_token"] for r in records)
+                orphan.remove()
+            finally:
+                orphan.release()
+        return adopted
+
+    async def stop(self):
+        """
+        Stop accepting votes and commit everything already acknowledged. The log
+        is deleted once empty, otherwise left for the next worker to replay.
+        """
+        self.enabled = False
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+        # A write the writer had started carries on (it is shielded); its votes are
+        # acknowledged once it lands, so it has to land before anything is committed
+        if self._flushing is not None:
+            await self._flushing
+        if self._appends:
+            await self._flush_appends()
+        while self.pending:
+            try:
+                await self._commit_batch()
+            except PyMongoError as e:
+                print(f"Vote log not fully committed on shutdown, it will be replayed: {e}")
+                break
+
+        if not self.pending:
+            await asyncio.to_thread(self.log.remove)
+        self.log.release()
+
+    # ---------- accepting ----------
+    async def submit(self, voter_id: str, candidate_id: str, election_id: str, candidates: list):
+        """
+        Same contract as cast_vote: (True, voter) once the vote is durable on disk,
+        or (False, error message).
+        """
+        if not any(str(c.get("_id")) == candidate_id for c in candidates):
+            return False, INVALID_CANDIDATE
+        if voter_id in self.pending_voters:
+            return False, ALREADY_VOTED
+
+        voter = await voters_col.find_one({"_id": voter_id}, {"password_hash": 0})
+        if not voter:
+            return False, VOTER_NOT_FOUND
+        if voter.get("election_id") != election_id:
+            return False, INVALID_CANDIDATE
+        if voter.get("has_voted") or voter_id in self.pending_voters:
+            return False, ALREADY_VOTED
+
+        self.pending_voters.add(voter_id)
+        record = {
+            "voter_id": voter_id,
+            "election_id": election_id,
+            "candidate_id": candidate_id,
+            "vote_token": str(uuid.uuid4()),
+            "ts": time.time(),
+        }
+
+        future = asyncio.get_running_loop().create_future()
+        self._appends.append((record, future))
+        self._append_ready.set()
+        try:
+            await future
+        except Exception:
+            self.pending_voters.discard(voter_id)
+            raise
+
+        self.accepted += 1
+        return True, {**voter, "has_voted": True, "vote_token": record["vote_token"]}
+
+    async def _flush_appends(self):
+        appends, self._appends = self._appends, []
+        records = [record for record, _ in appends]
+        try:
+            async with self._file_lock:
+                offsets = await asyncio.to_thread(self.log.append_many, records)
+        except OSError as e:
+            for _, future in appends:
+                future.set_exception(e)
+            return
+
+        self.pending.extend(zip(records, offsets))
+        for _, future in appends:
+            future.set_result(None)
+        self._commit_ready.set()
+
+    async def _write_log(self):
+        while True:
+            await self._append_ready.wait()
+            self._append_ready.clear()
+            # Shielded so shutdown never abandons votes between the swap and the fsync
+            self._flushing = asyncio.ensure_future(self._flush_appends())
+            await asyncio.shield(self._flushing)
+
+    # ---------- committing ----------
+    async def _commit_batch(self):
+        async with self._commit_lock:
+            if self.pending:
+                await self._commit_next()
+
+    async def _commit_next(self):
+        batch = [self.pending[i] for i in range(min(self.batch_size, len(self.pending)))]
+        start = time.perf_counter()
+        applied, rejected = await commit_votes([record for record, _ in batch])
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+
+        for _ in batch:
+            self.pending.popleft()
+        async with self._file_lock:
+            if not self.pending and not self._appends:
+                await asyncio.to_thread(self.log.reset)
+            else:
+                await asyncio.to_thread(self.log.checkpoint, batch[-1][1])
+
+        for record, _ in batch:
+            self.pending_voters.discard(record["voter_id"])
+        self.committed += applied
+        self.rejected += rejected
+        self.batches += 1
+        self.last_batch_size = len(batch)
+
+        for election_id in {record["election_id"] for record, _ in batch}:
+            live.notify_vote(election_id)
+
+    async def _commit(self):
+        while True:
+            await self._commit_ready.wait()
+            # Let a batch fill up unless one is already waiting
+            if len(self.pending) < self.batch_size:
+                await asyncio.sleep(self.flush_interval)
+            self._commit_ready.clear()
+
+            while self.pending:
+                try:
+                    # Shielded so shutdown never abandons a batch between its two writes
+                    await asyncio.shield(self._commit_batch())
+                except PyMongoError as e:
+                    print(f"Vote batch commit failed, retrying: {e}")
+                    await asyncio.sleep(VOTE_RETRY_DELAY)
+
+    def is_pending(self, vote_token: str) -> bool:
+        return any(record["vote_token"] == vote_token for record, _ in self.pending) or any(
+            record["vote_token"] == vote_token for record, _ in self._appends
+        )
+
+    # ---------- metrics ----------
+    def stats(self):
+        oldest = self.pending[0][0]["ts"] if self.pending else None
+        return {
+            "mode": "wal" if self.enabled else "direct",
+            "pending": len(self.pending) + len(self._appends),
+            "lag_seconds": round(time.time() - oldest, 3) if oldest else 0.0,
+            "accepted": self.accepted,
+            "committed": self.committed,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+        }
+
+
+vote_ingest = VoteIngest()
+
+
+# -------------------- RECEIPTS --------------------
+RECEIPT_RECORDED = "recorded"
+RECEIPT_PENDING = "pending"
+RECEIPT_REJECTED = "rejected"
+RECEIPT_UNKNOWN = "unknown"
+
+
+async def receipt_status(vote_token: str):
+    """
+    What became of the vote behind a receipt. A write-behind vote can still lose
+    to another vote by the same voter after its receipt was shown; that receipt
+    then reads "rejected". Only whether the ballot counts is revealed, never
+    the candidate.
+    """
+    if await votes_col.find_one({"_id": vote_token}, {"_id": 1}):
+        return RECEIPT_RECORDED
+    if await rejections_col.find_one({"_id": vote_token}, {"_id": 1}):
+        return RECEIPT_REJECTED
+    if vote_ingest.is_pending(vote_token):
+        return RECEIPT_PENDING
+    return RECEIPT_UNKNOWN
@@ -29,7 +29,6 @@ class VoterResponse(BaseModel):
     name: str
     email: EmailStr
     has_voted: bool = False
-    voted_for: Optional[str] = None  # candidate ID if voted
     election_id: str
     password_hash: Optional[str] = None  # optional, internal use only
 
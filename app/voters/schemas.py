@@ -27,7 +27,6 @@ class VoterResponse(VoterBase):
     id: str = Field(..., alias="_id")  # maps MongoDB '_id' to 'id' in response
     election_id: str
     has_voted: bool = False
-    voted_for: Optional[str] = None  # candidate ID if voted
     password_hash: Optional[str] = None  # optional, internal use only
 
     model_config = {
@@ -0,0 +1,103 @@
+# app/voters/services.py
+
+import os
+import re
+import uuid
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from db.async_db import voters_col, votes_col, run_in_transaction, routed
+from app.elections.services import make_ballot
+from app.elections.tally import increment_vote_counter
+
+VOTER_NOT_FOUND = "Voter not found"
+ALREADY_VOTED = "You have already voted."
+INVALID_CANDIDATE = "Candidate is not part of your election."
+
+VOTER_PAGE_SIZE = int(os.getenv("VOTER_PAGE_SIZE", "50"))
+VOTER_LIST_PROJECTION = {"name": 1, "email": 1, "has_voted": 1, "election_id": 1}
+
+
+# -------------------- CAST VOTE --------------------
+async def cast_vote(voter_id: str, candidate_id: str, election_id: str, candidates: list):
+    """
+    Cast a vote with a single conditional find_one_and_update.
+    The filter only matches a voter of this election who has not voted yet, so two
+    concurrent submissions can never both succeed. The ballot goes to votes_col
+    and the election counter is bumped in the same transaction; the voter document
+    only records has_voted.
+    Returns (True, voter with its vote_token receipt) or (False, error message).
+    """
+    if not any(str(c.get("_id")) == candidate_id for c in candidates):
+        return False, INVALID_CANDIDATE
+
+    vote_token = str(uuid.uuid4())
+
+    async def record(session):
+        voter = await voters_col.find_one_and_update(
+            {"_id": voter_id, "election_id": election_id, "has_voted": False},
+            {"$set": {"has_voted": True}},
+            projection={"password_hash": 0},
+            return_document=ReturnDocument.AFTER,
+            session=session
+        )
+        if voter:
+            await votes_col.insert_one(make_ballot(vote_token, election_id, candidate_id), session=session)
+            await increment_vote_counter(election_id, candidate_id, session=session)
+        return voter
+
+    voter = await run_in_transaction(record)
+    if voter:
+        return True, {**voter, "vote_token": vote_token}
+
+    # Slow path, only for rejected votes: explain why the filter did not match
+    existing = await voters_col.find_one({"_id": voter_id}, {"has_voted": 1, "election_id": 1})
+    if not existing:
+        return False, VOTER_NOT_FOUND
+    if existing.get("election_id") != election_id:
+        return False, INVALID_CANDIDATE
+    return False, ALREADY_VOTED
+
+
+# -------------------- VOTER LISTING --------------------
+async def list_voters_page(
+    election_id: str,
+    after: str | None = None,
+    before: str | None = None,
+    search: str | None = None,
+    page_size: int = VOTER_PAGE_SIZE
+):
+    """
+    One page of an election's voters, keyset-paginated on _id and without password hashes.
+    `after` / `before` are the _id of the last / first voter of the neighbouring page.
+    Returns {"voters", "next_cursor", "prev_cursor"}.
+    """
+    query = {"election_id": election_id}
+    if search:
+        query["$or"] = [
+            {"email": {"$regex": f"^{re.escape(search)}"}},                  # prefix: served by the email index
+            {"name": {"$regex": re.escape(search), "$options": "i"}},
+        ]
+
+    backwards = bool(before) and not after
+    if after:
+        query["_id"] = {"$gt": after}
+    elif before:
+        query["_id"] = {"$lt": before}
+
+    cursor = routed(voters_col).find(query, VOTER_LIST_PROJECTION)
+    cursor = cursor.sort("_id", DESCENDING if backwards else ASCENDING).limit(page_size + 1)
+    voters = await cursor.to_list(None)
+
+    has_more = len(voters) > page_size
+    voters = voters[:page_size]
+    if backwards:
+        voters.reverse()
+
+    if not voters:
+        return {"voters": [], "next_cursor": None, "prev_cursor": None}
+
+    if backwards:
+        next_cursor, prev_cursor = voters[-1]["_id"], (voters[0]["_id"] if has_more else None)
+    else:
+        next_cursor, prev_cursor = (voters[-1]["_id"] if has_more else None), (voters[0]["_id"] if after else None)
+
+    return {"voters": voters, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
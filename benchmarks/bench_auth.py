@@ -0,0 +1,66 @@
+"""
+Per-request authentication cost: verifying a signed session cookie against what
+an authorised request used to need, a voter lookup by _id (plus a bcrypt check
+when credentials are re-sent).
+
+    python -m benchmarks.bench_auth --requests 20000 --rtt 1
+    MONGO_BENCH_URI=mongodb://localhost:27017 python -m benchmarks.bench_auth
+
+Without MONGO_BENCH_URI the lookup runs against mongomock after an --rtt sleep
+standing in for the network round trip to MongoDB.
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.synthetic import get_bench_db, seed_election
+
+from app import sessions
+from app.passwords import check_password, hash_password
+
+
+def per_request(fn, requests: int):
+    start = time.perf_counter()
+    for _ in range(requests):
+        fn()
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--voters", type=int, default=10000)
+    parser.add_argument("--rtt", type=float, default=1.0, help="simulated round trip in ms (mongomock only)")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    args = parser.parse_args()
+
+    db = get_bench_db()
+    election_id, _ = seed_election(db, args.voters, turnout=0)
+    voter = db["voters"].find_one({}, {"_id": 1, "election_id": 1})
+    rtt = 0 if os.getenv("MONGO_BENCH_URI") else args.rtt / 1000
+
+    def lookup():
+        if rtt:
+            time.sleep(rtt)
+        assert db["voters"].find_one({"_id": voter["_id"]}, {"password_hash": 0})
+
+    token = sessions.issue(sessions.VOTER, voter["_id"], election_id)
+    password_hash = hash_password("secret", args.bcrypt_rounds)
+    lookups = max(args.requests // 100, 10)
+
+    results = [
+        ("signed cookie", per_request(lambda: sessions.verify(token, sessions.VOTER), args.requests)),
+        ("voter lookup", per_request(lookup, lookups)),
+        ("lookup + bcrypt", per_request(lambda: (lookup(), check_password("secret", password_hash)), 10)),
+    ]
+
+    baseline = results[0][1]
+    print(f"rtt={args.rtt}ms bcrypt rounds={args.bcrypt_rounds}")
+    print(f"{'auth':<16} {'us/request':>12} {'requests/s':>12} {'vs cookie':>10}")
+    for name, seconds in results:
+        print(f"{name:<16} {seconds * 1e6:>12.1f} {1 / seconds:>12.0f} {seconds / baseline:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
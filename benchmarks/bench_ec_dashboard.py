@@ -0,0 +1,82 @@
+"""
+Memory and latency of the EC dashboard: every voter document vs one projected keyset page.
+
+    python -m benchmarks.bench_ec_dashboard --voters 100000
+
+Timings are only meaningful with MONGO_BENCH_URI pointing at a local mongod;
+the memory and page-size columns hold on any backend.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.synthetic import get_bench_db, seed_election
+
+from app.rendering import create_environment
+from app.voters.services import VOTER_LIST_PROJECTION, VOTER_PAGE_SIZE
+
+# The app's environment, so template globals such as asset_url are defined
+templates = create_environment()
+
+
+def render(ec, candidates, voters, total_voters, votes_cast, next_cursor=None):
+    return templates.get_template("EC-dashboard.html").render(
+        request=None,
+        ec=ec,
+        election=ec["election"],
+        voters=voters,
+        next_cursor=next_cursor,
+        prev_cursor=None,
+        search="",
+        candidates=candidates,
+        total_voters=total_voters,
+        votes_cast=votes_cast
+    )
+
+
+def legacy(db, election_id):
+    ec = db["ec"].find_one({"election_id": election_id})
+    voters = list(db["voters"].find({"election_id": election_id}))
+    candidates = list(db["candidates"].find({"election_id": election_id}))
+    return render(ec, candidates, voters, len(voters), sum(1 for v in voters if v.get("has_voted")))
+
+
+def paged(db, election_id):
+    ec = db["ec"].find_one({"election_id": election_id}, {"password_hash": 0})
+    voters = list(
+        db["voters"].find({"election_id": election_id}, VOTER_LIST_PROJECTION).sort("_id", 1).limit(VOTER_PAGE_SIZE + 1)
+    )
+    counter = db["vote_counters"].find_one({"_id": election_id})
+    candidates = list(db["candidates"].find({"election_id": election_id}).sort("created_at", 1))
+    return render(ec, candidates, voters[:VOTER_PAGE_SIZE], counter["total_voters"], counter["total_votes"], voters[-1]["_id"])
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    html = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(html)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--voters", type=int, default=100_000)
+    args = parser.parse_args()
+
+    db = get_bench_db()
+    election_id, _ = seed_election(db, args.voters)
+    db["voters"].create_index([("election_id", 1), ("_id", 1)])
+
+    print(f"{args.voters} voters, page size {VOTER_PAGE_SIZE}")
+    print(f"{'variant':<8} {'time (s)':>10} {'peak MB':>10} {'HTML KB':>10}")
+    for name, fn in (("legacy", legacy), ("paged", paged)):
+        elapsed, peak, size = measure(fn, db, election_id)
+        print(f"{name:<8} {elapsed:>10.3f} {peak / 1e6:>10.1f} {size / 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Legitimate voter logins while a credential-stuffing script hammers /voter/login,
+with the login limiter off and on. Reports real voters' latency and failures,
+how many attack attempts were refused before any lookup, and how many bcrypt
+verifications the attack cost.
+
+    python -m benchmarks.bench_login_limit --duration 10 --attack-ips 4 --attack-concurrency 16
+
+The app runs in-process against mongomock (or MONGO_BENCH_URI); each client gets
+its own source address through the ASGI transport. Limits come from the
+LOGIN_* environment variables, as in production.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+
+from benchmarks import harness
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))] if ordered else 0.0
+
+
+def client_from(app, ip):
+    transport = httpx.ASGITransport(app=app, client=(ip, 40000))
+    return httpx.AsyncClient(transport=transport, base_url="https://testserver", timeout=60)
+
+
+async def attacker(app, ip, victims, deadline, rtt, counts):
+    async with client_from(app, ip) as client:
+        while time.perf_counter() < deadline:
+            response = await client.post("/voter/login", data={"email": random.choice(victims), "password": "letmein"})
+            counts["attempts"] += 1
+            counts["refused"] += response.status_code == 429
+            # Ignores Retry-After; the sleep stands in for the network, without it the
+            # in-process attacker would burn the CPU the server needs
+            await asyncio.sleep(rtt)
+
+
+async def voter(app, ip, email, delay, latencies, failures):
+    await asyncio.sleep(delay)
+    async with client_from(app, ip) as client:
+        start = time.perf_counter()
+        response = await client.post("/voter/login", data={"email": email, "password": harness.LOGIN_PASSWORD})
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200 or "voter_session" not in client.cookies:
+            failures.append(response.status_code)
+
+
+async def scenario(app, args, legit, victims, limited):
+    from app.passwords import password_pool
+    from app.ratelimit import MemoryBackend, login_limiter
+
+    login_limiter.enabled = limited
+    login_limiter.backend = MemoryBackend()
+    verified = password_pool.completed
+
+    counts = {"attempts": 0, "refused": 0}
+    latencies, failures = [], []
+    deadline = time.perf_counter() + args.duration
+    # Real voters arrive once the attack is under way and keep arriving throughout
+    delays = sorted(random.uniform(args.duration * 0.1, args.duration * 0.9) for _ in legit)
+
+    await asyncio.gather(
+        *(attacker(app, f"203.0.113.{i + 1}", victims, deadline, args.rtt / 1000, counts)
+          for i in range(args.attack_ips) for _ in range(args.attack_concurrency)),
+        *(voter(app, f"10.{i // 250}.{i % 250}.1", email, delay, latencies, failures)
+          for i, (email, delay) in enumerate(zip(legit, delays))),
+    )
+
+    return {
+        "voters": len(latencies),
+        "voter_failures": len(failures),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "attack_attempts": counts["attempts"],
+        "attack_refused": counts["refused"],
+        "bcrypt_checks": password_pool.completed - verified,
+    }
+
+
+async def run(app, args, legit, victims):
+    async with app.router.lifespan_context(app):
+        return [
+            ("limiter off", await scenario(app, args, legit, victims, limited=False)),
+            ("limiter on", await scenario(app, args, legit, victims, limited=True)),
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--voters", type=int, default=100, help="legitimate logins spread over the run")
+    parser.add_argument("--attack-ips", type=int, default=4)
+    parser.add_argument("--attack-concurrency", type=int, default=16, help="concurrent attempts per attacking address")
+    parser.add_argument("--rtt", type=float, default=10.0, help="ms between an attacker's attempts")
+    # Below production cost: the attackers run on the server's own cores here
+    parser.add_argument("--bcrypt-rounds", type=int, default=8)
+    args = parser.parse_args()
+
+    app, bench_db = harness.load_app()
+    election = harness.seed(bench_db, voters=max(harness.BENCH_VOTERS, args.voters * 4))
+
+    from app.passwords import hash_password
+    bench_db["voters"].update_many({}, {"$set": {"password_hash": hash_password(harness.LOGIN_PASSWORD, args.bcrypt_rounds)}})
+    legit = election["unvoted_emails"][:args.voters]
+    victims = election["unvoted_emails"][args.voters:]
+
+    results = asyncio.run(run(app, args, legit, victims))
+
+    print(f"bcrypt rounds={args.bcrypt_rounds}, {args.attack_ips} attacking addresses x {args.attack_concurrency}")
+    print(f"{'':<12} {'voters':>7} {'failed':>7} {'p50 ms':>9} {'p95 ms':>9} {'attempts':>9} {'refused':>8} {'bcrypt':>7}")
+    for name, r in results:
+        print(f"{name:<12} {r['voters']:>7} {r['voter_failures']:>7} {r['p50_ms']:>9} {r['p95_ms']:>9} "
+              f"{r['attack_attempts']:>9} {r['attack_refused']:>8} {r['bcrypt_checks']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Login (bcrypt verify) throughput of the password pool against its worker count.
+
+    python -m benchmarks.bench_passwords --logins 200 --rounds 12
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from app.passwords import PasswordPool, hash_password
+
+
+async def burst(pool, password, password_hash, logins):
+    results = await asyncio.gather(*(pool.verify(password, password_hash) for _ in range(logins)))
+    assert all(results)
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--mode", choices=("thread", "process"), default="thread")
+    parser.add_argument("--max-workers", type=int, default=cores * 2)
+    args = parser.parse_args()
+
+    password = "correct horse battery staple"
+    password_hash = hash_password(password, args.rounds)
+
+    print(f"cores={cores} rounds={args.rounds} mode={args.mode}")
+    print(f"{'workers':>8} {'logins/s':>10} {'ms/login':>10}")
+
+    workers = 1
+    while workers <= args.max_workers:
+        pool = PasswordPool(workers=workers, max_queue=args.logins, mode=args.mode, rounds=args.rounds)
+        asyncio.run(burst(pool, password, password_hash, workers))  # warm up the executor
+
+        start = time.perf_counter()
+        asyncio.run(burst(pool, password, password_hash, args.logins))
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+
+        print(f"{workers:>8} {args.logins / elapsed:>10.1f} {elapsed / args.logins * 1000:>10.1f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
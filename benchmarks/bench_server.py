@@ -0,0 +1,105 @@
+"""
+Throughput of the old container command (`uvicorn app.main:app --reload`, one
+worker, file watcher on) against the production launcher (`python -m app.serve`).
+Each server is started in turn on a free local port, loaded with concurrent
+keep-alive clients, then stopped with SIGTERM; the time it takes to drain is reported.
+
+    python -m benchmarks.bench_server --concurrency 100 --duration 15
+    python -m benchmarks.bench_server --workers 4 --path / --path "/result?election_id=<id>"
+
+The servers use the database configured in the environment (.env). The default
+pages render without one; add DB-backed paths once MONGO_* points at a local mongod.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.load_test import run_scenario
+
+DEFAULT_PATHS = ["/instructions", "/ec/login"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url, timeout=60.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(f"{url}/instructions", timeout=1).status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def bench(name, command, args, env):
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    print(f"\n{name}: {' '.join(command)}")
+
+    process = subprocess.Popen(
+        [*command, "--host", "127.0.0.1", "--port", str(port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        started = time.perf_counter()
+        if not wait_ready(url):
+            print("server did not come up")
+            return {}
+        print(f"ready in {time.perf_counter() - started:.2f}s")
+
+        print(f"{'path':<16} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        rows = {}
+        for path in args.path or DEFAULT_PATHS:
+            rows[path] = asyncio.run(
+                run_scenario(url, path, "GET", path, None, args.concurrency, args.duration)
+            )
+
+        stopping = time.perf_counter()
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+        print(f"drained and exited in {time.perf_counter() - stopping:.2f}s")
+        return rows
+    finally:
+        if process.poll() is None:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per path")
+    parser.add_argument("--workers", type=int, help="production workers (default: one per available core)")
+    parser.add_argument("--path", action="append", help="GET path to load (repeatable)")
+    args = parser.parse_args()
+
+    env = {**os.environ, "TEMPLATES_AUTO_RELOAD": "0"}
+    if args.workers:
+        env["WEB_CONCURRENCY"] = str(args.workers)
+
+    current = bench("current", [sys.executable, "-m", "uvicorn", "app.main:app", "--reload"], args, env)
+    production = bench("production", [sys.executable, "-m", "app.serve"], args, env)
+
+    print(f"\n{'path':<16} {'current':>9} {'prod':>9} {'speedup':>8}")
+    for path, row in production.items():
+        before = (current.get(path) or {}).get("requests_per_second")
+        if row and before:
+            print(f"{path:<16} {before:>9} {row['requests_per_second']:>9} "
+                  f"{row['requests_per_second'] / before:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Tally cost before and after the ballots collection: the old load-everything Python
+loop and the $group over voter documents, then scripts.migrate_ballots, then the
+$group over the compact ballots in votes_col.
+
+    MONGO_BENCH_URI=mongodb://localhost:27017 python -m benchmarks.bench_tally --sizes 10000,100000,1000000
+
+Without MONGO_BENCH_URI the run uses mongomock, which evaluates the pipeline in
+Python: good for checking every path agrees, meaningless for timings. The average
+document size shows how much less data the ballot tally has to read.
+"""
+
+import argparse
+import time
+
+import bson
+
+from benchmarks.synthetic import get_bench_db, seed_election
+
+from app.elections import services
+from db.indexes import INDEXES
+from scripts import migrate_ballots
+
+
+# ---------------- Baselines ----------------
+def legacy_tally(voters_col, election_id: str, candidates: list):
+    """
+    The original result_page algorithm: fetch every voter, rescan per candidate.
+    """
+    voters = list(voters_col.find({"election_id": election_id}))
+    total_votes = sum(1 for v in voters if v.get("has_voted"))
+    counts = {}
+    for c in candidates:
+        counts[str(c["_id"])] = sum(1 for v in voters if v.get("voted_for") == str(c.get("_id")))
+    return counts, total_votes
+
+
+def voter_tally(voters_col, election_id: str):
+    """
+    The aggregation before votes_col: $group the voter documents by voted_for.
+    """
+    pipeline = [
+        {"$match": {"election_id": election_id, "has_voted": True}},
+        {"$group": {"_id": "$voted_for", "votes": {"$sum": 1}}},
+    ]
+    return services.collect_vote_counts(voters_col.aggregate(pipeline))
+
+
+def average_size(collection):
+    docs = list(collection.find().limit(100))
+    return sum(len(bson.encode(d)) for d in docs) // max(len(docs), 1)
+
+
+def best_of(fn, repeat: int):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def full_counts(counts: dict, candidates: list):
+    return {str(c["_id"]): counts.get(str(c["_id"]), 0) for c in candidates}
+
+
+# ---------------- Main ----------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--candidates", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'voters':>10} {'loop (s)':>10} {'voters $group (s)':>18} {'ballots $group (s)':>19} "
+        f"{'speedup':>8} {'voter B':>8} {'ballot B':>9} {'migrate (s)':>12}"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        db = get_bench_db()
+        for name in ("voters", "votes"):
+            db[name].create_indexes(INDEXES[name])
+        election_id, candidates = seed_election(db, size, args.candidates, legacy=True)
+        voters = db["voters"]
+
+        loop_time, (loop_counts, loop_total) = best_of(
+            lambda: legacy_tally(voters, election_id, candidates), args.repeat
+        )
+        before_time, (before_counts, before_total) = best_of(
+            lambda: voter_tally(voters, election_id), args.repeat
+        )
+        voter_bytes = average_size(voters)
+
+        migrate_ballots.voters_col, migrate_ballots.votes_col = voters, db["votes"]
+        start = time.perf_counter()
+        migrate_ballots.migrate_election(election_id)
+        migrate_time = time.perf_counter() - start
+
+        services.votes_col = db["votes"]
+        after_time, (after_counts, after_total) = best_of(
+            lambda: services.count_votes(election_id), args.repeat
+        )
+
+        assert loop_total == before_total == after_total
+        assert full_counts(before_counts, candidates) == full_counts(after_counts, candidates) == loop_counts
+
+        print(
+            f"{size:>10} {loop_time:>10.4f} {before_time:>18.4f} {after_time:>19.4f} "
+            f"{before_time / after_time:>7.1f}x {voter_bytes:>8} {average_size(db['votes']):>9} {migrate_time:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Render time of every template: cold compile, cold start from the bytecode cache,
+warm render, and a hit in the rendered page cache.
+
+    python -m benchmarks.bench_templates --repeat 200 --candidates 15
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.synthetic import make_candidates, make_voters
+from app.rendering import create_environment, precompile_templates, page_cache
+from app.elections.services import build_result
+from app.elections.listing import build_listing
+from app.elections.candidates import build_election_view
+
+
+def url_for(name, **path_params):
+    return f"/{name}"
+
+
+def sample_contexts(n_candidates: int, n_elections: int):
+    """
+    One realistic context per template, built by the same helpers the routes use.
+    """
+    candidates = make_candidates(n_candidates)
+    view = build_election_view(
+        {"election_id": "bench", "election": {"name": "Bench Election", "status": "Active"}},
+        candidates
+    )
+    voters = []
+    votes = {}
+    for voter, ballot in make_voters("bench", candidates, 50):
+        voters.append(voter)
+        if ballot:
+            votes[ballot["candidate_id"]] = votes.get(ballot["candidate_id"], 0) + 1
+
+    now = datetime.now()
+    summaries = [
+        {
+            "ec_name": f"EC {i}",
+            "election_id": f"election-{i}",
+            "name": f"Election {i}",
+            "start_date": now + timedelta(days=i - n_elections // 2),
+            "end_date": now + timedelta(days=i - n_elections // 2 + 1),
+        }
+        for i in range(n_elections)
+    ]
+    listing, _ = build_listing(summaries, now)
+
+    voter = voters[0]
+    thankyou = {"voter": voter, "election": view["election"], "vote_datetime": "2026-01-01 12:00:00",
+                "vote_token": "0" * 32, "candidates": view["candidates"]}
+    return {
+        "Dashboard.html": listing,
+        "EC-dashboard.html": {
+            "ec": {"election_id": "bench"}, "election": view["election"], "voters": voters,
+            "next_cursor": "x", "prev_cursor": None, "search": "", "candidates": candidates,
+            "total_voters": len(voters), "votes_cast": sum(votes.values()),
+        },
+        "EC-login.html": {"url_for": url_for},
+        "EC-signup.html": {"url_for": url_for},
+        "Login.html": {},
+        "Result.html": {"election": view["election"], **build_result(view["candidates"], votes, sum(votes.values()))},
+        "instruction.html": {"election_id": "bench"},
+        "thankyou.html": thankyou,
+        "vote.html": {"voter": voter, "election": view["election"], "candidates": view["candidates"]},
+    }
+
+
+def timed(fn, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--candidates", type=int, default=15)
+    parser.add_argument("--elections", type=int, default=50)
+    args = parser.parse_args()
+
+    contexts = sample_contexts(args.candidates, args.elections)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Populate the bytecode cache once, the way a previous worker would have
+        for name in contexts:
+            create_environment(cache_dir).get_template(name)
+
+        print(f"repeat={args.repeat} candidates={args.candidates} elections={args.elections}")
+        print(f"{'template':<20} {'compile ms':>11} {'bytecode ms':>12} {'render ms':>10} {'cached ms':>10}")
+
+        for name, context in contexts.items():
+            compile_ms = timed(lambda: create_environment(tempfile.mkdtemp(dir=cache_dir)).get_template(name), 5)
+            bytecode_ms = timed(lambda: create_environment(cache_dir).get_template(name), 20)
+
+            template = create_environment(cache_dir).get_template(name)
+            render_ms = timed(lambda: template.render(context), args.repeat)
+
+            page_cache.set(("bench", name), template.render(context).encode())
+            cached_ms = timed(lambda: page_cache.get(("bench", name)), args.repeat)
+
+            print(f"{name:<20} {compile_ms:>11.3f} {bytecode_ms:>12.3f} {render_ms:>10.3f} {cached_ms:>10.4f}")
+
+    print(f"precompiled at startup: {len(precompile_templates())} templates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Vote ingestion throughput: one conditional update per vote ("direct") against the
+write-ahead log with group commit, across batch sizes and flush intervals.
+
+    python -m benchmarks.bench_vote_ingest --votes 5000 --rtt 20
+    MONGO_BENCH_URI=mongodb://localhost:27017 python -m benchmarks.bench_vote_ingest
+
+Without MONGO_BENCH_URI every MongoDB call goes to mongomock after an --rtt sleep,
+which models the Atlas round trip that group commit saves. mongomock's own Python
+cost is included too, so absolute numbers only mean something against a real mongod.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import get_bench_db, seed_election
+
+import db.async_db as async_db
+from app.elections import tally
+from app.voters import services, ingest
+
+
+# ---------------- Simulated round trips ----------------
+class RoundTripCursor:
+    def __init__(self, collection, args, kwargs, rtt):
+        self._find = lambda: list(collection.find(*args, **kwargs))
+        self._rtt = rtt
+
+    async def to_list(self, length=None):
+        await asyncio.sleep(self._rtt)
+        return self._find()
+
+
+class RoundTripCollection:
+    """
+    mongomock collection behind the async API, paying `rtt` seconds per call.
+    """
+
+    def __init__(self, collection, rtt: float):
+        self._collection = collection
+        self._rtt = rtt
+
+    def find(self, *args, session=None, **kwargs):
+        return RoundTripCursor(self._collection, args, kwargs, self._rtt)
+
+    async def bulk_write(self, requests, ordered=True, session=None):
+        # mongomock cannot apply pymongo's UpdateOne, so replay the batch in one "round trip"
+        await asyncio.sleep(self._rtt)
+        for op in requests:
+            self._collection.update_one(op._filter, op._doc, upsert=op._upsert)
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+
+        async def call(*args, session=None, **kwargs):
+            await asyncio.sleep(self._rtt)
+            return attr(*args, **kwargs)
+
+        return call
+
+
+def wire(db, rtt: float):
+    """
+    Point every module that ingests votes at the benchmark database.
+    """
+    if os.getenv("MONGO_BENCH_URI"):
+        from pymongo import AsyncMongoClient
+        async_db.client = AsyncMongoClient(os.environ["MONGO_BENCH_URI"])
+        adb = async_db.client[db.name]
+        voters, votes, counters = adb["voters"], adb["votes"], adb["vote_counters"]
+        rejections = adb["vote_rejections"]
+    else:
+        async_db.client = db.client
+        voters = RoundTripCollection(db["voters"], rtt)
+        votes = RoundTripCollection(db["votes"], rtt)
+        counters = RoundTripCollection(db["vote_counters"], rtt)
+        rejections = RoundTripCollection(db["vote_rejections"], rtt)
+
+    services.voters_col = ingest.voters_col = voters
+    services.votes_col = ingest.votes_col = votes
+    tally.counters_col = ingest.counters_col = counters
+    ingest.rejections_col = rejections
+
+
+# ---------------- Runs ----------------
+async def submit_all(submit, voter_ids, candidates, election_id, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+    candidate_ids = [str(c["_id"]) for c in candidates]
+
+    async def one(i, voter_id):
+        async with gate:
+            ok, _ = await submit(voter_id, candidate_ids[i % len(candidate_ids)], election_id, candidates)
+            assert ok
+
+    await asyncio.gather(*(one(i, v) for i, v in enumerate(voter_ids)))
+
+
+async def run_direct(voter_ids, candidates, election_id, concurrency):
+    start = time.perf_counter()
+    await submit_all(services.cast_vote, voter_ids, candidates, election_id, concurrency)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+async def run_wal(voter_ids, candidates, election_id, concurrency, batch_size, interval):
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = ingest.VoteIngest(os.path.join(tmp, "votes.wal"), batch_size, interval)
+        await pipeline.start()
+
+        start = time.perf_counter()
+        await submit_all(pipeline.submit, voter_ids, candidates, election_id, concurrency)
+        acked = time.perf_counter() - start
+        await pipeline.stop()
+        committed = time.perf_counter() - start
+
+    assert pipeline.committed == len(voter_ids)
+    return acked, committed
+
+
+def fresh_election(args):
+    db = get_bench_db()
+    election_id, candidates = seed_election(db, args.votes, turnout=0)
+    voter_ids = [v["_id"] for v in db["voters"].find({}, {"_id": 1})]
+    wire(db, args.rtt / 1000)
+    return db, election_id, candidates, voter_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--votes", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--rtt", type=float, default=20, help="simulated round trip in ms")
+    parser.add_argument("--batch-sizes", default="50,200,500")
+    parser.add_argument("--intervals", default="0.01,0.05,0.2")
+    args = parser.parse_args()
+
+    print(f"votes={args.votes} concurrency={args.concurrency} rtt={args.rtt}ms")
+    print(f"{'mode':<6} {'batch':>6} {'interval':>9} {'acked/s':>10} {'committed/s':>12}")
+
+    db, election_id, candidates, voter_ids = fresh_election(args)
+    acked, committed = asyncio.run(run_direct(voter_ids, candidates, election_id, args.concurrency))
+    print(f"{'direct':<6} {'-':>6} {'-':>9} {args.votes / acked:>10.0f} {args.votes / committed:>12.0f}")
+
+    for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+        for interval in (float(i) for i in args.intervals.split(",")):
+            db, election_id, candidates, voter_ids = fresh_election(args)
+            acked, committed = asyncio.run(
+                run_wal(voter_ids, candidates, election_id, args.concurrency, batch_size, interval)
+            )
+            counter = db["vote_counters"].find_one({"_id": election_id})
+            assert counter["total_votes"] == args.votes
+
+            print(f"{'wal':<6} {batch_size:>6} {interval:>9.2f} {args.votes / acked:>10.0f} {args.votes / committed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+In-process harness for the route benchmarks: wires the app to the benchmark
+database, seeds one synthetic election and reads / writes comparable JSON results.
+
+The database is mongomock unless MONGO_BENCH_URI points at a local mongod; either
+way nothing leaves the machine. BENCH_VOTERS, BENCH_CANDIDATES, BENCH_SKEW and
+BENCH_TURNOUT size the election.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import BENCH_DB, seed_election
+
+BENCH_VOTERS = int(os.getenv("BENCH_VOTERS", "5000"))
+BENCH_CANDIDATES = int(os.getenv("BENCH_CANDIDATES", "10"))
+BENCH_SKEW = float(os.getenv("BENCH_SKEW", "1.0"))
+BENCH_TURNOUT = float(os.getenv("BENCH_TURNOUT", "0.5"))
+
+# Every seeded voter shares one real hash; low rounds keep bcrypt from drowning
+# the route cost (benchmarks/bench_passwords.py measures bcrypt itself)
+LOGIN_PASSWORD = "bench-password"
+LOGIN_ROUNDS = 4
+
+
+# ---------------- App ----------------
+def load_app():
+    """
+    Point both data layers at a clean benchmark database, then import the app.
+    Returns (app, sync db). Must run before anything imports app.main.
+    """
+    import db.db as database
+    import db.async_db as async_database
+    from tests.mongo_stub import wire
+
+    uri = os.getenv("MONGO_BENCH_URI")
+    bench_db = wire(database, async_database, BENCH_DB, uri)
+    database.client.drop_database(BENCH_DB)
+
+    from app.main import app
+    return app, bench_db
+
+
+def seed(db, voters: int = BENCH_VOTERS, candidates: int = BENCH_CANDIDATES,
+         skew: float = BENCH_SKEW, turnout: float = BENCH_TURNOUT):
+    """
+    Seed one election with indexes and loginable voters. Returns a dataset dict:
+    election_id, ec_id, candidates, login_email and the ids of voters yet to vote.
+    """
+    from db.indexes import ensure_indexes
+    from app.passwords import hash_password
+
+    ensure_indexes()
+    election_id, seeded = seed_election(db, voters, candidates, turnout, skew=skew)
+    db["voters"].update_many({"election_id": election_id}, {"$set": {"password_hash": hash_password(LOGIN_PASSWORD, LOGIN_ROUNDS)}})
+
+    unvoted = list(db["voters"].find({"election_id": election_id, "has_voted": False}, {"email": 1}))
+    return {
+        "election_id": election_id,
+        "ec_id": db["ec"].find_one({"election_id": election_id})["_id"],
+        "candidates": seeded,
+        "login_email": unvoted[0]["email"],
+        "unvoted": [v["_id"] for v in unvoted],
+        "unvoted_emails": [v["email"] for v in unvoted],
+    }
+
+
+def session_cookie(role: str, subject_id: str, election_id: str):
+    """
+    A ready-made session cookie, as the login routes would set it.
+    """
+    from app import sessions
+    return {sessions.COOKIE_NAMES[role]: sessions.issue(role, subject_id, election_id)}
+
+
+# ---------------- Results ----------------
+def run_metadata():
+    """
+    Where a result came from, so runs can be compared across commits and machines.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "backend": "mongod" if os.getenv("MONGO_BENCH_URI") else "mongomock",
+    }
+
+
+def write_results(path: str, results: dict):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps({"meta": run_metadata(), **results}, indent=2))
+
+
+def compare_results(baseline: dict, current: dict, threshold: float, metric: str = "p95_ms"):
+    """
+    [(step, before, after)] for every step whose `metric` grew by more than `threshold` (0.15 = 15%).
+    """
+    regressions = []
+    for step, stats in current.get("steps", {}).items():
+        before = baseline.get("steps", {}).get(step, {}).get(metric)
+        if before and stats[metric] > before * (1 + threshold):
+            regressions.append((step, before, stats[metric]))
+    return regressions
@@ -0,0 +1,106 @@
+"""
+Drive a running server with concurrent requests and report requests/sec and latency.
+
+    uvicorn app.main:app --port 8000 &
+    python -m benchmarks.load_test --url http://localhost:8000 --election-id <id> --concurrency 200 \
+        --ec-email ec@example.com --ec-password secret
+
+The voter login scenario repeats one login from one address, so start the server
+with LOGIN_RATE_LIMIT=0 to measure the login itself rather than the 429 path.
+Point the app at a local mongod (MONGO_URI=mongodb://localhost:27017) so Atlas
+latency does not dominate. To compare the sync and async data paths, run the
+same command against a checkout of the commit before the async routes landed
+(`git worktree add ../evoting-sync <rev>`) and against the current tree.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def hammer(client, method, path, data, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, data=data)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append(time.perf_counter() - start)
+
+
+async def ec_login(url, email, password):
+    """
+    Log in once and return the EC session cookie the dashboard scenario reuses.
+    """
+    async with httpx.AsyncClient(base_url=url, timeout=30) as client:
+        response = await client.post("/ec/login", data={"email": email, "password": password})
+    return {"ec_session": response.cookies["ec_session"]}
+
+
+async def run_scenario(url, name, method, path, data, concurrency, duration, cookies=None):
+    """
+    Print one result row and return it as {requests_per_second, p50_ms, p99_ms, errors}.
+    """
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30, cookies=cookies) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            hammer(client, method, path, data, deadline, latencies, errors)
+            for _ in range(concurrency)
+        ))
+
+    if not latencies:
+        print(f"{name:<16} no requests completed")
+        return
+
+    row = {
+        "requests_per_second": round(len(latencies) / duration, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "errors": len(errors),
+    }
+    print(f"{name:<16} {row['requests_per_second']:>9} {row['p50_ms']:>9} {row['p99_ms']:>9} {row['errors']:>7}")
+    return row
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test the hot E-Voting routes")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--election-id", required=True)
+    parser.add_argument("--email", help="voter email for the login scenario")
+    parser.add_argument("--password", help="voter password for the login scenario")
+    parser.add_argument("--ec-email", help="EC email for the EC dashboard scenario")
+    parser.add_argument("--ec-password", help="EC password for the EC dashboard scenario")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per scenario")
+    args = parser.parse_args()
+
+    scenarios = [
+        ("dashboard", "GET", "/", None, None),
+        ("result", "GET", f"/result?election_id={args.election_id}", None, None),
+    ]
+    if args.ec_email and args.ec_password:
+        # The dashboard needs the EC's signed session cookie
+        cookies = await ec_login(args.url, args.ec_email, args.ec_password)
+        scenarios.append(("ec dashboard", "GET", f"/ec/dashboard?election_id={args.election_id}", None, cookies))
+    if args.email and args.password:
+        scenarios.append(("voter login", "POST", "/voter/login", {"email": args.email, "password": args.password}, None))
+
+    print(f"{'scenario':<16} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, method, path, data, cookies in scenarios:
+        await run_scenario(args.url, name, method, path, data, args.concurrency, args.duration, cookies)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
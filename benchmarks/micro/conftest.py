@@ -0,0 +1,34 @@
+"""
+Fixtures for the route micro-benchmarks. The app is wired to the benchmark
+database at import, before pytest imports any test module.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks import harness
+
+app, bench_db = harness.load_app()
+
+
+@pytest.fixture(scope="session")
+def election():
+    return harness.seed(bench_db)
+
+
+@pytest.fixture(scope="session")
+def client(election):
+    from app.ratelimit import login_limiter
+
+    # The same login repeated from one address would only measure the 429 path;
+    # bench_login_limit covers the limiter
+    login_limiter.enabled = False
+    # One client for the whole run: the async MongoDB client stays on one event loop
+    with TestClient(app, base_url="https://testserver") as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def logged_out(client):
+    client.cookies.clear()
+    yield
@@ -0,0 +1,75 @@
+"""
+Route micro-benchmarks with pytest-benchmark, against one synthetic election.
+
+    python -m pytest benchmarks/micro --benchmark-json=.benchmarks/routes.json
+    python -m pytest benchmarks/micro --benchmark-autosave                       # baseline
+    python -m pytest benchmarks/micro --benchmark-compare --benchmark-compare-fail=mean:15%
+
+Autosaved runs are stored per commit under .benchmarks/; --benchmark-compare
+checks the current tree against the latest one and fails on a regression.
+Size the election with BENCH_VOTERS / BENCH_CANDIDATES / BENCH_SKEW and set
+MONGO_BENCH_URI to use a local mongod instead of mongomock.
+"""
+
+from app.cache import caches
+from app.rendering import page_cache
+from app.sessions import EC, VOTER
+
+from benchmarks import harness
+
+
+def clear_caches():
+    for cache in caches.values():
+        cache.clear()
+
+
+# ---------------- Public pages ----------------
+def test_result_page(benchmark, client, election):
+    response = benchmark(client.get, f"/result?election_id={election['election_id']}")
+    assert response.status_code == 200
+
+
+def test_result_page_uncached(benchmark, client, election):
+    url = f"/result?election_id={election['election_id']}"
+    response = benchmark.pedantic(client.get, (url,), setup=clear_caches, rounds=50)
+    assert response.status_code == 200
+
+
+def test_dashboard(benchmark, client, election):
+    response = benchmark(client.get, "/")
+    assert response.status_code == 200
+
+
+def test_dashboard_uncached(benchmark, client, election):
+    response = benchmark.pedantic(client.get, ("/",), setup=clear_caches, rounds=50)
+    assert response.status_code == 200
+
+
+# ---------------- EC ----------------
+def test_ec_dashboard(benchmark, client, election):
+    client.cookies.update(harness.session_cookie(EC, election["ec_id"], election["election_id"]))
+    response = benchmark(client.get, f"/ec/dashboard?election_id={election['election_id']}")
+    assert response.status_code == 200
+
+
+# ---------------- Voters ----------------
+def test_voter_login_post(benchmark, client, election):
+    form = {"email": election["login_email"], "password": harness.LOGIN_PASSWORD}
+    response = benchmark(client.post, "/voter/login", data=form)
+    assert response.status_code == 200 and "voter_session" in response.cookies
+
+
+def test_submit_vote(benchmark, client, election):
+    # Every round needs a voter who has not voted yet
+    voters = iter(election["unvoted"][1:])
+    candidate_id = str(election["candidates"][0]["_id"])
+
+    def next_voter():
+        client.cookies.update(harness.session_cookie(VOTER, next(voters), election["election_id"]))
+
+    response = benchmark.pedantic(
+        client.post, ("/vote",), {"data": {"candidate_id": candidate_id}},
+        setup=next_voter, rounds=min(200, len(election["unvoted"]) - 1)
+    )
+    assert response.status_code == 200
+    page_cache.clear()
@@ -0,0 +1,189 @@
+"""
+Polls-open load scenario: voters pour in as an election opens, each one loading
+the dashboard, logging in, voting and checking the result, while observers keep
+polling the result page. Reports per-step latency and vote throughput as JSON.
+
+    python -m benchmarks.polls_open --voters 1000 --ramp 10 --json .benchmarks/polls_open.json
+    python -m benchmarks.polls_open --json new.json --compare .benchmarks/polls_open.json --threshold 0.15
+
+The app runs in-process (ASGI, no sockets) against mongomock, or a local mongod
+with MONGO_BENCH_URI. --url drives a running server instead; it must use the same
+database (MONGO_URI=$MONGO_BENCH_URI MONGO_DB=evoting_bench).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import httpx
+
+from benchmarks import harness
+
+# Two thirds of the crowd arrives within the first third of the ramp
+ARRIVAL_MEAN = 1 / 3
+
+
+# ---------------- Recording ----------------
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    async def call(self, step, client, method, path, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            response, failed = None, True
+        self.latencies.setdefault(step, []).append(time.perf_counter() - start)
+        if failed:
+            self.errors[step] = self.errors.get(step, 0) + 1
+        return response
+
+    def summary(self):
+        steps = {}
+        for step, samples in self.latencies.items():
+            ordered = sorted(samples)
+            pick = lambda pct: round(ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))] * 1000, 2)
+            steps[step] = {
+                "count": len(ordered),
+                "errors": self.errors.get(step, 0),
+                "p50_ms": pick(50),
+                "p95_ms": pick(95),
+                "p99_ms": pick(99),
+                "max_ms": round(ordered[-1] * 1000, 2),
+            }
+        return steps
+
+
+# ---------------- Virtual users ----------------
+async def voter(make_client, recorder, election, email, ip, delay, weights):
+    await asyncio.sleep(delay)
+    async with make_client(ip) as client:
+        await recorder.call("dashboard", client, "GET", "/")
+        login = await recorder.call(
+            "voter_login", client, "POST", "/voter/login", data={"email": email, "password": harness.LOGIN_PASSWORD}
+        )
+        if login is None or "voter_session" not in client.cookies:
+            return False
+
+        candidate = random.choices(election["candidates"], weights)[0]
+        vote = await recorder.call("submit_vote", client, "POST", "/vote", data={"candidate_id": str(candidate["_id"])})
+        await recorder.call("result", client, "GET", f"/result?election_id={election['election_id']}")
+        return vote is not None and vote.status_code == 200
+
+
+async def observer(make_client, recorder, election, stop, interval):
+    async with make_client() as client:
+        while not stop.is_set():
+            await recorder.call("result_poll", client, "GET", f"/result?election_id={election['election_id']}")
+            await asyncio.sleep(interval)
+
+
+async def run(args, app, election):
+    # Each voter comes from its own address, so the login limiter sees a crowd, not one client
+    if args.url:
+        # app.serve trusts X-Forwarded-For from 127.0.0.1
+        make_client = lambda ip="127.0.0.1": httpx.AsyncClient(
+            base_url=args.url, timeout=60, headers={"X-Forwarded-For": ip}
+        )
+        return await load(args, make_client, election)
+
+    make_client = lambda ip="127.0.0.1": httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app, client=(ip, 40000)), base_url="https://testserver", timeout=60
+    )
+    async with app.router.lifespan_context(app):
+        return await load(args, make_client, election)
+
+
+async def load(args, make_client, election):
+    rng = random.Random(args.seed)
+    emails = election["unvoted_emails"][:args.voters]
+    delays = [min(rng.expovariate(1 / (args.ramp * ARRIVAL_MEAN)), args.ramp) for _ in emails]
+    weights = [1 / (k + 1) ** harness.BENCH_SKEW for k in range(len(election["candidates"]))]
+
+    recorder = Recorder()
+    stop = asyncio.Event()
+    observers = [
+        asyncio.create_task(observer(make_client, recorder, election, stop, args.poll_interval))
+        for _ in range(args.observers)
+    ]
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(
+        voter(make_client, recorder, election, email, f"10.{i // 250}.{i % 250}.1", delay, weights)
+        for i, (email, delay) in enumerate(zip(emails, delays))
+    ))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await asyncio.gather(*observers)
+
+    return {
+        "config": {
+            "voters": len(emails),
+            "candidates": harness.BENCH_CANDIDATES,
+            "skew": harness.BENCH_SKEW,
+            "ramp_seconds": args.ramp,
+            "observers": args.observers,
+            "target": args.url or "in-process",
+        },
+        "duration_seconds": round(elapsed, 3),
+        "votes_accepted": sum(outcomes),
+        "votes_per_second": round(sum(outcomes) / elapsed, 1),
+        "steps": recorder.summary(),
+    }
+
+
+# ---------------- Main ----------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--voters", type=int, default=1000, help="voters arriving (at most the seeded non-voters)")
+    parser.add_argument("--ramp", type=float, default=10.0, help="seconds over which voters arrive")
+    parser.add_argument("--observers", type=int, default=20, help="clients polling the result page")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--url", help="drive a running server instead of the in-process app")
+    parser.add_argument("--json", help="write the results here")
+    parser.add_argument("--compare", help="baseline JSON to check for p95 regressions")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    args = parser.parse_args()
+
+    app, bench_db = harness.load_app()
+    seeded = max(harness.BENCH_VOTERS, args.voters * 2)
+    election = harness.seed(bench_db, voters=seeded)
+    results = asyncio.run(run(args, app, election))
+    results["config"]["seeded_voters"] = seeded
+
+    # Integrity: one ballot and one counted vote per voter marked as voted
+    election_id = election["election_id"]
+    counter = bench_db["vote_counters"].find_one({"_id": election_id})
+    voted = bench_db["voters"].count_documents({"election_id": election_id, "has_voted": True})
+    results["counter_matches"] = counter["total_votes"] == bench_db["votes"].count_documents({"election_id": election_id}) == voted
+
+    print(f"{'step':<14} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for step, stats in results["steps"].items():
+        print(f"{step:<14} {stats['count']:>7} {stats['errors']:>7} {stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}")
+    print(f"{results['votes_accepted']} votes in {results['duration_seconds']}s "
+          f"({results['votes_per_second']} votes/s), counter matches: {results['counter_matches']}")
+
+    if args.json:
+        harness.write_results(args.json, results)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = harness.compare_results(json.load(f), results, args.threshold)
+        for step, before, after in regressions:
+            print(f"⚠️ {step}: p95 {before} ms -> {after} ms")
+        if regressions:
+            return 1
+
+    return 0 if results["counter_matches"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
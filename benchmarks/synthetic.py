@@ -0,0 +1,171 @@
+"""
+Synthetic election data for benchmarks.
+
+Set MONGO_BENCH_URI to run against a local mongod; otherwise mongomock is used
+so the benchmarks never need network access.
+"""
+
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+
+BENCH_DB = "evoting_bench"
+FAKE_HASH = "$2b$12$" + "x" * 53  # same size as a real bcrypt hash, none of the cost
+VOTED_AT = datetime(2026, 1, 1, 12)
+
+
+# ---------------- Database ----------------
+def get_bench_db():
+    """
+    Return a clean database on the benchmark backend.
+    """
+    uri = os.getenv("MONGO_BENCH_URI")
+    if uri:
+        from pymongo import MongoClient
+        client = MongoClient(uri)
+    else:
+        import mongomock
+        client = mongomock.MongoClient()
+
+    client.drop_database(BENCH_DB)
+    return client[BENCH_DB]
+
+
+# ---------------- Generators ----------------
+def make_candidates(n: int):
+    return [
+        {
+            "_id": str(uuid.uuid4()),
+            "name": f"Candidate {i}",
+            "party": f"Party {i}",
+            "moto": None,
+            "profile_pic": "uploads/candidates/default.gif",
+        }
+        for i in range(n)
+    ]
+
+
+def vote_weights(n_candidates: int, skew: float = 0.0):
+    """
+    Zipf-like share of the vote per candidate: candidate k gets 1 / (k + 1) ** skew.
+    0 is a uniform race, 1 a realistic front-runner, 2+ a landslide.
+    """
+    return [1 / (k + 1) ** skew for k in range(n_candidates)]
+
+
+def make_voters(
+    election_id: str,
+    candidates: list,
+    n: int,
+    turnout: float = 0.7,
+    seed: int = 42,
+    skew: float = 0.0
+):
+    """
+    Yield (voter, ballot) pairs; roughly `turnout` of the voters have a ballot for a
+    candidate drawn with vote_weights(skew), the others get None.
+    """
+    # Imported here so the harness can wire the database before any app module loads
+    from app.elections.services import make_ballot
+
+    rng = random.Random(seed)
+    weights = vote_weights(len(candidates), skew)
+    for i in range(n):
+        voted = rng.random() < turnout
+        voter = {
+            "_id": str(uuid.uuid4()),
+            "name": f"Voter {i}",
+            "email": f"voter{i}@example.com",
+            "password_hash": FAKE_HASH,
+            "election_id": election_id,
+            "has_voted": voted,
+        }
+        ballot = None
+        if voted:
+            candidate = rng.choices(candidates, weights)[0]
+            ballot = make_ballot(str(uuid.uuid4()), election_id, str(candidate["_id"]), VOTED_AT)
+        yield voter, ballot
+
+
+def legacy_voter(voter: dict, ballot: dict | None):
+    """
+    The same voter in the schema before votes_col: the vote lives on the voter document.
+    """
+    return {
+        **voter,
+        "voted_for": ballot["candidate_id"] if ballot else None,
+        **({"vote_token": ballot["_id"]} if ballot else {}),
+    }
+
+
+def seed_election(
+    db,
+    n_voters: int,
+    n_candidates: int = 15,
+    turnout: float = 0.7,
+    batch_size: int = 10_000,
+    legacy: bool = False,
+    skew: float = 0.0,
+    seed: int = 42
+):
+    """
+    Insert one EC with its election, candidates, `n_voters` voters, their ballots
+    and the matching vote counter. With `legacy` the votes are stored on the voter
+    documents instead, as before votes_col. Returns (election_id, candidates).
+    """
+    election_id = str(uuid.uuid4())
+    candidates = make_candidates(n_candidates)
+
+    db["ec"].insert_one({
+        "_id": str(uuid.uuid4()),
+        "name": "Bench EC",
+        "email": f"{election_id}@example.com",
+        "password_hash": FAKE_HASH,
+        "election_id": election_id,
+        "election": {
+            "election_id": election_id,
+            "name": "Bench Election",
+            "start_date": "2026-01-01T00:00:00",
+            "end_date": "2026-01-02T00:00:00",
+            "status": "Upcoming",
+        },
+    })
+    db["candidates"].insert_many([
+        {**c, "election_id": election_id, "created_at": datetime(2026, 1, 1) + timedelta(milliseconds=i)}
+        for i, c in enumerate(candidates)
+    ])
+
+    voters, ballots = [], []
+    votes = {}
+
+    def flush():
+        if voters:
+            db["voters"].insert_many(voters, ordered=False)
+        if ballots:
+            db["votes"].insert_many(ballots, ordered=False)
+        voters.clear()
+        ballots.clear()
+
+    for voter, ballot in make_voters(election_id, candidates, n_voters, turnout, seed, skew):
+        if ballot:
+            votes[ballot["candidate_id"]] = votes.get(ballot["candidate_id"], 0) + 1
+        if legacy:
+            voters.append(legacy_voter(voter, ballot))
+        else:
+            voters.append(voter)
+            if ballot:
+                ballots.append(ballot)
+        if len(voters) >= batch_size:
+            flush()
+    flush()
+
+    db["vote_counters"].insert_one({
+        "_id": election_id,
+        "votes": votes,
+        "total_votes": sum(votes.values()),
+        "total_voters": n_voters,
+        "version": 0,
+    })
+
+    return election_id, candidates
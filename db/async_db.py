@@ -0,0 +1,97 @@
+import time
+
+import pymongo
+from pymongo import AsyncMongoClient
+from pymongo.errors import OperationFailure
+
+# Reuse the configuration resolved by the sync layer; routed() serves both clients
+from db.db import MONGO_DB, LazyCollection, client_options, mongo_uri, routed  # noqa: F401
+from db.db import transactions_supported, warn_no_transactions
+from db.pool import PoolMonitor
+
+# ----------------------------
+# Async MongoDB client (PyMongo async API)
+# ----------------------------
+# Async routes await these collections directly instead of tying up
+# Starlette's threadpool with blocking pymongo calls.
+pool_monitor = PoolMonitor()
+client = db = None
+
+
+def connect():
+    """
+    Create the async client on first call and return the database, or None when
+    MongoDB is not configured. It connects on the first awaited operation.
+    """
+    global client, db
+    if client is None:
+        uri = mongo_uri()
+        if uri is None:
+            return None
+        client = AsyncMongoClient(uri, **client_options(pool_monitor))
+        db = client[MONGO_DB]
+    return db
+
+
+# Collections
+ec_col = LazyCollection("ec", connect)
+voters_col = LazyCollection("voters", connect)
+votes_col = LazyCollection("votes", connect)
+candidates_col = LazyCollection("candidates", connect)
+counters_col = LazyCollection("vote_counters", connect)
+rejections_col = LazyCollection("vote_rejections", connect)   # write-behind votes that lost to another vote
+limits_col = LazyCollection("login_limits", connect)     # shared login rate limits (RATE_LIMIT_BACKEND=mongo)
+
+
+# ----------------------------
+# Health
+# ----------------------------
+async def ping(timeout: float = 1.0):
+    """
+    Round-trip time of a ping in milliseconds, or raise PyMongoError.
+    """
+    connect()
+    start = time.perf_counter()
+    with pymongo.timeout(timeout):
+        await client.admin.command("ping")
+    return (time.perf_counter() - start) * 1000
+
+
+# ----------------------------
+# Transactions
+# ----------------------------
+async def has_transactions():
+    """
+    Ask the server whether multi-document transactions are available; raises PyMongoError.
+    """
+    connect()
+    try:
+        hello = await client.admin.command("hello")
+    except NotImplementedError:
+        return False    # mock clients
+    return transactions_supported(hello)
+
+
+async def run_in_transaction(callback):
+    """
+    Await callback(session) inside a multi-document transaction.
+    Falls back to a plain call with session=None, with a warning, where
+    transactions are unavailable.
+    """
+    connect()
+    try:
+        session = client.start_session()
+    except NotImplementedError:
+        warn_no_transactions()
+        return await callback(None)
+
+    async with session:
+        try:
+            return await session.with_transaction(callback)
+        except OperationFailure as e:
+            # 20 = IllegalOperation: transactions need a replica set or mongos
+            if e.code != 20:
+                raise
+
+    warn_no_transactions()
+    return await callback(None)
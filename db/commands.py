@@ -0,0 +1,55 @@
+import threading
+from contextvars import ContextVar
+
+from pymongo import monitoring
+
+# Timing breakdown of the request being served, a dict of seconds / counts per phase.
+# The metrics middleware sets it for sampled requests; None means "not sampled".
+trace = ContextVar("trace", default=None)
+
+
+# ----------------------------
+# Command monitoring (APM events)
+# ----------------------------
+class CommandTimer(monitoring.CommandListener):
+    """
+    Per-command totals (count, failures, server time) plus the round trips and
+    time each sampled request spends in MongoDB. Events are delivered in the
+    thread / task that ran the command, so the request's trace is in context.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._commands = {}
+
+    def started(self, event):
+        pass
+
+    def _record(self, event, failed: bool):
+        seconds = event.duration_micros / 1e6
+        current = trace.get()
+        if current is not None:
+            current["db_calls"] = current.get("db_calls", 0) + 1
+            current["db"] = current.get("db", 0.0) + seconds
+
+        with self._lock:
+            stats = self._commands.get(event.command_name)
+            if stats is None:
+                stats = self._commands[event.command_name] = {"count": 0, "failures": 0, "seconds": 0.0}
+            stats["count"] += 1
+            stats["seconds"] += seconds
+            if failed:
+                stats["failures"] += 1
+
+    def succeeded(self, event):
+        self._record(event, failed=False)
+
+    def failed(self, event):
+        self._record(event, failed=True)
+
+    def stats(self):
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._commands.items()}
+
+
+command_timer = CommandTimer()
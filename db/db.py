@@ -1,8 +1,17 @@
 import os
+import time
+import importlib.util
+from contextvars import ContextVar
 from urllib.parse import quote_plus
 from dotenv import load_dotenv
+import pymongo
 from pymongo.mongo_client import MongoClient
+from pymongo.read_preferences import Nearest, PrimaryPreferred, Secondary, SecondaryPreferred
 from pymongo.server_api import ServerApi
+from pymongo.errors import ConnectionFailure, OperationFailure
+
+from db.pool import PoolMonitor
+from db.commands import command_timer
 
 # Load environment variables
 load_dotenv()
@@ -16,42 +25,286 @@ MONGO_CLUSTER = os.getenv("MONGO_CLUSTER")
 MONGO_DB = os.getenv("MONGO_DB", "evoting_db")
 MONGO_URI = os.getenv("MONGO_URI")  # Optional full URI override
 
-# Initialize default variables
-client = db = ec_col = voters_col = votes_col = candidates_col = None
+# ----------------------------
+# Pool, timeouts, compression, read/write concerns
+# ----------------------------
+# Size the pool per uvicorn worker: total connections = workers x MONGO_MAX_POOL_SIZE
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_MS = int(os.getenv("MONGO_MAX_IDLE_MS", "300000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+# How long a booting worker waits for MongoDB before starting without its warmup
+MONGO_STARTUP_TIMEOUT_MS = int(os.getenv("MONGO_STARTUP_TIMEOUT_MS", "1500"))
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+MONGO_WRITE_CONCERN = os.getenv("MONGO_WRITE_CONCERN", "majority")
+MONGO_WRITE_TIMEOUT_MS = int(os.getenv("MONGO_WRITE_TIMEOUT_MS", "5000"))
+# Command monitoring feeds /metrics; off, pymongo skips building the APM events
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# Modules pymongo uses for each wire compressor; zlib ships with Python
+COMPRESSOR_MODULES = {
+    "zstd": ("compression.zstd", "backports.zstd"),
+    "snappy": ("snappy",),
+    "zlib": ("zlib",),
+}
 
-# Only try connecting if all required env vars exist
-if MONGO_USER and MONGO_PASSWORD and MONGO_CLUSTER:
+
+def _installed(module: str):
     try:
-        # Encode password safely
-        MONGO_PASSWORD_ENCODED = quote_plus(MONGO_PASSWORD)
-
-        # Build connection string if not provided
-        if not MONGO_URI:
-            MONGO_URI = (
-                f"mongodb+srv://{MONGO_USER}:{MONGO_PASSWORD_ENCODED}"
-                f"@{MONGO_CLUSTER}/{MONGO_DB}?retryWrites=true&w=majority"
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+def available_compressors(names: str = MONGO_COMPRESSORS):
+    """
+    Requested compressors whose module is installed, in order of preference.
+    """
+    return [
+        name for name in (n.strip() for n in names.split(","))
+        if any(_installed(module) for module in COMPRESSOR_MODULES.get(name, ()))
+    ]
+
+
+def client_options(monitor: PoolMonitor):
+    """
+    Keyword arguments shared by the sync and async clients.
+    """
+    w = int(MONGO_WRITE_CONCERN) if MONGO_WRITE_CONCERN.isdigit() else MONGO_WRITE_CONCERN
+    return {
+        "server_api": ServerApi("1"),
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "compressors": available_compressors(),
+        "readPreference": MONGO_READ_PREFERENCE,
+        "w": w,
+        "wTimeoutMS": MONGO_WRITE_TIMEOUT_MS,
+        "event_listeners": [monitor, command_timer] if METRICS_ENABLED else [monitor],
+        # Nothing is dialled until the first operation, and pymongo keeps reconnecting
+        # in the background, so an outage at startup no longer disables the app
+        "connect": False,
+    }
+
+
+pool_monitor = PoolMonitor()
+
+
+# ----------------------------
+# Read routing
+# ----------------------------
+# How stale a secondary may be before it stops serving routed reads (MongoDB minimum: 90)
+MONGO_MAX_STALENESS_SECONDS = max(int(os.getenv("MONGO_MAX_STALENESS_SECONDS", "90")), 90)
+# route=policy pairs; routes not listed, auth and the vote path read from the primary
+MONGO_READ_ROUTES = os.getenv(
+    "MONGO_READ_ROUTES",
+    "result=secondaryPreferred,dashboard=secondaryPreferred,instructions=secondaryPreferred,ec_dashboard=primary"
+)
+
+READ_POLICIES = {
+    "primary": None,    # the client's own read preference
+    "primaryPreferred": PrimaryPreferred(max_staleness=MONGO_MAX_STALENESS_SECONDS),
+    "secondaryPreferred": SecondaryPreferred(max_staleness=MONGO_MAX_STALENESS_SECONDS),
+    "secondary": Secondary(max_staleness=MONGO_MAX_STALENESS_SECONDS),
+    "nearest": Nearest(max_staleness=MONGO_MAX_STALENESS_SECONDS),
+}
+
+
+def parse_read_routes(spec: str = MONGO_READ_ROUTES):
+    """
+    "result=secondaryPreferred,ec_dashboard=primary" -> {route: policy}
+    """
+    routes = {}
+    for pair in filter(None, (p.strip() for p in spec.split(","))):
+        route, _, policy = pair.partition("=")
+        if policy not in READ_POLICIES:
+            raise ValueError(f"Unknown read policy {policy!r} for route {route!r}")
+        routes[route.strip()] = policy
+    return routes
+
+
+READ_ROUTES = parse_read_routes()
+
+# Policy of the request being served; read helpers pick it up through routed()
+read_policy = ContextVar("read_policy", default="primary")
+_routed = {}
+
+
+def use_read_route(route: str):
+    """
+    Route this request's (and its child tasks') reads by the policy configured for `route`.
+    """
+    read_policy.set(READ_ROUTES.get(route, "primary"))
+
+
+def routed(collection):
+    """
+    `collection` with the current read policy applied. Only use it for reads that
+    can tolerate MONGO_MAX_STALENESS_SECONDS of lag; writes ignore read preference.
+    """
+    preference = READ_POLICIES[read_policy.get()]
+    if preference is None:
+        return collection
+    if isinstance(collection, LazyCollection):
+        collection = collection.resolve()
+
+    key = (id(collection), read_policy.get())
+    entry = _routed.get(key)
+    if entry is None or entry[0] is not collection:
+        entry = _routed[key] = (collection, collection.with_options(read_preference=preference))
+    return entry[1]
+
+# ----------------------------
+# Lazy client
+# ----------------------------
+# Nothing is created or dialled at import: the app's lifespan calls connect() at
+# startup, and scripts connect on first use of a collection
+client = db = None
+
+
+def mongo_uri():
+    """
+    MONGO_URI, else an Atlas SRV URI built from MONGO_USER / MONGO_PASSWORD /
+    MONGO_CLUSTER, else None when the database is not configured.
+    """
+    if MONGO_URI:
+        return MONGO_URI
+    if MONGO_USER and MONGO_PASSWORD and MONGO_CLUSTER:
+        return (
+            f"mongodb+srv://{MONGO_USER}:{quote_plus(MONGO_PASSWORD)}"
+            f"@{MONGO_CLUSTER}/{MONGO_DB}?retryWrites=true&w=majority"
+        )
+    return None
+
+
+def connect():
+    """
+    Create the client on first call and return the database, or None when MongoDB
+    is not configured. No network I/O: with connect=False, server selection,
+    SRV lookup and the first handshake happen on the first operation.
+    """
+    global client, db
+    if client is None:
+        uri = mongo_uri()
+        if uri is None:
+            return None
+        client = MongoClient(uri, **client_options(pool_monitor))
+        db = client[MONGO_DB]
+    return db
+
+
+class LazyCollection:
+    """
+    Import-time stand-in for a collection: resolves (and connects) on first use,
+    then forwards everything to the real collection. Raises ConnectionFailure,
+    answered with a 503, when the database is not configured.
+    """
+
+    def __init__(self, name: str, connect):
+        self.name = name
+        self._connect = connect
+        self._collection = None
+
+    def resolve(self):
+        database = self._connect()
+        if database is None:
+            raise ConnectionFailure(
+                "MongoDB is not configured: set MONGO_URI or MONGO_USER / MONGO_PASSWORD / MONGO_CLUSTER"
             )
-            print("ℹ️ Using MongoDB Atlas URI from environment variables")
+        if self._collection is None or self._collection.database is not database:
+            self._collection = database[self.name]
+        return self._collection
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        return f"LazyCollection({self.name!r})"
+
+
+# Collections
+ec_col = LazyCollection("ec", connect)
+voters_col = LazyCollection("voters", connect)
+votes_col = LazyCollection("votes", connect)
+candidates_col = LazyCollection("candidates", connect)
+counters_col = LazyCollection("vote_counters", connect)   # one running tally document per election
+imports_col = LazyCollection("voter_imports", connect)    # progress of bulk voter imports
+
 
-        # Connect to MongoDB
-        client = MongoClient(MONGO_URI, server_api=ServerApi("1"))
+# ----------------------------
+# Health
+# ----------------------------
+def ping(timeout: float = 1.0):
+    """
+    Round-trip time of a ping in milliseconds, or raise PyMongoError.
+    `timeout` bounds server selection too, so a health check never hangs.
+    """
+    connect()
+    start = time.perf_counter()
+    with pymongo.timeout(timeout):
         client.admin.command("ping")
-        print("✅ Connected to MongoDB successfully")
+    return (time.perf_counter() - start) * 1000
 
-        db = client[MONGO_DB]
 
-        # Collections
-        ec_col = db["ec"]
-        voters_col = db["voters"]
-        votes_col = db["votes"]
-        candidates_col = db["candidates"]
-
-    except Exception as e:
-        print(f"❌ MongoDB connection failed: {e}")
-        print("⚠️ App will run, but DB operations will fail")
-
-else:
-    print(
-        "⚠️ MongoDB environment variables missing. "
-        "App will run, but DB operations will be disabled"
-    )
\ No newline at end of file
+# ----------------------------
+# Transactions
+# ----------------------------
+# Vote atomicity (voter flag, ballot and counter together) needs a replica set or
+# mongos. Elsewhere the writes run one after the other, and a crash in between
+# leaves a voter marked as voted without a ballot, or a ballot that is not counted.
+NO_TRANSACTIONS_WARNING = (
+    "⚠️ MongoDB transactions are unavailable (standalone server?): votes are written without one "
+    "and are not atomic. Run MongoDB as a replica set (a single-member one will do)."
+)
+_warned_no_transactions = False
+
+
+def transactions_supported(hello: dict) -> bool:
+    """
+    Whether a server's hello reply describes a deployment with transactions:
+    a replica set member or a mongos router.
+    """
+    return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+
+def warn_no_transactions():
+    """
+    Print NO_TRANSACTIONS_WARNING once per process, the first time a write falls back.
+    """
+    global _warned_no_transactions
+    if not _warned_no_transactions:
+        _warned_no_transactions = True
+        print(NO_TRANSACTIONS_WARNING)
+
+
+def run_in_transaction(callback):
+    """
+    Run callback(session) inside a multi-document transaction.
+    Standalone servers and mock clients have no transactions, so there the
+    callback runs once with session=None instead, with a warning.
+    """
+    connect()
+    try:
+        session = client.start_session()
+    except NotImplementedError:
+        warn_no_transactions()
+        return callback(None)
+
+    with session:
+        try:
+            return session.with_transaction(callback)
+        except OperationFailure as e:
+            # 20 = IllegalOperation: transactions need a replica set or mongos
+            if e.code != 20:
+                raise
+
+    warn_no_transactions()
+    return callback(None)
@@ -0,0 +1,138 @@
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import ConfigurationError, ConnectionFailure, OperationFailure
+
+import db.db as database
+
+# ----------------------------
+# Index definitions
+# ----------------------------
+# Names are fixed so create_indexes() is a no-op once they exist.
+INDEXES = {
+    "voters": [
+        # Login, the add-voter check and the import dedup all look voters up by
+        # email alone (the login form has no election), so an email is one voter
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+        # Voter listing and turnout counts
+        IndexModel([("election_id", ASCENDING), ("has_voted", ASCENDING)], name="election_has_voted"),
+        # Keyset pagination of the EC voter list
+        IndexModel([("election_id", ASCENDING), ("_id", ASCENDING)], name="election_id_keyset"),
+    ],
+    "ec": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+        IndexModel([("election_id", ASCENDING)], unique=True, name="election_id_unique"),
+    ],
+    "votes": [
+        # The tally $match/$group, answered from the index alone
+        IndexModel([("election_id", ASCENDING), ("candidate_id", ASCENDING)], name="election_candidate"),
+    ],
+    "candidates": [
+        # An election's ballot, in the order candidates were added
+        IndexModel([("election_id", ASCENDING), ("created_at", ASCENDING)], name="election_candidates"),
+    ],
+    "login_limits": [
+        # Idle buckets and failure counts disappear once they would have reset anyway
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ],
+}
+
+# Replaced indexes, dropped once their replacement exists
+OBSOLETE_INDEXES = {
+    "voters": ["email_election_unique"],
+}
+
+
+def ensure_indexes():
+    """
+    Create every index in INDEXES. Safe to run on each startup; a failure
+    (e.g. duplicates blocking a unique index) is reported, not raised.
+    """
+    if database.connect() is None:
+        print("⚠️ Skipping index bootstrap: MongoDB is not configured")
+        return False
+
+    ok = True
+    for collection, models in INDEXES.items():
+        try:
+            database.db[collection].create_indexes(models)
+        except (ConnectionFailure, ConfigurationError) as e:
+            # Unreachable, or the SRV lookup failed; indexes are created on the next startup
+            print(f"❌ Skipping index bootstrap, MongoDB unreachable: {e}")
+            return False
+        except OperationFailure as e:
+            ok = False
+            print(f"❌ Could not create indexes on {collection}: {e}")
+            continue
+
+        existing = database.db[collection].index_information()
+        for name in OBSOLETE_INDEXES.get(collection, []):
+            if name in existing:
+                database.db[collection].drop_index(name)
+    return ok
+
+
+# ----------------------------
+# Query plan verification
+# ----------------------------
+def hot_queries(election_id: str = "election", email: str = "voter@example.com"):
+    """
+    The filters and pipelines the request paths run, as (label, collection, kind, spec).
+    """
+    from app.elections.services import vote_count_pipeline
+
+    return [
+        ("voter login", "voters", "find", {"email": email}),
+        ("voter import dedup", "voters", "find", {"email": {"$in": [email]}}),
+        ("ec voter page", "voters", "find", {"election_id": election_id, "_id": {"$gt": "voter"}}),
+        ("turnout count", "voters", "find", {"election_id": election_id, "has_voted": True}),
+        ("cast vote", "voters", "find", {"_id": "voter", "election_id": election_id, "has_voted": False}),
+        ("tally", "votes", "aggregate", vote_count_pipeline(election_id)),
+        ("ec login", "ec", "find", {"email": email}),
+        ("ec by election", "ec", "find", {"election_id": election_id}),
+        ("candidates by election", "candidates", "find", {"election_id": election_id}),
+    ]
+
+
+def _winning_stages(node):
+    """
+    Yield every stage name found under a winningPlan anywhere in an explain document.
+    """
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key in ("winningPlan", "queryPlan"):
+                yield from _stages(value)
+            else:
+                yield from _winning_stages(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _winning_stages(item)
+
+
+def _stages(node):
+    if isinstance(node, dict):
+        if "stage" in node:
+            yield node["stage"]
+        for value in node.values():
+            yield from _stages(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _stages(item)
+
+
+def explain_query(collection: str, kind: str, spec):
+    if kind == "aggregate":
+        return database.db.command(
+            "explain", {"aggregate": collection, "pipeline": spec, "cursor": {}}, verbosity="queryPlanner"
+        )
+    return database.db[collection].find(spec).explain()
+
+
+def find_collscans():
+    """
+    Explain every hot query and return [(label, stages)] for those planned as COLLSCAN.
+    """
+    failures = []
+    for label, collection, kind, spec in hot_queries():
+        stages = set(_winning_stages(explain_query(collection, kind, spec)))
+        if "COLLSCAN" in stages:
+            failures.append((label, sorted(stages)))
+    return failures
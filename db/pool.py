@@ -0,0 +1,109 @@
+import threading
+from collections import deque
+
+from pymongo import monitoring
+
+# Checkout waits kept per server for the percentiles reported by /healthz
+WAIT_SAMPLES = 1000
+
+
+# ----------------------------
+# Connection pool monitoring (CMAP events)
+# ----------------------------
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Per-server connection pool counters fed by pymongo's CMAP events: open and
+    in-use connections, checkout waits and failures. Each client gets its own monitor.
+    Servers are reported as server-1, server-2 ... in the order their pools were
+    created, so reports never carry MongoDB host names.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = {}
+        self._names = {}
+
+    def _pool(self, address):
+        pool = self._pools.get(address)
+        if pool is None:
+            self._names.setdefault(address, f"server-{len(self._names) + 1}")
+            pool = self._pools[address] = {
+                "open": 0,
+                "in_use": 0,
+                "max_in_use": 0,
+                "checkouts": 0,
+                "checkout_failures": {},
+                "cleared": 0,
+                "waits": deque(maxlen=WAIT_SAMPLES),
+            }
+        return pool
+
+    # ---- pool lifecycle ----
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pool(event.address)["cleared"] += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop(event.address, None)
+
+    # ---- connections ----
+    def connection_created(self, event):
+        with self._lock:
+            self._pool(event.address)["open"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["open"] = max(pool["open"] - 1, 0)
+
+    # ---- checkouts ----
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            failures = self._pool(event.address)["checkout_failures"]
+            failures[event.reason] = failures.get(event.reason, 0) + 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["in_use"] += 1
+            pool["max_in_use"] = max(pool["max_in_use"], pool["in_use"])
+            pool["checkouts"] += 1
+            if event.duration is not None:
+                pool["waits"].append(event.duration * 1000)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["in_use"] = max(pool["in_use"] - 1, 0)
+
+    # ---- reporting ----
+    def stats(self):
+        """
+        Snapshot per server, with checkout wait percentiles in milliseconds.
+        """
+        report = {}
+        with self._lock:
+            for address, pool in self._pools.items():
+                waits = sorted(pool["waits"])
+                report[self._names[address]] = {
+                    **{k: v for k, v in pool.items() if k != "waits"},
+                    "checkout_failures": dict(pool["checkout_failures"]),
+                    "wait_ms_p50": round(waits[len(waits) // 2], 3) if waits else 0.0,
+                    "wait_ms_p95": round(waits[int(len(waits) * 0.95)], 3) if waits else 0.0,
+                    "wait_ms_max": round(waits[-1], 3) if waits else 0.0,
+                }
+        return report
@@ -0,0 +1,22 @@
+"""
+Fingerprint and precompress static assets, writing static/manifest.json.
+
+    python -m scripts.build_assets
+
+Run at image build time so workers load the manifest instead of hashing files on startup.
+"""
+
+import json
+from pathlib import Path
+
+from app.assets import MANIFEST_FILE, STATIC_DIR, build_manifest
+
+
+def main():
+    manifest = build_manifest(STATIC_DIR)
+    (Path(STATIC_DIR) / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    print(f"✅ {len(manifest['assets'])} asset(s) fingerprinted, {len(manifest['encodings'])} precompressed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Create the indexes, then explain() every hot query and fail if any falls back to COLLSCAN.
+
+    python -m scripts.check_indexes
+    python -m scripts.check_indexes --no-create   # only verify
+"""
+
+import argparse
+import sys
+
+import db.db as database
+from db.indexes import ensure_indexes, find_collscans, hot_queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify query plans of the hot queries")
+    parser.add_argument("--no-create", action="store_true", help="do not create missing indexes first")
+    args = parser.parse_args()
+
+    if database.connect() is None:
+        print("❌ MongoDB is not configured")
+        return 2
+
+    if not args.no_create:
+        ensure_indexes()
+
+    failures = dict(find_collscans())
+    for label, collection, _, _ in hot_queries():
+        if label in failures:
+            print(f"❌ {label} ({collection}): {' > '.join(failures[label])}")
+        else:
+            print(f"✅ {label} ({collection})")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
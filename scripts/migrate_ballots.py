@@ -0,0 +1,114 @@
+"""
+Move cast votes off the voter documents into ballots in votes_col.
+
+    python -m scripts.migrate_ballots             # every election
+    python -m scripts.migrate_ballots --dry-run   # report only
+
+Each voter with `voted_for` becomes one ballot whose _id is the voter's existing
+vote_token, so receipts handed out before the migration stay valid. voted_for and
+vote_token are only removed from a voter once their ballot is in votes_col, so the
+script is safe to re-run after an interruption. Counter totals do not change.
+"""
+
+import argparse
+import sys
+import uuid
+
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, OperationFailure
+
+from db.db import connect, ec_col, voters_col, votes_col
+from db.indexes import ensure_indexes
+from app.elections.services import make_ballot
+
+BATCH_SIZE = 1000
+LEGACY_VOTE = {"has_voted": True, "voted_for": {"$nin": [None, ""]}}
+
+
+def migrate_batch(election_id: str, voters: list):
+    """
+    Turn one batch of legacy voters into ballots, then strip the vote from the voters.
+    """
+    # Voters without a token get one first, so a re-run cannot mint a second ballot
+    # (rare: every vote cast through cast_vote has one)
+    for voter in voters:
+        if not voter.get("vote_token"):
+            voter["vote_token"] = voters_col.find_one_and_update(
+                {"_id": voter["_id"]},
+                [{"$set": {"vote_token": {"$ifNull": ["$vote_token", str(uuid.uuid4())]}}}],
+                projection={"vote_token": 1},
+                return_document=ReturnDocument.AFTER
+            )["vote_token"]
+
+    try:
+        votes_col.insert_many([
+            # Cast time was never recorded on the voter document
+            {**make_ballot(v["vote_token"], election_id, v["voted_for"]), "cast_at": None}
+            for v in voters
+        ], ordered=False)
+    except BulkWriteError as e:
+        # Ballots written by an interrupted earlier run are already in place
+        if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+            raise
+
+    voters_col.update_many(
+        {"_id": {"$in": [v["_id"] for v in voters]}},
+        {"$unset": {"voted_for": "", "vote_token": ""}}
+    )
+
+
+def migrate_election(election_id: str, apply: bool = True, batch_size: int = BATCH_SIZE):
+    """
+    Migrate one election's cast votes. Returns how many it found.
+    """
+    query = {"election_id": election_id, **LEGACY_VOTE}
+    if not apply:
+        return voters_col.count_documents(query)
+
+    # Migrated voters stop matching the query, so each pass picks up the next batch
+    moved = 0
+    while batch := list(voters_col.find(query, {"voted_for": 1, "vote_token": 1}).limit(batch_size)):
+        migrate_batch(election_id, batch)
+        moved += len(batch)
+
+    # Voters who never voted drop the empty field too
+    voters_col.update_many(
+        {"election_id": election_id, "voted_for": {"$exists": True}},
+        {"$unset": {"voted_for": ""}}
+    )
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move cast votes from voters_col into votes_col")
+    parser.add_argument("--dry-run", action="store_true", help="report without writing")
+    args = parser.parse_args()
+
+    if connect() is None:
+        print("❌ MongoDB is not configured")
+        return 2
+
+    if not args.dry_run:
+        ensure_indexes()
+
+    elections = moved = 0
+    for ec in ec_col.find({}, {"election_id": 1}):
+        count = migrate_election(ec["election_id"], apply=not args.dry_run)
+        elections += 1
+        moved += count
+        print(f"{'🔎' if args.dry_run else '✅'} {ec['election_id']}: {count} vote(s)")
+
+    if not args.dry_run:
+        # The tally no longer groups voters by voted_for
+        try:
+            voters_col.drop_index("election_has_voted_voted_for")
+        except OperationFailure:
+            pass
+
+    action = "to move" if args.dry_run else "moved"
+    print(f"{moved} vote(s) from {elections} election(s) {action}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Move candidates out of ec.election.candidates into candidates_col.
+
+    python -m scripts.migrate_candidates             # every election
+    python -m scripts.migrate_candidates --dry-run   # report only
+
+Safe to re-run: candidates are upserted by _id, and the embedded array is only
+removed once every candidate of that election is in candidates_col. Ballot
+order is kept through created_at.
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta
+
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+from db.db import connect, ec_col, candidates_col
+from db.indexes import ensure_indexes
+
+# Migrated candidates sort before anything added through the new code path
+MIGRATED_AT = datetime(2000, 1, 1)
+
+
+def migrate_election(ec: dict, apply: bool = True):
+    """
+    Copy one election's embedded candidates into candidates_col. Returns how many it found.
+    """
+    election_id = ec["election_id"]
+    embedded = ec["election"]["candidates"] or []
+    if not apply:
+        return len(embedded)
+
+    if embedded:
+        candidates_col.bulk_write([
+            UpdateOne(
+                {"_id": str(c["_id"])},
+                {"$setOnInsert": {
+                    **{k: v for k, v in c.items() if k != "_id"},
+                    "election_id": election_id,
+                    "created_at": MIGRATED_AT + timedelta(milliseconds=position),   # keeps the array order
+                }},
+                upsert=True
+            )
+            for position, c in enumerate(embedded)
+        ], ordered=False)
+
+    ec_col.update_one({"_id": ec["_id"]}, {"$unset": {"election.candidates": ""}})
+    return len(embedded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move embedded candidates into candidates_col")
+    parser.add_argument("--dry-run", action="store_true", help="report without writing")
+    args = parser.parse_args()
+
+    if connect() is None:
+        print("❌ MongoDB is not configured")
+        return 2
+
+    if not args.dry_run:
+        ensure_indexes()
+
+    elections = moved = 0
+    for ec in ec_col.find({"election.candidates": {"$exists": True}}, {"election_id": 1, "election.candidates": 1}):
+        count = migrate_election(ec, apply=not args.dry_run)
+        elections += 1
+        moved += count
+        print(f"{'🔎' if args.dry_run else '✅'} {ec['election_id']}: {count} candidate(s)")
+
+    if not args.dry_run:
+        # The embedded-candidate index has nothing left to cover
+        try:
+            ec_col.drop_index("election_candidate_id")
+        except OperationFailure:
+            pass
+
+    action = "to move" if args.dry_run else "moved"
+    print(f"{moved} candidate(s) from {elections} election(s) {action}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Rebuild the per-election vote counters from the ballots and report drift.
+
+    python -m scripts.reconcile_counters                 # every election
+    python -m scripts.reconcile_counters --election-id X
+    python -m scripts.reconcile_counters --dry-run       # report only
+
+Elections that already had voters before the counters were deployed get their
+counter seeded the first time a voter is added or removed. Run this to seed the
+others, and any time the counters are suspected to be off. Votes cast while it runs can
+be missed, so prefer a quiet moment or simply run it twice.
+"""
+
+import argparse
+import sys
+
+from db.db import connect, ec_col
+from app.elections.services import reconcile_counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild vote counters from votes_col")
+    parser.add_argument("--election-id", help="only reconcile this election")
+    parser.add_argument("--dry-run", action="store_true", help="report drift without writing")
+    args = parser.parse_args()
+
+    if connect() is None:
+        print("❌ MongoDB is not configured")
+        return 2
+
+    if args.election_id:
+        election_ids = [args.election_id]
+    else:
+        election_ids = [ec["election_id"] for ec in ec_col.find({}, {"election_id": 1})]
+
+    drifted = 0
+    for election_id in election_ids:
+        drift = reconcile_counters(election_id, apply=not args.dry_run)
+        if not drift:
+            print(f"✅ {election_id}: counters match")
+            continue
+
+        drifted += 1
+        print(f"⚠️ {election_id}: {len(drift)} field(s) drifted")
+        for field, (stored, actual) in sorted(drift.items()):
+            print(f"    {field}: counter={stored} actual={actual}")
+
+    action = "reported" if args.dry_run else "fixed"
+    print(f"{drifted} of {len(election_ids)} election(s) {action}")
+    return 1 if drifted and args.dry_run else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
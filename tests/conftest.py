@@ -0,0 +1,33 @@
+"""
+Point db/db.py at a throwaway database before any app module is imported.
+
+Set MONGO_TEST_URI to run against a local mongod; otherwise mongomock is used.
+"""
+
+import os
+
+import pytest
+
+# Never let the test run dial the Atlas cluster from .env
+for var in ("MONGO_USER", "MONGO_PASSWORD", "MONGO_CLUSTER"):
+    os.environ[var] = ""
+
+import db.db as database  # noqa: E402
+import db.async_db as async_database  # noqa: E402
+from tests.mongo_stub import COLLECTIONS, wire  # noqa: E402
+
+TEST_DB = "evoting_test"
+
+wire(database, async_database, TEST_DB, os.getenv("MONGO_TEST_URI"))
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    for name in COLLECTIONS.values():
+        database.db[name].delete_many({})
+    yield
+
+
+@pytest.fixture
+def mongo():
+    return database
@@ -0,0 +1,198 @@
+"""
+Point db/db.py and db/async_db.py at a throwaway database: a local mongod when a
+URI is given, otherwise mongomock behind the async API the routes expect.
+Used by the test suite and the benchmark harness; call wire() before any app
+module is imported, since they bind the collections at import time.
+"""
+
+import asyncio
+import threading
+
+COLLECTIONS = {
+    "ec_col": "ec",
+    "voters_col": "voters",
+    "votes_col": "votes",
+    "candidates_col": "candidates",
+    "counters_col": "vote_counters",
+    "imports_col": "voter_imports",
+    "rejections_col": "vote_rejections",
+    "limits_col": "login_limits",
+}
+
+
+class AtomicCollection:
+    """
+    mongomock applies updates without locking, unlike mongod which makes every
+    single-document operation atomic. Serialise calls so concurrency tests see
+    server semantics.
+    """
+
+    _lock = threading.RLock()
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if not callable(attr):
+            return attr
+
+        def locked(*args, **kwargs):
+            with self._lock:
+                return attr(*args, **kwargs)
+
+        return locked
+
+    def bulk_write(self, requests, ordered=True, **kwargs):
+        """
+        mongomock 4.3 cannot apply pymongo 4's write models (UpdateOne grew a
+        `sort` option), so apply them one at a time, all under the lock.
+        """
+        from pymongo.errors import BulkWriteError, DuplicateKeyError
+        from pymongo.results import BulkWriteResult
+
+        counts = {"nInserted": 0, "nMatched": 0, "nModified": 0, "nUpserted": 0, "nRemoved": 0}
+        upserted, errors = [], []
+        with self._lock:
+            for index, op in enumerate(requests):
+                kind = type(op).__name__
+                try:
+                    if kind == "InsertOne":
+                        self._collection.insert_one(op._doc)
+                        counts["nInserted"] += 1
+                    elif kind in ("DeleteOne", "DeleteMany"):
+                        delete = self._collection.delete_one if kind == "DeleteOne" else self._collection.delete_many
+                        counts["nRemoved"] += delete(op._filter).deleted_count
+                    else:
+                        write = {
+                            "UpdateOne": self._collection.update_one,
+                            "UpdateMany": self._collection.update_many,
+                            "ReplaceOne": self._collection.replace_one,
+                        }[kind]
+                        result = write(op._filter, op._doc, upsert=op._upsert)
+                        counts["nMatched"] += result.matched_count
+                        counts["nModified"] += result.modified_count
+                        if result.upserted_id is not None:
+                            counts["nUpserted"] += 1
+                            upserted.append({"index": index, "_id": result.upserted_id})
+                except DuplicateKeyError as e:
+                    errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": op})
+                    if ordered:
+                        break
+
+        result = {**counts, "upserted": upserted, "writeErrors": errors, "writeConcernErrors": []}
+        if errors:
+            raise BulkWriteError(result)
+        return BulkWriteResult(result, True)
+
+
+class AsyncCursor:
+    """
+    Async face of a mongomock cursor: chaining plus to_list / async iteration.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        attr = getattr(self._cursor, name)
+
+        def chained(*args, **kwargs):
+            attr(*args, **kwargs)
+            return self
+
+        return chained
+
+    async def to_list(self, length=None):
+        docs = await asyncio.to_thread(list, self._cursor)
+        return docs if length is None else docs[:length]
+
+    async def __aiter__(self):
+        for doc in await self.to_list():
+            yield doc
+
+
+class AsyncCollection:
+    """
+    Async face of a (locked) mongomock collection, matching the PyMongo async API:
+    operations are awaited on a worker thread, find() returns a cursor directly.
+    """
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self._collection.find(*args, **kwargs))
+
+    def with_options(self, **kwargs):
+        # mongomock has a single node, so read preferences change nothing
+        return self
+
+    async def aggregate(self, *args, **kwargs):
+        rows = await asyncio.to_thread(lambda: list(self._collection.aggregate(*args, **kwargs)))
+        return AsyncCursor(iter(rows))
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            kwargs.pop("session", None)
+            return await asyncio.to_thread(attr, *args, **kwargs)
+
+        return call
+
+
+class AsyncAdmin:
+    """
+    Async face of the mongomock admin database, for the ping in health checks and warmup.
+    """
+
+    def __init__(self, client):
+        self._admin = client.admin
+
+    async def command(self, *args, **kwargs):
+        return self._admin.command(*args, **kwargs)
+
+
+class AsyncClient:
+    """
+    The mongomock client with an awaitable admin.command(); everything else is synchronous.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self.admin = AsyncAdmin(client)
+
+    def __getitem__(self, name):
+        return self._client[name]
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def wire(database, async_database, db_name: str, uri: str | None = None):
+    """
+    Rebind the client, database and collections of both data layers; returns the sync database.
+    """
+    if uri:
+        from pymongo import AsyncMongoClient, MongoClient
+        database.client = MongoClient(uri)
+        database.db = database.client[db_name]
+        async_database.client = AsyncMongoClient(uri)
+        async_database.db = async_database.client[db_name]
+        for attr, name in COLLECTIONS.items():
+            setattr(database, attr, database.db[name])
+            setattr(async_database, attr, async_database.db[name])
+    else:
+        import mongomock
+        database.client = mongomock.MongoClient()
+        async_database.client = AsyncClient(database.client)
+        database.db = async_database.db = database.client[db_name]
+        for attr, name in COLLECTIONS.items():
+            collection = AtomicCollection(database.db[name])
+            setattr(database, attr, collection)
+            setattr(async_database, attr, AsyncCollection(collection))
+
+    return database.db
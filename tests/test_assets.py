@@ -0,0 +1,69 @@
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.assets import IMMUTABLE, REVALIDATE, AssetManifest, AssetStaticFiles, accepted_encodings
+
+CSS = b"body { color: #123456; }\n" * 200
+
+
+@pytest.fixture
+def static(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "app.css").write_bytes(CSS)
+    manifest = AssetManifest(str(tmp_path))
+    manifest.load()
+
+    app = FastAPI()
+    app.mount("/static", AssetStaticFiles(directory=str(tmp_path), manifest=manifest), name="static")
+    return TestClient(app), manifest
+
+
+def test_accept_encoding_q_values():
+    assert accepted_encodings("gzip, deflate, br") == {"gzip": 1.0, "deflate": 1.0, "br": 1.0}
+    assert accepted_encodings("br;q=0, gzip;q=0.8") == {"br": 0.0, "gzip": 0.8}
+    assert accepted_encodings(" BR ; Q=0.5 ,, *;q=bogus") == {"br": 0.5, "*": 0.0}
+    assert accepted_encodings("") == {}
+
+
+@pytest.mark.parametrize("header, encoding", [
+    ("gzip, deflate, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("*", "br"),
+    ("*;q=0, gzip", "gzip"),
+    ("identity", None),
+])
+def test_precompressed_variant_follows_accept_encoding(static, header, encoding):
+    client, manifest = static
+    response = client.get(manifest.url("css/app.css"), headers={"Accept-Encoding": header})
+
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == CSS
+    if encoding == "br":
+        assert int(response.headers["content-length"]) == len(brotli.compress(CSS, quality=11))
+    elif encoding == "gzip":
+        assert int(response.headers["content-length"]) == len(gzip.compress(CSS, compresslevel=9, mtime=0))
+
+
+def test_fingerprinted_assets_are_immutable_and_revalidate_with_304(static):
+    client, manifest = static
+    url = manifest.url("css/app.css")
+    assert url != "/static/css/app.css"
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["cache-control"] == IMMUTABLE
+
+    again = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    # The logical name still works, but has to be revalidated
+    plain = client.get("/static/css/app.css")
+    assert plain.status_code == 200
+    assert plain.headers["cache-control"] == REVALIDATE
@@ -0,0 +1,56 @@
+import asyncio
+from datetime import datetime
+
+from app.elections import listing
+from app.elections.listing import election_listing_version, get_election_listing, invalidate_election_listing
+
+START = datetime(2026, 5, 1, 9, 0)
+END = datetime(2026, 5, 1, 17, 0)
+
+
+def add_election(mongo, election_id, start, end):
+    mongo.ec_col.insert_one({
+        "name": f"EC {election_id}",
+        "election": {"election_id": election_id, "name": f"Election {election_id}",
+                     "start_date": start.isoformat(), "end_date": end},
+    })
+
+
+def test_status_flips_at_the_boundary_without_reloading(mongo, monkeypatch):
+    invalidate_election_listing()
+    add_election(mongo, "polls", START, END)
+    add_election(mongo, "past", datetime(2026, 4, 1), datetime(2026, 4, 2))
+
+    loads = []
+    load = listing.load_election_summaries
+
+    async def counted():
+        loads.append(1)
+        return await load()
+
+    monkeypatch.setattr(listing, "load_election_summaries", counted)
+
+    def statuses(now):
+        view = asyncio.run(get_election_listing(now))
+        return [(e["election_id"], e["status"]) for e in view["elections"]], election_listing_version()
+
+    before, version = statuses(datetime(2026, 5, 1, 8, 59, 59))
+    assert before == [("polls", "Upcoming"), ("past", "Completed")]
+    assert statuses(datetime(2026, 5, 1, 8, 59, 59)) == (before, version)
+
+    during, opened = statuses(START)
+    assert during == [("polls", "Active"), ("past", "Completed")]
+    assert opened == version + 1
+
+    after, closed = statuses(datetime(2026, 5, 1, 17, 0, 1))
+    assert after == [("polls", "Completed"), ("past", "Completed")]
+    assert closed == opened + 1
+    # Statuses were re-derived from the cached summaries
+    assert len(loads) == 1
+
+    # A change to an election goes back to MongoDB
+    invalidate_election_listing()
+    add_election(mongo, "later", datetime(2026, 6, 1), datetime(2026, 6, 2))
+    view = asyncio.run(get_election_listing(START))
+    assert (view["total_elections"], view["active_count"], view["upcoming_count"]) == (3, 1, 1)
+    assert len(loads) == 2
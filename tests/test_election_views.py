@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.elections.candidates import election_views, get_election_view, invalidate_election_view
+from app.elections.tally import get_election_totals, get_versioned_vote_counts, increment_vote_counter
+from app.users.services import add_candidate, remove_candidate
+
+ELECTION_ID = "election-1"
+
+
+@pytest.fixture(autouse=True)
+def empty_views():
+    election_views.clear()
+
+
+def add_election(mongo):
+    mongo.ec_col.insert_one({"_id": "ec-1", "election_id": ELECTION_ID, "election": {"name": "Council"}})
+
+
+def test_view_is_cached_until_invalidated(mongo):
+    add_election(mongo)
+    ok, first_id = add_candidate(ELECTION_ID, "Asha", "Blue")
+    assert ok
+
+    view = asyncio.run(get_election_view(ELECTION_ID))
+    assert view["election"]["election_id"] == ELECTION_ID
+    assert [c["_id"] for c in view["candidates"]] == [first_id]
+    assert view["candidates"][0]["image_url"] == "/static/uploads/candidates/default.gif"
+    with pytest.raises(TypeError):
+        view["candidates"][0]["name"] = "changed"
+
+    # Writes elsewhere are not seen until the route that made them invalidates
+    ok, second_id = add_candidate(ELECTION_ID, "Ravi", "Green")
+    hits = election_views.hits
+    assert asyncio.run(get_election_view(ELECTION_ID)) is view
+    assert election_views.hits == hits + 1
+
+    invalidations = election_views.invalidations
+    invalidate_election_view(ELECTION_ID)
+    fresh = asyncio.run(get_election_view(ELECTION_ID))
+    assert [c["_id"] for c in fresh["candidates"]] == [first_id, second_id]
+
+    remove_candidate(ELECTION_ID, first_id)
+    invalidate_election_view(ELECTION_ID)
+    assert [c["_id"] for c in asyncio.run(get_election_view(ELECTION_ID))["candidates"]] == [second_id]
+    assert election_views.invalidations == invalidations + 2
+
+    assert asyncio.run(get_election_view("missing")) is None
+    assert election_views.get("missing") is None
+
+
+def test_counter_reads_fall_back_to_the_ballots(mongo):
+    mongo.votes_col.insert_many([
+        {"_id": f"ballot-{i}", "election_id": ELECTION_ID, "candidate_id": "c1" if i < 2 else "c2",
+         "cast_at": datetime.now()}
+        for i in range(3)
+    ])
+    mongo.voters_col.insert_many([
+        {"_id": f"v{i}", "election_id": ELECTION_ID, "has_voted": i < 3} for i in range(5)
+    ])
+
+    # No counter yet: aggregated, and the version is unknown
+    assert asyncio.run(get_versioned_vote_counts(ELECTION_ID)) == ({"c1": 2, "c2": 1}, 3, None)
+    assert asyncio.run(get_election_totals(ELECTION_ID)) == (5, 3)
+
+    mongo.counters_col.insert_one({"_id": ELECTION_ID, "votes": {"c1": 2, "c2": 1}, "total_votes": 3,
+                                   "total_voters": 5, "version": 7})
+    asyncio.run(increment_vote_counter(ELECTION_ID, "c2"))
+    assert asyncio.run(get_versioned_vote_counts(ELECTION_ID)) == ({"c1": 2, "c2": 2}, 4, 8)
+    assert asyncio.run(get_election_totals(ELECTION_ID)) == (5, 4)
@@ -0,0 +1,30 @@
+import pytest
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError
+
+from app.voters import importer
+from db.indexes import INDEXES, ensure_indexes
+
+
+@pytest.fixture
+def voters(mongo):
+    yield mongo.db["voters"]
+    for collection in INDEXES:
+        mongo.db[collection].drop_indexes()
+
+
+def test_a_voter_email_belongs_to_one_election(voters):
+    # The per-election index of earlier deployments is replaced
+    voters.create_indexes([IndexModel([("email", ASCENDING), ("election_id", ASCENDING)], unique=True,
+                                      name="email_election_unique")])
+    assert ensure_indexes()
+    assert "email_election_unique" not in voters.index_information()
+
+    voters.insert_one({"_id": "v1", "email": "asha@x.org", "election_id": "election-1"})
+    with pytest.raises(DuplicateKeyError):
+        voters.insert_one({"_id": "v2", "email": "asha@x.org", "election_id": "election-2"})
+
+    # The importer reports it instead of skipping it silently
+    inserted, errors = importer.import_batch("election-2", [(2, {"name": "Asha", "email": "asha@x.org",
+                                                                 "password": "pw"})], set())
+    assert (inserted, [e["error"] for e in errors]) == (0, ["Voter with this email already exists"])
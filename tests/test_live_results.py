@@ -0,0 +1,75 @@
+import asyncio
+
+from app.elections import live
+from app.elections.live import ResultPublisher, Subscriber
+
+ELECTION_ID = "election-1"
+
+
+def set_counts(mongo, votes, version):
+    mongo.counters_col.replace_one(
+        {"_id": ELECTION_ID},
+        {"votes": votes, "total_votes": sum(votes.values()), "version": version},
+        upsert=True
+    )
+
+
+def test_slow_subscriber_gets_one_merged_update():
+    async def scenario():
+        subscriber = Subscriber(ELECTION_ID)
+        subscriber.push({"votes": {"a": 1, "b": 1}, "total_votes": 2, "version": 1})
+        subscriber.push({"votes": {"a": 2}, "total_votes": 3, "version": 2})
+        subscriber.push({"votes": {"c": 1}, "total_votes": 4, "version": 3})
+
+        assert await subscriber.next(timeout=0.1) == {"votes": {"a": 2, "b": 1, "c": 1}, "total_votes": 4, "version": 3}
+        assert await subscriber.next(timeout=0.01) is None
+
+        subscriber.close()
+        assert await subscriber.next(timeout=0.1) is None and subscriber.closed
+
+    asyncio.run(scenario())
+
+
+def test_publisher_pushes_only_what_changed(mongo):
+    async def scenario():
+        publisher = ResultPublisher(ELECTION_ID)
+        subscriber = Subscriber(ELECTION_ID)
+        publisher.add(subscriber)
+        try:
+            set_counts(mongo, {"a": 1, "b": 2}, version=3)
+            await publisher.refresh()
+            assert await subscriber.next(0.1) == {"votes": {"a": 1, "b": 2}, "total_votes": 3, "version": 3}
+
+            # Same version: nothing is pushed
+            await publisher.refresh()
+            assert await subscriber.next(0.01) is None
+
+            set_counts(mongo, {"a": 1, "b": 3, "c": 1}, version=5)
+            await publisher.refresh()
+            set_counts(mongo, {"a": 1, "c": 2}, version=7)
+            await publisher.refresh()
+            # Two refreshes before the client read: merged, removed candidates drop to 0
+            assert await subscriber.next(0.1) == {"votes": {"b": 0, "c": 2}, "total_votes": 3, "version": 7}
+
+            # A late subscriber starts from the full snapshot
+            late = Subscriber(ELECTION_ID)
+            publisher.add(late)
+            assert await late.next(0.1) == {"votes": {"a": 1, "c": 2}, "total_votes": 3, "version": 7}
+        finally:
+            publisher.close()
+
+    asyncio.run(scenario())
+
+
+def test_publisher_stops_with_its_last_subscriber():
+    async def scenario():
+        first = live.subscribe(ELECTION_ID)
+        second = live.subscribe(ELECTION_ID)
+        publisher = live.publishers[ELECTION_ID]
+
+        live.unsubscribe(first)
+        assert live.publishers[ELECTION_ID] is publisher
+        live.unsubscribe(second)
+        assert ELECTION_ID not in live.publishers
+
+    asyncio.run(scenario())
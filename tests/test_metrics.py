@@ -0,0 +1,35 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.main import app
+from app.metrics import MetricsMiddleware, request_duration, timed
+
+
+def test_sampled_requests_get_a_server_timing_breakdown():
+    demo = FastAPI()
+    demo.add_middleware(MetricsMiddleware, sample_rate=1.0, server_timing=True)
+
+    @demo.get("/items/{item_id}")
+    def item(item_id: str):
+        with timed("bcrypt"):
+            pass
+        return {"id": item_id}
+
+    response = TestClient(demo).get("/items/42")
+    assert response.headers["server-timing"].startswith("bcrypt;dur=")
+    assert "total;dur=" in response.headers["server-timing"]
+    # Labelled by route template, not the raw path
+    assert any(line.startswith('evoting_http_request_duration_seconds_count{method="GET",route="/items/{item_id}"} ')
+               for line in request_duration.render())
+
+
+def test_metrics_endpoint_speaks_prometheus_text(monkeypatch):
+    monkeypatch.setattr(metrics, "OPS_TOKEN", "ops-test-token")
+    client = TestClient(app)
+    client.get("/instructions")
+    response = client.get("/metrics", headers={"Authorization": "Bearer ops-test-token"})
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE evoting_http_request_duration_seconds histogram" in response.text
+    assert 'evoting_template_render_seconds_count{template="instruction.html"}' in response.text
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.main import app
+from db.pool import PoolMonitor
+
+TOKEN = "ops-test-token"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(metrics, "OPS_TOKEN", TOKEN)
+    return TestClient(app)
+
+
+def test_health_details_need_the_ops_token(client):
+    assert client.get("/healthz").json() == {"status": "ok"}
+    assert client.get("/healthz", headers={"Authorization": "Bearer wrong"}).json() == {"status": "ok"}
+
+    report = client.get("/healthz", headers={"Authorization": f"Bearer {TOKEN}"}).json()
+    assert report["status"] == "ok"
+    assert {"pool", "sync", "async", "ping_ms"} <= set(report)
+
+
+@pytest.mark.parametrize("path", ["/metrics", "/metrics/password-pool", "/metrics/vote-ingest", "/metrics/cache"])
+def test_metrics_need_the_ops_token(client, monkeypatch, path):
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get(path, headers={"Authorization": f"Bearer {TOKEN}"}).status_code == 200
+
+    # No token configured: closed to everyone
+    monkeypatch.setattr(metrics, "OPS_TOKEN", "")
+    assert client.get(path, headers={"Authorization": "Bearer "}).status_code == 401
+
+
+def test_pool_report_names_servers_without_their_addresses():
+    monitor = PoolMonitor()
+    primary, secondary = ("shard-00-00.example.mongodb.net", 27017), ("shard-00-01.example.mongodb.net", 27017)
+    for address in (primary, secondary, primary):
+        monitor.connection_created(SimpleNamespace(address=address))
+
+    report = monitor.stats()
+    assert set(report) == {"server-1", "server-2"}
+    assert report["server-1"]["open"] == 2
+    assert "example" not in repr(report)
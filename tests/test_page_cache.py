@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.rendering import create_environment, page_cache, templates
+
+
+def test_instructions_share_one_cache_entry_whatever_the_query():
+    page_cache.clear()
+    client = TestClient(app)
+
+    bodies = {client.get("/instructions", params={"election_id": f"flood-{i}"}).text for i in range(20)}
+
+    assert len(bodies) == 1
+    assert page_cache.stats()["size"] == 1
+
+
+def test_standalone_environments_render_the_app_templates(tmp_path):
+    # Benchmarks and scripts render without the app; they get the same globals
+    env = create_environment(str(tmp_path))
+    assert env.globals["asset_url"] == templates.env.globals["asset_url"]
+    assert "url_for" in templates.env.globals
+    assert env.get_template("vote.html").render(request=None, election={"name": "Council"}, candidates=[])
@@ -0,0 +1,85 @@
+import asyncio
+
+import mongomock
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.ratelimit import LoginLimiter, MemoryBackend, MongoBackend, login_limiter
+from tests.mongo_stub import AsyncCollection, AtomicCollection
+
+
+def mongo_backend():
+    return MongoBackend(AsyncCollection(AtomicCollection(mongomock.MongoClient().db.login_limits)))
+
+
+@pytest.mark.parametrize("make_backend", [MemoryBackend, mongo_backend], ids=["memory", "mongo"])
+def test_buckets_refill_and_lockouts_double(make_backend):
+    limiter = LoginLimiter(make_backend(), enabled=True, ip_burst=3, ip_per_minute=60,
+                           account_burst=10, account_per_minute=60,
+                           lockout_after=2, lockout_seconds=10, lockout_max_seconds=25)
+
+    async def scenario():
+        # Address bucket: three back to back, then one per second
+        assert [await limiter.check("voter", "10.0.0.1", f"v{i}@x.org", now=100) for i in range(4)] == [0, 0, 0, 1]
+        assert await limiter.check("voter", "10.0.0.1", "v4@x.org", now=101) == 0
+        assert await limiter.check("voter", "10.0.0.2", "v5@x.org", now=101) == 0
+
+        # Account lockout: 10s after the second failure, then 20s, capped at 25s
+        await limiter.failed("voter", "victim@x.org", now=200)
+        await limiter.failed("voter", " Victim@X.org", now=200)
+        assert await limiter.check("voter", "10.0.0.3", "victim@x.org", now=205) == 5
+        assert await limiter.check("voter", "10.0.0.3", "victim@x.org", now=210) == 0
+        await limiter.failed("voter", "victim@x.org", now=210)
+        assert await limiter.check("voter", "10.0.0.3", "victim@x.org", now=211) == 19
+        await limiter.failed("voter", "victim@x.org", now=230)
+        assert await limiter.check("voter", "10.0.0.3", "victim@x.org", now=230) == 25
+
+        # The EC login keeps its own counts, and a success clears the failures
+        assert await limiter.check("ec", "10.0.0.3", "victim@x.org", now=230) == 0
+        await limiter.succeeded("voter", "victim@x.org")
+        assert await limiter.check("voter", "10.0.0.3", "victim@x.org", now=231) == 0
+
+    asyncio.run(scenario())
+
+
+def test_taking_tokens_keeps_the_lockout_alive_in_mongo():
+    backend = mongo_backend()
+    limiter = LoginLimiter(backend, enabled=True, account_burst=5, account_per_minute=60,
+                           lockout_after=1, lockout_seconds=600, lockout_max_seconds=900)
+
+    async def scenario():
+        await limiter.failed("voter", "victim@x.org", now=1000)
+        # Buckets refill in seconds; taking from one must not shorten the lockout's expiry
+        for i in range(3):
+            await backend.take("voter:account:victim@x.org", 5, 1.0, now=1001 + i)
+        expires = {doc["_id"]: doc["expires_at"].timestamp()
+                   for doc in await backend.collection.find({}).to_list(None)}
+        assert expires == {"voter:account:victim@x.org": 1003 + 5, "failures:voter:account:victim@x.org": 1000 + 900}
+        assert await limiter.check("voter", "10.0.0.1", "victim@x.org", now=1500) == 100
+
+        await limiter.succeeded("voter", "victim@x.org")
+        assert await limiter.check("voter", "10.0.0.1", "victim@x.org", now=1500) == 0
+
+    asyncio.run(scenario())
+
+
+def test_login_over_the_limit_is_refused_before_any_lookup(monkeypatch):
+    monkeypatch.setattr(login_limiter, "backend", MemoryBackend())
+    monkeypatch.setattr(login_limiter, "enabled", True)
+    monkeypatch.setattr(login_limiter, "account_burst", 2)
+    client = TestClient(app)
+
+    statuses = [
+        client.post("/voter/login", data={"email": "nobody@x.org", "password": "guess"}).status_code
+        for _ in range(3)
+    ]
+    assert statuses == [200, 200, 429]
+
+    async def lookup(*args, **kwargs):
+        raise AssertionError("rate limited logins must not reach the database")
+
+    monkeypatch.setattr("db.async_db.voters_col.find_one", lookup)
+    response = client.post("/voter/login", data={"email": "nobody@x.org", "password": "guess"})
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
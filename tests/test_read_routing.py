@@ -0,0 +1,84 @@
+import asyncio
+import contextvars
+import os
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pymongo import MongoClient, WriteConcern
+from pymongo.read_preferences import SecondaryPreferred
+
+from db.db import MONGO_MAX_STALENESS_SECONDS, parse_read_routes, read_policy, routed, use_read_route
+from app.elections import candidates
+from app.main import read_route
+
+# A client that never dials out: read preferences are resolved client side
+offline = MongoClient("mongodb://localhost:27017/?replicaSet=rs0", connect=False)["evoting_test"]["ec"]
+
+
+def in_route(route, fn):
+    def run():
+        use_read_route(route)
+        return fn()
+    return contextvars.copy_context().run(run)
+
+
+def test_public_routes_read_from_secondaries():
+    collection = in_route("result", lambda: routed(offline))
+    assert collection.read_preference == SecondaryPreferred(max_staleness=MONGO_MAX_STALENESS_SECONDS)
+    assert in_route("result", lambda: routed(offline)) is collection
+
+
+def test_auth_and_unrouted_reads_stay_on_primary():
+    assert routed(offline) is offline
+    assert in_route("ec_dashboard", lambda: routed(offline)) is offline
+    assert in_route("voter_login", lambda: routed(offline)) is offline
+
+
+def test_shared_election_view_is_loaded_from_primary_on_public_routes(mongo, monkeypatch):
+    mongo.ec_col.insert_one({"election_id": "view-1", "election": {"name": "Council"}})
+    candidates.election_views.invalidate("view-1")
+
+    def no_routing(collection):
+        raise AssertionError("the cached view must not be read from a secondary")
+
+    monkeypatch.setattr(candidates, "routed", no_routing)
+    view = in_route("result", lambda: asyncio.run(candidates.get_election_view("view-1")))
+    assert view["election"]["name"] == "Council"
+
+
+def test_route_policies_are_validated():
+    assert parse_read_routes("result=nearest, ec_dashboard=primary") == {"result": "nearest", "ec_dashboard": "primary"}
+    with pytest.raises(ValueError):
+        parse_read_routes("result=anywhere")
+
+
+def test_route_dependency_sets_policy_for_the_endpoint():
+    app = FastAPI()
+
+    @app.get("/probe", dependencies=[read_route("result")])
+    async def probe():
+        return read_policy.get()
+
+    assert TestClient(app).get("/probe").json() == "secondaryPreferred"
+    assert read_policy.get() == "primary"
+
+
+@pytest.mark.skipif(not os.getenv("MONGO_TEST_URI"), reason="needs MONGO_TEST_URI pointing at a replica set")
+def test_routed_reads_on_a_local_replica_set(mongo):
+    hello = mongo.client.admin.command("hello")
+    if not hello.get("setName"):
+        pytest.skip("MONGO_TEST_URI is not a replica set")
+
+    mongo.ec_col.with_options(write_concern=WriteConcern(w="majority")).insert_one(
+        {"election_id": "routed", "name": "Replica EC"}
+    )
+
+    # Secondaries apply the write asynchronously; well within the staleness bound
+    deadline = time.monotonic() + 5
+    found = None
+    while found is None and time.monotonic() < deadline:
+        found = in_route("result", lambda: routed(mongo.ec_col).find_one({"election_id": "routed"}))
+        time.sleep(0.1)
+    assert found["name"] == "Replica EC"
@@ -0,0 +1,57 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.elections.candidates import election_views
+from app.elections.services import build_result, count_votes, make_ballot
+from app.elections.tally import aggregate_votes
+from app.main import app
+from app.users.services import add_candidate
+
+ELECTION_ID = "election-1"
+
+
+def cast(mongo, candidate_id, n, election_id=ELECTION_ID):
+    mongo.votes_col.insert_many([
+        make_ballot(f"{election_id}-{candidate_id}-{i}", election_id, candidate_id) for i in range(n)
+    ])
+
+
+def test_counts_are_grouped_per_candidate_by_the_server(mongo):
+    cast(mongo, "c1", 3)
+    cast(mongo, "c2", 1)
+    cast(mongo, "c1", 5, election_id="other-election")
+
+    assert count_votes(ELECTION_ID) == ({"c1": 3, "c2": 1}, 4)
+    assert asyncio.run(aggregate_votes(ELECTION_ID)) == ({"c1": 3, "c2": 1}, 4)
+    assert count_votes("no-ballots") == ({}, 0)
+
+
+def test_result_has_percentages_a_winner_or_a_draw():
+    candidates = [{"_id": "c1", "name": "Asha"}, {"_id": "c2", "name": "Ravi"}, {"_id": "c3", "name": "Meera"}]
+
+    result = build_result(candidates, {"c1": 1, "c2": 2}, 3)
+    assert [(c["name"], c["votes"], c["percentage"]) for c in result["candidates"]] == [
+        ("Ravi", 2, 66.7), ("Asha", 1, 33.3), ("Meera", 0, 0.0)
+    ]
+    assert result["winner"]["name"] == "Ravi" and not result["is_draw"]
+
+    result = build_result(candidates, {"c1": 2, "c2": 2}, 4)
+    assert result["winner"] is None and result["is_draw"]
+
+    result = build_result(candidates, {}, 0)
+    assert result["winner"] is None and not result["is_draw"]
+
+
+def test_result_page_shows_the_tallied_ballots(mongo):
+    election_views.clear()
+    mongo.ec_col.insert_one({"_id": "ec-1", "election_id": ELECTION_ID, "election": {"name": "Council"}})
+    _, asha = add_candidate(ELECTION_ID, "Asha", "Blue")
+    _, ravi = add_candidate(ELECTION_ID, "Ravi", "Green")
+    cast(mongo, asha, 2)
+    cast(mongo, ravi, 1)
+
+    page = TestClient(app).get("/result", params={"election_id": ELECTION_ID})
+    assert page.status_code == 200
+    assert '<span id="total-votes">3</span>' in page.text
+    assert "Winner: Asha (2 votes)" in page.text
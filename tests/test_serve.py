@@ -0,0 +1,23 @@
+from app import serve
+
+
+def test_workers_need_a_shared_session_secret(monkeypatch):
+    monkeypatch.setattr(serve, "VOTE_INGEST_MODE", "direct")
+    monkeypatch.setattr(serve, "SESSION_SECRET", "")
+    assert serve.check_shared_settings(1) is None
+    assert "SESSION_SECRET" in serve.check_shared_settings(4)
+
+    monkeypatch.setattr(serve, "SESSION_SECRET", "s3cret")
+    assert serve.check_shared_settings(4) is None
+
+
+def test_vote_log_folder_is_prepared_before_workers_spawn(monkeypatch, tmp_path):
+    monkeypatch.setattr(serve, "SESSION_SECRET", "s3cret")
+    monkeypatch.setattr(serve, "VOTE_INGEST_MODE", "wal")
+    monkeypatch.setattr(serve, "VOTE_WAL_PATH", str(tmp_path / "data" / "votes.wal"))
+    assert serve.check_shared_settings(4) is None
+    assert (tmp_path / "data").is_dir()
+
+    (tmp_path / "file").write_text("")
+    monkeypatch.setattr(serve, "VOTE_WAL_PATH", str(tmp_path / "file" / "votes.wal"))
+    assert "Cannot create the vote log folder" in serve.check_shared_settings(4)
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import time
+
+from fastapi.responses import Response
+
+from app import sessions
+
+
+def test_session_round_trip_without_database():
+    token = sessions.issue(sessions.VOTER, "voter-1", "election-1")
+    session = sessions.verify(token, sessions.VOTER)
+
+    assert session["subject_id"] == "voter-1"
+    assert session["election_id"] == "election-1"
+    assert sessions.verify(token, sessions.EC) is None
+
+
+def test_tampered_and_expired_tokens_are_rejected():
+    token = sessions.issue(sessions.EC, "ec-1", "election-1")
+    payload, signature = token.split(".")
+    forged = sessions.issue(sessions.EC, "ec-2", "election-2").split(".")[0]
+
+    assert sessions.verify(f"{forged}.{signature}", sessions.EC) is None
+    assert sessions.verify(f"{payload}.{signature[:-2]}", sessions.EC) is None
+    assert sessions.verify("not-a-token", sessions.EC) is None
+    assert sessions.verify(token, sessions.EC, now=time.time() + sessions.EC_SESSION_TTL + 1) is None
+
+
+def test_missing_secret_is_fatal_with_more_than_one_worker():
+    env = {k: v for k, v in os.environ.items() if k != "SESSION_SECRET"}
+
+    def start(workers):
+        return subprocess.run([sys.executable, "-c", "import app.sessions"], env={**env, "WEB_CONCURRENCY": workers},
+                              capture_output=True, text=True)
+
+    failed = start("4")
+    assert failed.returncode != 0 and "SESSION_SECRET is not set" in failed.stderr
+    assert start("1").returncode == 0
+
+
+def test_cookie_is_sent_over_plain_http_unless_secure_is_configured(monkeypatch):
+    cookie = sessions.set_session_cookie(Response(), sessions.EC, "ec-1", "election-1").headers["set-cookie"]
+    assert "httponly" in cookie.lower() and "secure" not in cookie.lower()
+
+    monkeypatch.setattr(sessions, "SESSION_COOKIE_SECURE", True)
+    cookie = sessions.set_session_cookie(Response(), sessions.EC, "ec-1", "election-1").headers["set-cookie"]
+    assert "secure" in cookie.lower()
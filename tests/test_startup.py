@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+# Self time of our own modules under `python -X importtime`; the rest is FastAPI,
+# pydantic and pymongo, which no change here can make cheaper
+FIRST_PARTY_IMPORT_BUDGET_MS = 250
+# Only needed by the import and upload routes, imported when those run
+DEFERRED_MODULES = ("openpyxl", "PIL", "mongomock")
+
+PROBE = """
+from db import db, async_db
+import app.main
+assert db.client is None and async_db.client is None, "a MongoDB client was created at import"
+"""
+
+
+def test_importing_the_app_stays_offline_and_within_budget():
+    # An unresolvable SRV URI: any DNS lookup or connection attempt at import would fail the probe
+    env = {**os.environ, "MONGO_URI": "mongodb+srv://evoting.invalid/evoting_db"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    self_us, modules = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        self_time, _, name = line.removeprefix("import time:").split("|")
+        name = name.strip()
+        modules.add(name.split(".")[0])
+        if name.split(".")[0] in ("app", "db"):
+            self_us += int(self_time)
+
+    assert self_us / 1000 < FIRST_PARTY_IMPORT_BUDGET_MS
+    assert not modules & set(DEFERRED_MODULES)
@@ -0,0 +1,24 @@
+import asyncio
+
+import db.db as database
+from db import async_db
+from db.db import NO_TRANSACTIONS_WARNING, transactions_supported
+
+
+def test_replica_sets_and_mongos_have_transactions():
+    assert transactions_supported({"isWritablePrimary": True, "setName": "rs0"})
+    assert transactions_supported({"isWritablePrimary": True, "msg": "isdbgrid"})
+    assert not transactions_supported({"isWritablePrimary": True})
+
+
+def test_falling_back_without_a_transaction_is_reported_once(monkeypatch, capsys):
+    monkeypatch.setattr(database, "_warned_no_transactions", False)
+
+    async def write(session):
+        assert session is None
+        return "written"
+
+    assert asyncio.run(async_db.run_in_transaction(write)) == "written"
+    assert database.run_in_transaction(lambda session: session) is None
+    assert asyncio.run(async_db.has_transactions()) is False
+    assert capsys.readouterr().out.count(NO_TRANSACTIONS_WARNING) == 1
@@ -0,0 +1,90 @@
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app import uploads
+from app.main import app
+from app.uploads import save_candidate_image
+
+
+class Upload:
+    def __init__(self, data: bytes, filename: str = "photo.png"):
+        self.file = io.BytesIO(data)
+        self.filename = filename
+
+
+def png(width=40, height=30, color=(200, 30, 30)):
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(out, "PNG")
+    return out.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def static_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "STATIC_DIR", tmp_path)
+    return tmp_path
+
+
+def stored(static_dir):
+    return sorted(p.name for p in (static_dir / uploads.CANDIDATE_DIR).iterdir() if p.is_file())
+
+
+def test_type_is_taken_from_magic_bytes_not_the_filename(static_dir):
+    assert save_candidate_image(Upload(b"<svg onload=alert(1)>", "photo.png")) == (
+        False, "Unsupported image type (use JPEG, PNG, GIF or WebP)"
+    )
+    assert save_candidate_image(Upload(b"", "photo.png")) == (False, "Uploaded image is empty")
+
+    saved, (profile_pic, _) = save_candidate_image(Upload(png(), "photo.gif"))
+    assert saved and profile_pic.endswith(".png")
+    # Rejected uploads leave no temp files behind
+    assert stored(static_dir) == [profile_pic.rsplit("/", 1)[1]]
+
+
+def test_oversized_image_is_rejected(static_dir, monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_BYTES", 1024)
+    monkeypatch.setattr(uploads, "UPLOAD_CHUNK_SIZE", 256)
+
+    assert save_candidate_image(Upload(b"\x89PNG\r\n\x1a\n" + bytes(2048))) == (False, "Image is larger than 1 KB")
+    assert stored(static_dir) == []
+
+
+def test_decompression_bomb_is_rejected(static_dir, monkeypatch):
+    monkeypatch.setattr(uploads, "MAX_IMAGE_PIXELS", 100 * 100)
+
+    assert save_candidate_image(Upload(png(200, 200))) == (False, "Image dimensions are too large")
+    assert stored(static_dir) == []
+
+
+def test_identical_uploads_share_one_file_and_thumbnails(static_dir):
+    first = save_candidate_image(Upload(png(), "a.png"))
+    second = save_candidate_image(Upload(png(), "b.png"))
+    other = save_candidate_image(Upload(png(color=(0, 0, 255)), "a.png"))
+
+    assert first == second != other
+    saved, (profile_pic, thumbnail) = first
+    assert len(stored(static_dir)) == 2
+    for width in uploads.THUMBNAIL_WIDTHS:
+        with Image.open(static_dir / f"{thumbnail}-{width}.webp") as thumb:
+            assert thumb.size == (width, width)
+
+
+def test_upload_route_refuses_oversized_bodies_before_reading_them():
+    client = TestClient(app)
+    limit = uploads.MAX_UPLOAD_REQUEST_BYTES
+
+    # Declared length: refused without reading, before the session is even looked at
+    response = client.post("/add-candidate", content=b"x", headers={"content-length": str(limit + 1),
+                                                                     "content-type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+
+    # Chunked: refused once the streamed body passes the limit
+    def body():
+        for _ in range(limit // 65536 + 4):
+            yield b"x" * 65536
+
+    response = client.post("/add-candidate", content=body(), headers={"content-type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    assert response.text.startswith("Upload is larger than")
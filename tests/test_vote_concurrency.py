@@ -0,0 +1,71 @@
+import asyncio
+import uuid
+
+from app.voters.services import cast_vote, ALREADY_VOTED, INVALID_CANDIDATE, VOTER_NOT_FOUND
+
+ELECTION_ID = "election-1"
+CANDIDATES = [{"_id": f"candidate-{i}", "name": f"C{i}"} for i in range(3)]
+
+
+def add_voters(mongo, n, election_id=ELECTION_ID):
+    voters = [
+        {
+            "_id": str(uuid.uuid4()),
+            "name": f"Voter {i}",
+            "email": f"v{i}@example.com",
+            "password_hash": "x",
+            "election_id": election_id,
+            "has_voted": False,
+        }
+        for i in range(n)
+    ]
+    mongo.voters_col.insert_many(voters)
+    return [v["_id"] for v in voters]
+
+
+def test_parallel_votes_are_counted_exactly_once(mongo):
+    voter_ids = add_voters(mongo, 200)
+    attempts = [
+        (voter_id, CANDIDATES[attempt % len(CANDIDATES)]["_id"])
+        for attempt in range(10)
+        for voter_id in voter_ids
+    ]
+
+    async def fire_all():
+        return await asyncio.gather(*(
+            cast_vote(voter_id, candidate_id, ELECTION_ID, CANDIDATES)
+            for voter_id, candidate_id in attempts
+        ))
+
+    outcomes = asyncio.run(fire_all())
+
+    accepted = [voter for success, voter in outcomes if success]
+    rejected = [message for success, message in outcomes if not success]
+
+    assert len(accepted) == len(voter_ids)
+    assert sorted(v["_id"] for v in accepted) == sorted(voter_ids)
+    assert set(rejected) == {ALREADY_VOTED}
+
+    counter = mongo.counters_col.find_one({"_id": ELECTION_ID})
+    assert counter["total_votes"] == len(voter_ids)
+    assert sum(counter["votes"].values()) == len(voter_ids)
+    assert mongo.votes_col.count_documents({"election_id": ELECTION_ID}) == len(voter_ids)
+    for voter in accepted:
+        stored = mongo.voters_col.find_one({"_id": voter["_id"]})
+        assert stored["has_voted"] is True
+        assert "vote_token" not in stored and "voted_for" not in stored
+        # The receipt finds the ballot, the ballot does not lead back to the voter
+        ballot = mongo.votes_col.find_one({"_id": voter["vote_token"]})
+        assert set(ballot) == {"_id", "election_id", "candidate_id", "cast_at"}
+
+
+def test_vote_rejects_foreign_candidate_and_voter(mongo):
+    [voter_id] = add_voters(mongo, 1, election_id="election-2")
+
+    def vote(voter, candidate):
+        return asyncio.run(cast_vote(voter, candidate, ELECTION_ID, CANDIDATES))
+
+    assert vote(voter_id, "candidate-0") == (False, INVALID_CANDIDATE)
+    assert vote(voter_id, "not-a-candidate") == (False, INVALID_CANDIDATE)
+    assert vote("missing", "candidate-0") == (False, VOTER_NOT_FOUND)
+    assert mongo.voters_col.find_one({"_id": voter_id})["has_voted"] is False
@@ -0,0 +1,66 @@
+import asyncio
+
+from app.elections.services import adjust_voter_counter, bump_data_version, init_vote_counter, reconcile_counters
+from app.elections.tally import get_election_totals, increment_vote_counter
+from app.voters.services import cast_vote
+from tests.test_vote_concurrency import CANDIDATES, ELECTION_ID, add_voters
+
+
+def seed_legacy_election(mongo):
+    # Voters and ballots from before the counters were deployed, and no counter document
+    voter_ids = add_voters(mongo, 4)
+    for voter_id in voter_ids[:2]:
+        assert asyncio.run(cast_vote(voter_id, CANDIDATES[0]["_id"], ELECTION_ID, CANDIDATES))[0]
+    mongo.counters_col.delete_many({})
+    return voter_ids
+
+
+def test_new_election_counts_voters_from_zero(mongo):
+    init_vote_counter(ELECTION_ID)
+    add_voters(mongo, 2)
+    adjust_voter_counter(ELECTION_ID, voters=1)
+    adjust_voter_counter(ELECTION_ID, voters=1)
+
+    counter = mongo.counters_col.find_one({"_id": ELECTION_ID})
+    assert (counter["total_voters"], counter["total_votes"], counter["version"]) == (2, 0, 2)
+    assert asyncio.run(get_election_totals(ELECTION_ID)) == (2, 0)
+
+
+def test_legacy_election_is_seeded_from_real_counts(mongo):
+    voter_ids = seed_legacy_election(mongo)
+
+    # Partial counter documents are not trusted by the dashboard
+    bump_data_version(ELECTION_ID)
+    asyncio.run(increment_vote_counter(ELECTION_ID, CANDIDATES[1]["_id"]))
+    mongo.votes_col.insert_one({"_id": "late-ballot", "election_id": ELECTION_ID, "candidate_id": CANDIDATES[1]["_id"]})
+    mongo.voters_col.update_one({"_id": voter_ids[2]}, {"$set": {"has_voted": True}})
+    assert asyncio.run(get_election_totals(ELECTION_ID)) == (4, 3)
+
+    # The first voter added after the deploy seeds the counter instead of starting at 1
+    add_voters(mongo, 1)
+    adjust_voter_counter(ELECTION_ID, voters=1)
+    counter = mongo.counters_col.find_one({"_id": ELECTION_ID})
+    assert (counter["total_voters"], counter["total_votes"]) == (5, 3)
+    assert counter["votes"] == {CANDIDATES[0]["_id"]: 2, CANDIDATES[1]["_id"]: 1}
+    assert asyncio.run(get_election_totals(ELECTION_ID)) == (5, 3)
+
+    # From then on it is incremented
+    mongo.voters_col.delete_one({"_id": voter_ids[3]})
+    adjust_voter_counter(ELECTION_ID, voters=-1)
+    assert asyncio.run(get_election_totals(ELECTION_ID)) == (4, 3)
+    assert reconcile_counters(ELECTION_ID, apply=False) == {}
+
+
+def test_reconcile_reports_and_fixes_drift(mongo):
+    seed_legacy_election(mongo)
+    mongo.counters_col.insert_one({"_id": ELECTION_ID, "votes": {CANDIDATES[0]["_id"]: 5}, "total_votes": 5,
+                                   "total_voters": 1, "version": 3})
+
+    expected = {"total_voters": (1, 4), "total_votes": (5, 2), f"votes.{CANDIDATES[0]['_id']}": (5, 2)}
+    assert reconcile_counters(ELECTION_ID, apply=False) == expected
+    assert mongo.counters_col.find_one({"_id": ELECTION_ID})["total_votes"] == 5
+
+    assert reconcile_counters(ELECTION_ID) == expected
+    counter = mongo.counters_col.find_one({"_id": ELECTION_ID})
+    assert (counter["total_voters"], counter["total_votes"], counter["version"]) == (4, 2, 4)
+    assert reconcile_counters(ELECTION_ID) == {}
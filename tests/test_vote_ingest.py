@@ -0,0 +1,185 @@
+import asyncio
+import json
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.voters import ingest
+from app.voters.ingest import VoteIngest, VoteLog, commit_votes, receipt_status
+from tests.test_vote_concurrency import CANDIDATES, ELECTION_ID, add_voters
+
+
+@pytest.fixture
+def wal(tmp_path):
+    return str(tmp_path / "votes.wal")
+
+
+def pipeline(wal, worker, **kwargs):
+    # Batches only go out when stop() drains them, unless a test says otherwise
+    return VoteIngest(wal, batch_size=kwargs.pop("batch_size", 1000), flush_interval=kwargs.pop("flush_interval", 60),
+                      worker=worker, fsync=False, **kwargs)
+
+
+def record(voter_id, candidate="candidate-0"):
+    return {"voter_id": voter_id, "election_id": ELECTION_ID, "candidate_id": candidate,
+            "vote_token": str(uuid.uuid4()), "ts": time.time()}
+
+
+async def submit(ingest_, voter_ids):
+    return await asyncio.gather(*(
+        ingest_.submit(voter_id, CANDIDATES[i % 3]["_id"], ELECTION_ID, CANDIDATES) for i, voter_id in enumerate(voter_ids)
+    ))
+
+
+def crash(ingest_):
+    # What dying does to a worker: its tasks stop and the kernel drops its lock
+    for task in ingest_._tasks:
+        task.cancel()
+    ingest_.log.release()
+
+
+def assert_counted(mongo, n):
+    counter = mongo.counters_col.find_one({"_id": ELECTION_ID})
+    assert counter["total_votes"] == n == sum(counter["votes"].values())
+    assert mongo.votes_col.count_documents({"election_id": ELECTION_ID}) == n
+    assert mongo.voters_col.count_documents({"ballot_claim": {"$exists": True}}) == 0
+
+
+def test_replay_cuts_the_torn_tail_and_commits_the_rest(mongo, wal):
+    voter_ids = add_voters(mongo, 3)
+    log = VoteLog(f"{wal}.a", fsync=False)
+    log.load()
+    log.append_many([record(v) for v in voter_ids[:2]])
+    with open(log.path, "ab") as f:
+        f.write(json.dumps(record(voter_ids[2])).encode()[:-5])     # crashed mid-write, never acknowledged
+
+    async def scenario():
+        restarted = pipeline(wal, "a")
+        await restarted.start()
+        assert len(restarted.pending) == 2
+        assert log.path.read_bytes().endswith(b"\n")
+        await restarted.stop()
+        return restarted
+
+    restarted = asyncio.run(scenario())
+    assert restarted.committed == 2
+    assert_counted(mongo, 2)
+    # Fully committed: the log is gone instead of waiting to be replayed
+    assert not log.path.exists()
+
+
+def test_each_worker_keeps_its_own_log_and_dead_workers_are_replayed(mongo, wal):
+    voter_ids = add_voters(mongo, 10)
+
+    async def scenario():
+        a, b = pipeline(wal, "a", flush_interval=0), pipeline(wal, "b")
+        await a.start()
+        await b.start()
+        assert all(ok for ok, _ in await submit(b, voter_ids[:5]))
+        assert all(ok for ok, _ in await submit(a, voter_ids[5:]))
+
+        # a commits and empties its own log; b's acknowledged votes are untouched
+        while a.pending:
+            await asyncio.sleep(0.01)
+        assert len(VoteLog(b.log.path).load()) == 5
+        crash(b)
+
+        # Whichever worker starts next adopts the dead worker's log
+        c = pipeline(wal, "c")
+        await c.start()
+        assert len(c.pending) == 5
+        assert not b.log.path.exists()
+        await c.stop()
+        await a.stop()
+        return a, c
+
+    a, c = asyncio.run(scenario())
+    assert (a.committed, c.committed) == (5, 5)
+    assert_counted(mongo, 10)
+    assert ingest.worker_logs(wal) == []
+
+
+def test_a_live_workers_log_is_never_adopted(mongo, wal):
+    [voter_id] = add_voters(mongo, 1)
+
+    async def scenario():
+        alive = pipeline(wal, "alive")
+        await alive.start()
+        assert (await submit(alive, [voter_id]))[0][0]
+
+        other = pipeline(wal, "other")
+        await other.start()
+        assert not other.pending
+        await other.stop()
+        assert len(alive.pending) == 1
+        await alive.stop()
+
+    asyncio.run(scenario())
+    assert_counted(mongo, 1)
+
+
+def test_stop_waits_for_the_log_write_in_flight(mongo, wal, monkeypatch):
+    voter_ids = add_voters(mongo, 20)
+    append_many = VoteLog.append_many
+
+    def slow_append(self, records):
+        time.sleep(0.2)
+        return append_many(self, records)
+
+    monkeypatch.setattr(VoteLog, "append_many", slow_append)
+
+    async def scenario():
+        worker = pipeline(wal, "a", flush_interval=0)
+        await worker.start()
+        outcomes = await submit(worker, voter_ids[:-1])
+        while worker.pending:
+            await asyncio.sleep(0.01)
+        last = asyncio.ensure_future(submit(worker, voter_ids[-1:]))
+        # The last vote is being written, nothing else is waiting or uncommitted
+        while worker._flushing.done():
+            await asyncio.sleep(0.01)
+        assert not worker._appends
+        await worker.stop()
+        return worker, outcomes + await asyncio.wait_for(last, 5)
+
+    worker, outcomes = asyncio.run(scenario())
+    assert len(outcomes) == 20 and all(ok for ok, _ in outcomes)
+    assert worker.committed == 20
+    assert_counted(mongo, 20)
+
+
+def test_replayed_batch_finishes_exactly_the_votes_it_claimed(mongo):
+    first, second, third = add_voters(mongo, 3)
+    done, claimed, fresh = record(first), record(second, "candidate-1"), record(third)
+
+    # Crashed mid-batch: `done` fully applied, `second` claimed but without its ballot
+    asyncio.run(commit_votes([done]))
+    mongo.voters_col.update_one({"_id": second}, {"$set": {"has_voted": True, "ballot_claim": claimed["vote_token"]}})
+
+    assert asyncio.run(commit_votes([done, claimed, fresh, dict(fresh)])) == (2, 0)
+    assert asyncio.run(commit_votes([done, claimed, fresh])) == (0, 0)
+    assert_counted(mongo, 3)
+    assert mongo.counters_col.find_one({"_id": ELECTION_ID})["votes"] == {"candidate-0": 2, "candidate-1": 1}
+
+
+def test_vote_that_loses_the_race_fails_its_receipt(mongo):
+    [voter_id] = add_voters(mongo, 1)
+    winner, loser = record(voter_id), record(voter_id, "candidate-2")
+
+    assert asyncio.run(commit_votes([winner])) == (1, 0)
+    # Acknowledged by another worker before it saw the first vote
+    assert asyncio.run(commit_votes([loser])) == (0, 1)
+    assert asyncio.run(commit_votes([loser])) == (0, 1)
+    assert mongo.db["vote_rejections"].count_documents({}) == 1
+
+    assert asyncio.run(receipt_status(winner["vote_token"])) == ingest.RECEIPT_RECORDED
+    client = TestClient(app)
+    response = client.get(f"/receipt/{loser['vote_token']}")
+    assert response.status_code == 409
+    assert response.json()["status"] == ingest.RECEIPT_REJECTED
+    assert "candidate" not in response.json()
+    assert client.get(f"/receipt/{uuid.uuid4()}").status_code == 404
+    assert_counted(mongo, 1)
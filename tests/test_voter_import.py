@@ -0,0 +1,72 @@
+import pytest
+
+from app.passwords import check_password, password_pool
+from app.voters import importer
+
+ELECTION_ID = "election-1"
+
+
+@pytest.fixture(autouse=True)
+def cheap_hashes(monkeypatch):
+    monkeypatch.setattr(password_pool, "rounds", 4)
+
+
+def write_roll(tmp_path, lines):
+    path = tmp_path / "roll.csv"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_import_reports_each_bad_row_and_progress_per_batch(mongo, tmp_path, monkeypatch):
+    monkeypatch.setattr(importer, "IMPORT_BATCH_SIZE", 2)
+    mongo.voters_col.insert_one({"_id": "existing", "email": "taken@x.org", "election_id": ELECTION_ID})
+    path = write_roll(tmp_path, [
+        "Name,Email,Password",
+        "Asha,asha@x.org,pw1",
+        "Ravi,,pw2",
+        "Asha again,asha@x.org,pw3",
+        "Taken,taken@x.org,pw4",
+        "Meera,meera@x.org,pw5",
+    ])
+
+    import_id = importer.start_import(ELECTION_ID, "roll.csv")
+    progress = []
+    import_batch = importer.import_batch
+
+    def observed(*args):
+        job = importer.get_import(import_id)
+        progress.append((job["status"], job["rows_processed"]))
+        return import_batch(*args)
+
+    monkeypatch.setattr(importer, "import_batch", observed)
+    importer.run_import(import_id, ELECTION_ID, path)
+    job = importer.get_import(import_id)
+
+    assert job["status"] == "completed" and job["finished_at"]
+    assert (job["rows_processed"], job["inserted"], job["error_count"]) == (5, 2, 3)
+    assert [(e["row"], e["error"]) for e in job["errors"]] == [
+        (3, "Missing email"),
+        (4, "Duplicate email in file"),
+        (5, "Voter with this email already exists"),
+    ]
+    # Progress is recorded after every batch of two rows
+    assert progress == [("running", 0), ("running", 2), ("running", 4)]
+
+    voter = mongo.voters_col.find_one({"email": "meera@x.org"})
+    assert voter["election_id"] == ELECTION_ID and voter["has_voted"] is False
+    assert check_password("pw5", voter["password_hash"])
+    # The counter did not exist yet, so it is seeded with the voter already there
+    assert mongo.counters_col.find_one({"_id": ELECTION_ID})["total_voters"] == 3
+
+
+def test_import_without_required_columns_fails_and_cleans_up(mongo, tmp_path):
+    path = write_roll(tmp_path, ["Name,Email", "Asha,asha@x.org"])
+
+    import_id = importer.start_import(ELECTION_ID, "roll.csv")
+    importer.run_import(import_id, ELECTION_ID, path)
+    job = importer.get_import(import_id)
+
+    assert job["status"] == "failed"
+    assert job["message"] == "Missing column(s): password"
+    assert job["inserted"] == 0
+    assert not (tmp_path / "roll.csv").exists()
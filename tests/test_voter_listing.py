@@ -0,0 +1,58 @@
+import asyncio
+
+from app.voters.services import list_voters_page
+
+ELECTION_ID = "election-1"
+
+
+def add_voters(mongo, n):
+    mongo.voters_col.insert_many([
+        {"_id": f"v{i:03d}", "name": f"Voter {i}", "email": f"voter{i}@x.org", "password_hash": "x",
+         "election_id": ELECTION_ID, "has_voted": False}
+        for i in range(n)
+    ])
+    mongo.voters_col.insert_one({"_id": "other", "name": "Voter 0", "email": "voter0@y.org", "election_id": "election-2"})
+
+
+def page(**kwargs):
+    return asyncio.run(list_voters_page(ELECTION_ID, page_size=3, **kwargs))
+
+
+def ids(result):
+    return [v["_id"] for v in result["voters"]]
+
+
+def test_keyset_pages_walk_forward_and_back(mongo):
+    add_voters(mongo, 7)
+
+    first = page()
+    assert ids(first) == ["v000", "v001", "v002"]
+    assert (first["prev_cursor"], first["next_cursor"]) == (None, "v002")
+    assert "password_hash" not in first["voters"][0]
+
+    second = page(after=first["next_cursor"])
+    assert ids(second) == ["v003", "v004", "v005"]
+    assert (second["prev_cursor"], second["next_cursor"]) == ("v003", "v005")
+
+    last = page(after=second["next_cursor"])
+    assert ids(last) == ["v006"]
+    assert (last["prev_cursor"], last["next_cursor"]) == ("v006", None)
+
+    # Back from the last page lands on the same page as going forward did
+    back = page(before=last["prev_cursor"])
+    assert ids(back) == ids(second)
+    assert (back["prev_cursor"], back["next_cursor"]) == ("v003", "v005")
+    assert page(before=back["prev_cursor"]) == first
+
+    assert page(after="v006") == {"voters": [], "next_cursor": None, "prev_cursor": None}
+
+
+def test_search_matches_email_prefix_or_name_within_the_election(mongo):
+    add_voters(mongo, 12)
+
+    assert ids(page(search="voter1")) == ["v001", "v010", "v011"]
+    assert ids(page(search="voter 11")) == ["v011"]
+    # Regex characters are matched literally, and emails only by prefix
+    assert ids(page(search="voter1.")) == []
+    assert ids(page(search="x.org")) == []
+    assert all(v["election_id"] == ELECTION_ID for v in page(search="voter0")["voters"])